@@ -7,29 +7,47 @@ normalizes the data, detects arbitrage opportunities, and exports results.
 
 Usage:
     python aggregator.py [--output-dir ./output] [--format csv,json]
+    python aggregator.py --daemon [--interval 300]
 """
 
 import argparse
 import asyncio
+import bz2
+import csv
+import gzip
+import heapq
+import io
 import json
+import lzma
 import os
+import shutil
+import tempfile
+import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Any, Optional, Tuple
+from itertools import islice
+from typing import List, Dict, Any, Optional, Set, Tuple, TYPE_CHECKING
 from dataclasses import dataclass
 
-import pandas as pd
+from matching import MarketMatcher, normalize_name
 
 from api_clients import (
     PredictItClient,
     KalshiClient,
     PolymarketClient,
     SmarketsClient,
-    BetfairClient,
     MarketData,
     ContractData,
+    MarketBatch,
 )
 
+# pandas and NumPy (via arbitrage) are imported where they are used, so
+# runs that never build a DataFrame or score arbitrage don't load them
+if TYPE_CHECKING:
+    import pandas as pd
+    from arbitrage import ArbitrageEngine, ArbitrageOpportunity, BookSumOpportunity, FeeModel
+
 
 @dataclass
 class AggregatedMarket:
@@ -44,6 +62,19 @@ class AggregatedMarket:
     total_volume: float
 
 
+# (source, market_id, contract_id): identifies a contract across cycles
+ContractKey = Tuple[str, str, str]
+
+
+def _fingerprint(market: MarketData, contract: ContractData) -> Tuple:
+    """The fields whose change makes a contract's group worth re-evaluating."""
+    return (
+        market.market_name, contract.contract_name,
+        contract.yes_price, contract.no_price,
+        contract.yes_bid, contract.yes_ask, contract.no_bid, contract.no_ask,
+    )
+
+
 class MarketAggregator:
     """Aggregates market data from multiple prediction market platforms."""
 
@@ -62,6 +93,8 @@ class MarketAggregator:
         }
 
         if include_betfair:
+            from api_clients import BetfairClient
+
             betfair = BetfairClient()
             if betfair.is_configured():
                 self.clients['Betfair'] = betfair
@@ -71,6 +104,18 @@ class MarketAggregator:
         self.results: Dict[str, List[MarketData]] = {}
         self.errors: Dict[str, str] = {}
 
+        # Incremental state for daemon mode (see apply_changes())
+        self._matcher: MarketMatcher[ContractKey] = MarketMatcher()
+        self._contracts: Dict[ContractKey, Tuple[str, MarketData, ContractData]] = {}
+        self._fingerprints: Dict[ContractKey, Tuple] = {}
+        self._groups: Dict[str, List[ContractKey]] = {}
+        self._group_of: Dict[ContractKey, str] = {}
+        self.aggregates: Dict[str, AggregatedMarket] = {}
+        self._group_best: Dict[str, 'ArbitrageOpportunity'] = {}
+        self._group_version: Dict[str, int] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._engine: Optional['ArbitrageEngine'] = None
+
     def fetch_all(self, max_workers: int = 4) -> Dict[str, List[MarketData]]:
         """
         Fetch markets from all platforms in parallel.
@@ -103,6 +148,40 @@ class MarketAggregator:
 
         return self.results
 
+    async def fetch_all_async(self) -> Dict[str, List[MarketData]]:
+        """
+        Fetch markets from all platforms concurrently on one event loop.
+
+        Each client's own fan-out (per event, per market) runs on the same
+        loop, so no source holds a thread while it waits on the network.
+
+        Returns:
+            Dictionary of source_name -> list of MarketData
+        """
+        print("Fetching markets from all platforms...")
+        self.results = {}
+        self.errors = {}
+
+        names = list(self.clients.keys())
+        try:
+            outcomes = await asyncio.gather(
+                *(self._fetch_from_source_async(name, self.clients[name]) for name in names),
+                return_exceptions=True,
+            )
+        finally:
+            # Async sessions are bound to this loop; release them before it closes
+            await asyncio.gather(*(client.aclose() for client in self.clients.values()))
+
+        for source_name, outcome in zip(names, outcomes):
+            if isinstance(outcome, Exception):
+                self.errors[source_name] = str(outcome)
+                print(f"  {source_name}: ERROR - {outcome}")
+            else:
+                self.results[source_name] = outcome
+                print(f"  {source_name}: {len(outcome)} markets")
+
+        return self.results
+
     def _fetch_from_source(self, name: str, client) -> List[MarketData]:
         """Fetch markets from a single source."""
         try:
@@ -110,38 +189,47 @@ class MarketAggregator:
         except Exception as e:
             raise Exception(f"Failed to fetch from {name}: {e}")
 
-    def to_dataframe(self) -> pd.DataFrame:
+    async def _fetch_from_source_async(self, name: str, client) -> List[MarketData]:
+        """Fetch markets from a single source without blocking the loop."""
+        try:
+            return await client.get_political_markets_async()
+        except Exception as e:
+            raise Exception(f"Failed to fetch from {name}: {e}")
+
+    def to_batch(self, snapshot_time: Optional[datetime] = None) -> MarketBatch:
+        """All results as one columnar MarketBatch."""
+        batch = MarketBatch(snapshot_time)
+        for markets in self.results.values():
+            batch.add_markets(markets)
+        return batch
+
+    # Columns of to_dataframe(), in order (last_updated is added last)
+    DATAFRAME_COLUMNS = [
+        'source', 'market_id', 'market_name', 'contract_id', 'contract_name',
+        'yes_price', 'no_price', 'yes_bid', 'yes_ask', 'volume', 'market_volume',
+        'status', 'url',
+    ]
+    CATEGORICAL_COLUMNS = ('source', 'status', 'market_name')
+
+    def to_dataframe(self) -> 'pd.DataFrame':
         """
         Convert all results to a flat DataFrame.
 
+        Columns are built as typed arrays in one pass over the results;
+        source, status and market_name are categoricals, and every row
+        carries the same cycle timestamp, as an ISO-8601 string (the same
+        value the CSV export writes).
+
         Returns:
             DataFrame with columns:
                 source, market_id, market_name, contract_id, contract_name,
-                yes_price, no_price, yes_bid, yes_ask, volume, last_updated
+                yes_price, no_price, yes_bid, yes_ask, volume, market_volume,
+                status, url, last_updated
         """
-        rows = []
-
-        for source_name, markets in self.results.items():
-            for market in markets:
-                for contract in market.contracts:
-                    rows.append({
-                        'source': source_name,
-                        'market_id': market.market_id,
-                        'market_name': market.market_name,
-                        'contract_id': contract.contract_id,
-                        'contract_name': contract.contract_name,
-                        'yes_price': contract.yes_price,
-                        'no_price': contract.no_price,
-                        'yes_bid': contract.yes_bid,
-                        'yes_ask': contract.yes_ask,
-                        'volume': contract.volume,
-                        'market_volume': market.total_volume,
-                        'status': market.status.value,
-                        'url': market.url,
-                        'last_updated': datetime.now().isoformat(),
-                    })
-
-        return pd.DataFrame(rows)
+        batch = self.to_batch(datetime.now())
+        df = batch.to_dataframe(self.DATAFRAME_COLUMNS, categorical=self.CATEGORICAL_COLUMNS)
+        df['last_updated'] = batch.snapshot_time.isoformat()
+        return df
 
     def to_json(self) -> List[Dict]:
         """Convert all results to JSON-serializable format."""
@@ -153,38 +241,36 @@ class MarketAggregator:
 
         return output
 
-    def find_matching_markets(self) -> List[AggregatedMarket]:
-        """
-        Find markets that exist across multiple platforms.
-
-        Uses fuzzy matching on market/contract names to identify
-        the same event across different sources.
-        """
-        # Build index of normalized names
-        name_index: Dict[str, List[Tuple[str, MarketData, ContractData]]] = {}
+    def _match_groups(self, threshold: float = 0.5) -> List[Tuple[str, List[Tuple[str, MarketData, ContractData]]]]:
+        """Group (source, market, contract) entries naming the same outcome across sources."""
+        matcher: MarketMatcher[Tuple[str, MarketData, ContractData]] = MarketMatcher(threshold)
 
         for source_name, markets in self.results.items():
             for market in markets:
                 for contract in market.contracts:
-                    # Normalize the name
-                    normalized = self._normalize_name(
-                        f"{market.market_name} {contract.contract_name}"
+                    matcher.add(
+                        source_name,
+                        market.market_name,
+                        contract.contract_name,
+                        (source_name, market, contract),
                     )
 
-                    if normalized not in name_index:
-                        name_index[normalized] = []
-                    name_index[normalized].append((source_name, market, contract))
+        return matcher.groups()
 
-        # Find matches (same normalized name, different sources)
-        aggregated = []
+    def find_matching_markets(self, threshold: float = 0.5) -> List[AggregatedMarket]:
+        """
+        Find markets that exist across multiple platforms.
 
-        for normalized_name, entries in name_index.items():
-            sources = set(e[0] for e in entries)
-            if len(sources) < 2:
-                continue  # Need at least 2 sources
+        Uses fuzzy matching on market/contract names to identify
+        the same event across different sources (see matching.MarketMatcher).
 
-            # Aggregate data
-            agg = self._aggregate_entries(normalized_name, entries)
+        Args:
+            threshold: Minimum contract name similarity (trigram Jaccard)
+                to pair differently worded names
+        """
+        aggregated = []
+        for name, entries in self._match_groups(threshold):
+            agg = self._aggregate_entries(name, entries)
             if agg:
                 aggregated.append(agg)
 
@@ -195,27 +281,7 @@ class MarketAggregator:
 
     def _normalize_name(self, name: str) -> str:
         """Normalize a market/contract name for matching."""
-        import re
-
-        name = name.lower()
-
-        # Remove common suffixes/prefixes
-        patterns = [
-            r'\b(to win|will win|wins?|winner)\b',
-            r'\b(the|a|an)\b',
-            r'\b(2024|2025|2026|2027|2028|2029|2030)\b',
-            r'\b(presidential|president|election|nominee|nomination)\b',
-            r'\b(republican|democratic|gop|dem)\b',
-            r'[^\w\s]',  # Remove punctuation
-        ]
-
-        for pattern in patterns:
-            name = re.sub(pattern, '', name)
-
-        # Collapse whitespace
-        name = ' '.join(name.split())
-
-        return name.strip()
+        return normalize_name(name)
 
     def _aggregate_entries(self, name: str,
                           entries: List[Tuple[str, MarketData, ContractData]]
@@ -262,58 +328,283 @@ class MarketAggregator:
             total_volume=total_volume,
         )
 
-    def detect_arbitrage(self, min_spread: float = 0.02) -> List[AggregatedMarket]:
+    def detect_arbitrage(self, min_spread: float = 0.02,
+                         top_k: Optional[int] = None,
+                         fee_models: Optional[Dict[str, 'FeeModel']] = None) -> List['ArbitrageOpportunity']:
         """
         Find arbitrage opportunities.
 
+        Spreads come from executable asks (YES on one venue, NO on another)
+        net of each venue's fees, not from last/mid prices.
+
         Args:
-            min_spread: Minimum price spread to report (default 2%)
+            min_spread: Minimum net edge to report (default 2%)
+            top_k: Return only the best top_k opportunities
+            fee_models: Per-source fee models (default: arbitrage.DEFAULT_FEE_MODELS)
 
         Returns:
-            List of markets with arbitrage opportunities
+            Opportunities sorted by net edge, best first
         """
-        matches = self.find_matching_markets()
-        return [m for m in matches if m.arbitrage_spread >= min_spread]
+        from arbitrage import ArbitrageEngine
 
-    def export(self, output_dir: str = ".", formats: List[str] = None):
+        engine = ArbitrageEngine(fee_models)
+        return engine.evaluate(self._match_groups(), top_k=top_k, min_edge=min_spread)
+
+    def detect_book_arbitrage(self, min_spread: float = 0.02,
+                              top_k: Optional[int] = None,
+                              fee_models: Optional[Dict[str, 'FeeModel']] = None,
+                              stale_after: Optional[float] = 900) -> List['BookSumOpportunity']:
+        """
+        Find single-venue arbitrage across the outcomes of multi-outcome
+        markets the venue marks as mutually exclusive.
+
+        Flags markets whose YES asks sum below 1 (buy every YES) or whose
+        YES bids sum above 1 (buy every NO), net of the venue's fees.
+
+        Args:
+            min_spread: Minimum net edge to report (default 2%)
+            top_k: Return only the best top_k opportunities
+            fee_models: Per-source fee models (default: arbitrage.DEFAULT_FEE_MODELS)
+            stale_after: Seconds after which a quote is flagged stale
+
+        Returns:
+            Opportunities sorted by net edge, best first
+        """
+        from arbitrage import ArbitrageEngine
+
+        engine = ArbitrageEngine(fee_models)
+        return engine.scan_book_sums(self.to_batch(), top_k=top_k, min_edge=min_spread,
+                                     stale_after=stale_after)
+
+    # Share of matcher names left without entries before it is rebuilt
+    REBUILD_STALE_RATIO = 0.05
+
+    def apply_changes(self) -> Dict[str, int]:
+        """
+        Fold the latest results into the long-lived matching state.
+
+        Only contracts that are new, gone, renamed or repriced since the
+        previous call are touched: the matcher indexes just the new names,
+        and only groups containing a changed contract are re-aggregated
+        and re-scored. Sources that failed this cycle keep their previous
+        contracts.
+
+        Returns:
+            Counts of added, removed, renamed and repriced contracts, and
+            of groups re-evaluated
+        """
+        stats = dict.fromkeys(('added', 'removed', 'renamed', 'repriced', 'groups'), 0)
+        changed: Set[ContractKey] = set()
+        membership_changed = False
+
+        seen: Set[ContractKey] = set()
+        for source_name, markets in self.results.items():
+            for market in markets:
+                for contract in market.contracts:
+                    key = (source_name, market.market_id, contract.contract_id)
+                    seen.add(key)
+                    fingerprint = _fingerprint(market, contract)
+                    previous = self._fingerprints.get(key)
+                    self._contracts[key] = (source_name, market, contract)
+                    if previous == fingerprint:
+                        continue
+
+                    self._fingerprints[key] = fingerprint
+                    changed.add(key)
+                    if previous is None:
+                        self._matcher.add(source_name, market.market_name, contract.contract_name, key)
+                        stats['added'] += 1
+                        membership_changed = True
+                    elif previous[:2] != fingerprint[:2]:
+                        self._matcher.remove(source_name, previous[0], previous[1], key)
+                        self._matcher.add(source_name, market.market_name, contract.contract_name, key)
+                        stats['renamed'] += 1
+                        membership_changed = True
+                    else:
+                        stats['repriced'] += 1
+
+        for key in [k for k in self._contracts if k[0] in self.results and k not in seen]:
+            market_name, contract_name = self._fingerprints.pop(key)[:2]
+            del self._contracts[key]
+            self._matcher.remove(key[0], market_name, contract_name, key)
+            changed.add(key)
+            stats['removed'] += 1
+            membership_changed = True
+
+        dirty = {self._group_of[key] for key in changed if key in self._group_of}
+        if membership_changed:
+            if self._matcher.stale_ratio() > self.REBUILD_STALE_RATIO:
+                self._matcher.rebuild()
+            dirty |= self._regroup()
+
+        self._evaluate_groups(dirty)
+        stats['groups'] = len(dirty)
+        return stats
+
+    def _regroup(self) -> Set[str]:
+        """Refresh group membership from the matcher; returns groups that changed."""
+        groups = {name: keys for name, keys in self._matcher.groups()}
+        dirty = {name for name, keys in groups.items()
+                 if set(keys) != set(self._groups.get(name, ()))}
+        dirty |= self._groups.keys() - groups.keys()
+
+        self._groups = groups
+        self._group_of = {key: name for name, keys in groups.items() for key in keys}
+        return dirty
+
+    def _evaluate_groups(self, names: Set[str]):
+        """Re-aggregate and re-score the named groups, dropping those that are gone."""
+        live = []
+        for name in names:
+            self.aggregates.pop(name, None)
+            if self._group_best.pop(name, None) is not None:
+                self._group_version[name] = self._group_version.get(name, 0) + 1
+            if name not in self._groups:
+                continue
+            entries = [self._contracts[key] for key in self._groups[name]]
+            aggregate = self._aggregate_entries(name, entries)
+            if aggregate:
+                self.aggregates[name] = aggregate
+            live.append((name, entries))
+
+        if self._engine is None:
+            from arbitrage import ArbitrageEngine
+            self._engine = ArbitrageEngine()
+
+        for opp in self._engine.evaluate(live):
+            version = self._group_version.get(opp.canonical_name, 0) + 1
+            self._group_version[opp.canonical_name] = version
+            self._group_best[opp.canonical_name] = opp
+            heapq.heappush(self._heap, (-opp.net_edge, version, opp.canonical_name))
+
+        # Superseded heap entries are skipped lazily; compact once they dominate
+        if len(self._heap) > 2 * len(self._group_best) + 64:
+            self._heap = [(-opp.net_edge, self._group_version[name], name)
+                          for name, opp in self._group_best.items()]
+            heapq.heapify(self._heap)
+
+    def top_opportunities(self, k: int = 10,
+                          min_spread: Optional[float] = None) -> List['ArbitrageOpportunity']:
+        """
+        Best current opportunities from the incremental state, best first.
+
+        Costs O(k log n) plus the superseded entries it discards.
+        """
+        result, valid = [], []
+        while self._heap and len(result) < k:
+            item = heapq.heappop(self._heap)
+            neg_edge, version, name = item
+            if self._group_version.get(name) != version or name not in self._group_best:
+                continue
+            valid.append(item)
+            if min_spread is not None and -neg_edge < min_spread:
+                break
+            result.append(self._group_best[name])
+        for item in valid:
+            heapq.heappush(self._heap, item)
+        return result
+
+    def run_daemon(self, interval: float = 300, min_spread: float = 0.02,
+                   top_k: int = 10, threaded: bool = False,
+                   cycles: Optional[int] = None):
+        """
+        Poll all sources every interval seconds, updating matches incrementally.
+
+        Args:
+            interval: Seconds between the starts of consecutive cycles
+            min_spread: Minimum net edge to report
+            top_k: Opportunities to print per cycle
+            threaded: Fetch with the thread pool instead of asyncio
+            cycles: Stop after this many cycles (default: run until interrupted)
+        """
+        cycle = 0
+        while cycles is None or cycle < cycles:
+            started = time.monotonic()
+            if threaded:
+                self.fetch_all()
+            else:
+                asyncio.run(self.fetch_all_async())
+
+            stats = self.apply_changes()
+            elapsed = time.monotonic() - started
+            print(f"[{datetime.now():%H:%M:%S}] {len(self._contracts)} contracts, "
+                  f"{len(self._groups)} groups; +{stats['added']} -{stats['removed']} "
+                  f"~{stats['renamed']} renamed, {stats['repriced']} repriced, "
+                  f"{stats['groups']} groups re-evaluated ({elapsed:.1f}s)")
+            for opp in self.top_opportunities(top_k, min_spread):
+                print(f"  {opp.net_edge:6.1%} net  {opp.canonical_name}: "
+                      f"YES {opp.yes_ask:.1%} ({opp.yes_source}) / "
+                      f"NO {opp.no_ask:.1%} ({opp.no_source})")
+
+            cycle += 1
+            if cycles is None or cycle < cycles:
+                time.sleep(max(0.0, interval - (time.monotonic() - started)))
+
+    # Rows per chunk when streaming exports
+    EXPORT_CHUNK_ROWS = 10000
+    EXPORT_FORMATS = ('csv', 'json', 'ndjson', 'parquet', 'arrow')
+
+    def export(self, output_dir: str = ".", formats: List[str] = None,
+               compression: Optional[str] = None):
         """
         Export results to files.
 
+        Each artifact is serialized once, streamed in chunks to a temporary
+        file and renamed into place, so readers never see a partial file.
+        markets_latest.* is then hardlinked (or copied) to it and swapped in
+        with another atomic rename.
+
         Args:
             output_dir: Directory to write files
-            formats: List of formats ('csv', 'json'). Default: both
+            formats: List of formats ('csv', 'json', 'ndjson', 'parquet',
+                'arrow'). Default: csv and json
+            compression: Codec applied to every format. csv/json/ndjson take
+                gzip, bz2 or xz (adds the usual extension); parquet and arrow
+                take their own pyarrow codecs and map the text codecs to the
+                nearest one they support (see _BINARY_CODECS). Checked for
+                every format before anything is written.
         """
         if formats is None:
             formats = ['csv', 'json']
+        unknown = set(formats) - set(self.EXPORT_FORMATS)
+        if unknown:
+            raise ValueError(f"Unknown export format(s): {', '.join(sorted(unknown))}")
+        codecs = _export_codecs(formats, compression)
 
         os.makedirs(output_dir, exist_ok=True)
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-
-        if 'csv' in formats:
-            df = self.to_dataframe()
-            csv_path = os.path.join(output_dir, f'markets_{timestamp}.csv')
-            df.to_csv(csv_path, index=False)
-            print(f"Exported CSV: {csv_path}")
-
-            # Also export latest (no timestamp)
-            latest_csv = os.path.join(output_dir, 'markets_latest.csv')
-            df.to_csv(latest_csv, index=False)
-
-        if 'json' in formats:
-            data = self.to_json()
-            json_path = os.path.join(output_dir, f'markets_{timestamp}.json')
-            with open(json_path, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
-            print(f"Exported JSON: {json_path}")
-
-            # Also export latest
-            latest_json = os.path.join(output_dir, 'markets_latest.json')
-            with open(latest_json, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
+        now = datetime.now()
+        timestamp = now.strftime('%Y%m%d_%H%M%S')
+        batch = self.to_batch(now) if set(formats) & {'csv', 'parquet', 'arrow'} else None
+
+        for fmt in formats:
+            text_compression = codecs[fmt] if fmt in _TEXT_FORMATS else None
+            extension = fmt + _COMPRESSORS[text_compression][0] if text_compression else fmt
+            path = os.path.join(output_dir, f'markets_{timestamp}.{extension}')
+
+            if fmt == 'csv':
+                with _atomic_text_output(path, text_compression, newline='') as f:
+                    self._write_csv(f, batch)
+            elif fmt == 'json':
+                with _atomic_text_output(path, text_compression) as f:
+                    self._write_json(f)
+            elif fmt == 'ndjson':
+                with _atomic_text_output(path, text_compression) as f:
+                    self._write_ndjson(f)
+            else:
+                try:
+                    import pyarrow  # noqa: F401
+                except ImportError:
+                    print(f"[Warning] pyarrow not installed - skipping {fmt} export")
+                    continue
+                with _atomic_output(path) as f:
+                    self._write_arrow(f, batch, fmt, codecs[fmt])
+
+            _link_latest(path, os.path.join(output_dir, f'markets_latest.{extension}'))
+            print(f"Exported {fmt.upper()}: {path}")
 
         # Export summary
         summary = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': now.isoformat(),
             'sources': list(self.results.keys()),
             'total_markets': sum(len(m) for m in self.results.values()),
             'total_contracts': sum(
@@ -322,10 +613,145 @@ class MarketAggregator:
             ),
             'errors': self.errors,
         }
-        summary_path = os.path.join(output_dir, 'summary.json')
-        with open(summary_path, 'w') as f:
+        with _atomic_text_output(os.path.join(output_dir, 'summary.json')) as f:
             json.dump(summary, f, indent=2)
 
+    def _write_csv(self, f, batch: MarketBatch):
+        """Same columns as to_dataframe(), written without building a DataFrame."""
+        writer = csv.writer(f)
+        writer.writerow(self.DATAFRAME_COLUMNS + ['last_updated'])
+        rows = batch.rows(self.DATAFRAME_COLUMNS)
+        last_updated = (batch.snapshot_time.isoformat(),)
+        while True:
+            chunk = [row + last_updated for row in islice(rows, self.EXPORT_CHUNK_ROWS)]
+            if not chunk:
+                break
+            writer.writerows(chunk)
+
+    def _iter_records(self):
+        for markets in self.results.values():
+            for market in markets:
+                yield market.to_dict()
+
+    def _write_json(self, f):
+        """Same output as json.dump(self.to_json(), indent=2), one market at a time."""
+        encoder = json.JSONEncoder(indent=2, default=str)
+        separator = '[\n  '
+        for record in self._iter_records():
+            f.write(separator)
+            f.write(encoder.encode(record).replace('\n', '\n  '))
+            separator = ',\n  '
+        f.write('[]' if separator.startswith('[') else '\n]')
+
+    def _write_ndjson(self, f):
+        """One market object per line."""
+        encoder = json.JSONEncoder(default=str, separators=(',', ':'))
+        for record in self._iter_records():
+            f.write(encoder.encode(record))
+            f.write('\n')
+
+    def _write_arrow(self, f, batch: MarketBatch, fmt: str, compression: Optional[str]):
+        """Parquet or Arrow IPC file, one record batch per chunk (compression: a codec valid for fmt)."""
+        import pyarrow as pa
+
+        names = self.DATAFRAME_COLUMNS + ['last_updated']
+        writer = None
+        try:
+            for chunk in batch.to_record_batches(self.DATAFRAME_COLUMNS, self.EXPORT_CHUNK_ROWS):
+                chunk = pa.RecordBatch.from_arrays(
+                    chunk.columns + [pa.array([batch.snapshot_time] * chunk.num_rows,
+                                              type=pa.timestamp('us'))],
+                    names=names,
+                )
+                if writer is None:
+                    if fmt == 'parquet':
+                        import pyarrow.parquet as pq
+                        writer = pq.ParquetWriter(f, chunk.schema, compression=compression or 'snappy')
+                    else:
+                        writer = pa.ipc.new_file(
+                            f, chunk.schema, options=pa.ipc.IpcWriteOptions(compression=compression))
+                writer.write_batch(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+
+
+# Text export compression: name -> (file extension, opener for a binary file object)
+_COMPRESSORS = {
+    'gzip': ('.gz', lambda f: gzip.GzipFile(fileobj=f, mode='wb', mtime=0)),
+    'bz2': ('.bz2', lambda f: bz2.BZ2File(f, 'wb')),
+    'xz': ('.xz', lambda f: lzma.LZMAFile(f, 'wb')),
+}
+_TEXT_FORMATS = ('csv', 'json', 'ndjson')
+
+# pyarrow codec per format for each accepted compression name. Parquet has
+# no bz2/xz and Arrow IPC only lz4/zstd, so those map to the closest codec
+_BINARY_CODECS = {
+    'parquet': {'gzip': 'gzip', 'bz2': 'zstd', 'xz': 'zstd', 'zstd': 'zstd',
+                'snappy': 'snappy', 'lz4': 'lz4', 'brotli': 'brotli'},
+    'arrow': {'gzip': 'zstd', 'bz2': 'zstd', 'xz': 'zstd', 'zstd': 'zstd',
+              'snappy': 'lz4', 'lz4': 'lz4', 'brotli': 'zstd'},
+}
+
+
+def _export_codecs(formats: List[str], compression: Optional[str]) -> Dict[str, Optional[str]]:
+    """Codec each export format is written with; ValueError if one cannot take compression."""
+    codecs: Dict[str, Optional[str]] = {}
+    for fmt in formats:
+        if not compression:
+            codecs[fmt] = None
+        elif fmt in _TEXT_FORMATS:
+            if compression not in _COMPRESSORS:
+                raise ValueError(f"Unsupported compression for {fmt}: {compression} "
+                                 f"(use {', '.join(_COMPRESSORS)})")
+            codecs[fmt] = compression
+        elif compression in _BINARY_CODECS[fmt]:
+            codecs[fmt] = _BINARY_CODECS[fmt][compression]
+        else:
+            raise ValueError(f"Unsupported compression for {fmt}: {compression}")
+    return codecs
+
+
+@contextmanager
+def _atomic_output(path: str):
+    """Binary file object that replaces path only once it is fully written."""
+    directory, name = os.path.split(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory or '.', prefix=f'.{name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            yield f
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+@contextmanager
+def _atomic_text_output(path: str, compression: Optional[str] = None, newline: Optional[str] = None):
+    """Text (optionally compressed) version of _atomic_output()."""
+    with _atomic_output(path) as raw:
+        stream = _COMPRESSORS[compression][1](raw) if compression else raw
+        f = io.TextIOWrapper(stream, encoding='utf-8', newline=newline)
+        yield f
+        f.flush()
+        f.detach()  # Leave raw open for _atomic_output to close and rename
+        if compression:
+            stream.close()  # Writes the trailer
+
+
+def _link_latest(path: str, latest: str):
+    """Point latest at path's content without rewriting it when the filesystem allows."""
+    tmp_path = f'{latest}.{os.getpid()}.tmp'
+    try:
+        os.link(path, tmp_path)
+    except OSError:
+        shutil.copyfile(path, tmp_path)
+    os.replace(tmp_path, latest)
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -339,7 +765,12 @@ def main():
     parser.add_argument(
         '--format', '-f',
         default='csv,json',
-        help='Output formats, comma-separated (default: csv,json)'
+        help='Output formats, comma-separated: csv, json, ndjson, parquet, arrow (default: csv,json)'
+    )
+    parser.add_argument(
+        '--compression',
+        help='Compress exports: gzip, bz2 or xz (any format; parquet/arrow use the '
+             'nearest codec they support), or zstd, snappy, lz4 or brotli (parquet/arrow only)'
     )
     parser.add_argument(
         '--include-betfair',
@@ -355,20 +786,55 @@ def main():
         '--min-spread',
         type=float,
         default=0.02,
-        help='Minimum arbitrage spread to report (default: 0.02 = 2%%)'
+        help='Minimum arbitrage spread after fees to report (default: 0.02 = 2%%)'
+    )
+    parser.add_argument(
+        '--threaded',
+        action='store_true',
+        help='Fetch with the blocking thread pool instead of asyncio'
+    )
+    parser.add_argument(
+        '--daemon',
+        action='store_true',
+        help='Keep polling and report arbitrage incrementally instead of exporting once'
+    )
+    parser.add_argument(
+        '--interval',
+        type=float,
+        default=300,
+        help='Seconds between polls in daemon mode (default: 300)'
     )
 
     args = parser.parse_args()
 
+    # The asyncio path needs aiohttp; without it, fetch on the thread pool
+    threaded = args.threaded
+    if not threaded:
+        try:
+            import aiohttp  # noqa: F401
+        except ImportError:
+            print("[Warning] aiohttp not installed - fetching with the thread pool")
+            threaded = True
+
     # Initialize aggregator
     aggregator = MarketAggregator(include_betfair=args.include_betfair)
 
+    if args.daemon:
+        try:
+            aggregator.run_daemon(args.interval, args.min_spread, threaded=threaded)
+        except KeyboardInterrupt:
+            print("\nStopped")
+        return
+
     # Fetch all markets
-    aggregator.fetch_all()
+    if threaded:
+        aggregator.fetch_all()
+    else:
+        asyncio.run(aggregator.fetch_all_async())
 
     # Export results
     formats = [f.strip() for f in args.format.split(',')]
-    aggregator.export(args.output_dir, formats)
+    aggregator.export(args.output_dir, formats, args.compression)
 
     # Print summary
     print("\n=== Summary ===")
@@ -379,14 +845,25 @@ def main():
     # Find arbitrage if requested
     if args.find_arbitrage:
         print("\n=== Arbitrage Detection ===")
-        opportunities = aggregator.detect_arbitrage(args.min_spread)
+        opportunities = aggregator.detect_arbitrage(args.min_spread, top_k=10)
         if opportunities:
-            for opp in opportunities[:10]:
+            for opp in opportunities:
                 print(f"\n  {opp.canonical_name}")
-                print(f"    Best YES: {opp.best_yes_price:.1%} ({opp.best_yes_source})")
-                print(f"    Best NO: {opp.best_no_price:.1%} ({opp.best_no_source})")
-                print(f"    Spread: {opp.arbitrage_spread:.1%}")
-                print(f"    Sources: {', '.join(opp.sources.keys())}")
+                print(f"    Buy YES: {opp.yes_ask:.1%} ({opp.yes_source})")
+                print(f"    Buy NO: {opp.no_ask:.1%} ({opp.no_source})")
+                print(f"    Spread: {opp.gross_edge:.1%} gross, {opp.net_edge:.1%} after fees")
+        else:
+            print(f"  No opportunities found with spread >= {args.min_spread:.1%}")
+
+        print("\n=== Book-Sum Arbitrage (multi-outcome markets) ===")
+        book_opportunities = aggregator.detect_book_arbitrage(args.min_spread, top_k=10)
+        if book_opportunities:
+            for opp in book_opportunities:
+                action = 'Buy YES on every outcome' if opp.side == 'yes' else 'Buy NO on every outcome'
+                stale = f" [STALE: {opp.stale_outcomes} quotes]" if opp.stale else ""
+                print(f"\n  {opp.market_name} ({opp.source}, {opp.outcomes} outcomes){stale}")
+                print(f"    {action}: book {opp.book_sum:.1%}")
+                print(f"    Spread: {opp.gross_edge:.1%} gross, {opp.net_edge:.1%} after fees")
         else:
             print(f"  No opportunities found with spread >= {args.min_spread:.1%}")
 
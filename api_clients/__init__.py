@@ -7,23 +7,47 @@ Unified interface for fetching odds from multiple prediction markets:
 - Polymarket (public, no auth)
 - Smarkets (public, no auth)
 - Betfair (requires API key + account)
+
+Clients are imported on first access, so a script that uses one venue
+(or only the data model) doesn't pay to import the others.
 """
 
+import importlib
+
 from .base import BaseMarketClient, MarketData, ContractData, MarketStatus
-from .predictit import PredictItClient
-from .kalshi import KalshiClient
-from .polymarket import PolymarketClient
-from .smarkets import SmarketsClient
-from .betfair import BetfairClient
+from .batch import MarketBatch
+
+# Lazily imported name -> submodule
+_LAZY = {
+    'PredictItClient': '.predictit',
+    'KalshiClient': '.kalshi',
+    'PolymarketClient': '.polymarket',
+    'SmarketsClient': '.smarkets',
+    'BetfairClient': '.betfair',
+}
 
 __all__ = [
     'BaseMarketClient',
     'MarketData',
     'ContractData',
     'MarketStatus',
+    'MarketBatch',
     'PredictItClient',
     'KalshiClient',
     'PolymarketClient',
     'SmarketsClient',
     'BetfairClient',
 ]
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
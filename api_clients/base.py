@@ -2,12 +2,21 @@
 Base classes and data structures for prediction market API clients.
 """
 
+import asyncio
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Callable, Tuple, TYPE_CHECKING
 from enum import Enum
 
+from .cache import CacheEntry, ResponseCache, get_response_cache
+from .jsonstream import JsonArrayDecoder
+from .ratelimit import TokenBucket
+from .transport import STREAM_CHUNK_SIZE, get_transport
+
+if TYPE_CHECKING:
+    from .batch import MarketBatch
+
 
 class MarketStatus(Enum):
     OPEN = "open"
@@ -17,7 +26,9 @@ class MarketStatus(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+# Slotted: a sync cycle holds tens of thousands of these, so the per-instance
+# __dict__ is dropped (see scripts/bench_models.py)
+@dataclass(slots=True)
 class ContractData:
     """Normalized contract/outcome data across all platforms."""
     contract_id: str
@@ -35,13 +46,23 @@ class ContractData:
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary with serializable datetime."""
-        d = asdict(self)
-        if d['last_updated']:
-            d['last_updated'] = d['last_updated'].isoformat()
-        return d
+        return {
+            'contract_id': self.contract_id,
+            'contract_name': self.contract_name,
+            'yes_price': self.yes_price,
+            'no_price': self.no_price,
+            'yes_bid': self.yes_bid,
+            'yes_ask': self.yes_ask,
+            'no_bid': self.no_bid,
+            'no_ask': self.no_ask,
+            'volume': self.volume,
+            'volume_24h': self.volume_24h,
+            'last_trade_price': self.last_trade_price,
+            'last_updated': self.last_updated.isoformat() if self.last_updated else None,
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class MarketData:
     """Normalized market data across all platforms."""
     market_id: str
@@ -57,6 +78,9 @@ class MarketData:
     category_tag: Optional[str] = None  # Normalized tag (e.g., Trump, US Elections, Ukraine)
     last_updated: Optional[datetime] = None
     raw_data: Optional[Dict[str, Any]] = None  # Original API response
+    # Exactly one contract resolves YES, per venue metadata (Polymarket
+    # negRisk, Kalshi mutually_exclusive, ...); unknown means False
+    mutually_exclusive: bool = False
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary with serializable datetime."""
@@ -72,6 +96,7 @@ class MarketData:
             'total_volume': self.total_volume,
             'category_tag': self.category_tag,
             'last_updated': self.last_updated.isoformat() if self.last_updated else None,
+            'mutually_exclusive': self.mutually_exclusive,
             'contracts': [c.to_dict() for c in self.contracts],
         }
         return d
@@ -80,9 +105,26 @@ class MarketData:
 class BaseMarketClient(ABC):
     """Abstract base class for prediction market API clients."""
 
-    def __init__(self, api_key: Optional[str] = None):
+    # Optional limiter applied to every request this client makes
+    _rate_limiter: Optional[TokenBucket] = None
+
+    # raw_data keys kept when slim_raw_data is set: the fields category
+    # tagging reads. Clients whose raw_data nothing reads keep none.
+    RAW_DATA_FIELDS: Tuple[str, ...] = ()
+
+    def __init__(self, api_key: Optional[str] = None, slim_raw_data: bool = False):
+        """
+        Args:
+            api_key: Platform API key, if the client needs one
+            slim_raw_data: Keep only RAW_DATA_FIELDS of each API payload in
+                MarketData.raw_data instead of the whole payload
+        """
         self.api_key = api_key
-        self._session = None
+        self.slim_raw_data = slim_raw_data
+        self._transport = get_transport()
+        self._response_cache = get_response_cache()
+        # Client-specific headers sent on top of the transport defaults
+        self._headers: Dict[str, str] = {}
 
     @property
     @abstractmethod
@@ -119,6 +161,222 @@ class BaseMarketClient(ABC):
         """
         pass
 
+    async def get_political_markets_async(self) -> List[MarketData]:
+        """
+        Fetch all political/election markets without blocking the event loop.
+
+        Clients with a native async implementation override this; the default
+        runs the blocking get_political_markets() in a worker thread.
+        """
+        return await asyncio.to_thread(self.get_political_markets)
+
+    def get_political_batch(self, snapshot_time: Optional[datetime] = None) -> 'MarketBatch':
+        """Political markets as a columnar MarketBatch, one row per contract."""
+        from .batch import MarketBatch
+
+        return MarketBatch.from_markets(self.get_political_markets(), snapshot_time)
+
+    async def get_political_batch_async(self, snapshot_time: Optional[datetime] = None) -> 'MarketBatch':
+        """Async counterpart of get_political_batch."""
+        from .batch import MarketBatch
+
+        return MarketBatch.from_markets(await self.get_political_markets_async(), snapshot_time)
+
+    def _raw_data(self, payload: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """The raw_data to keep for an API payload, honoring slim_raw_data."""
+        if not self.slim_raw_data or payload is None:
+            return payload
+        return {k: payload[k] for k in self.RAW_DATA_FIELDS if k in payload} or None
+
+    def _derived_name(self, name: str) -> str:
+        """Cache name for values derived from responses, distinct per raw_data mode."""
+        return f"{name}:slim" if self.slim_raw_data else name
+
+    def _request_json(self, method: str, url: str, **kwargs) -> Optional[Any]:
+        """Send a request through the shared transport. Returns None on error."""
+        import requests
+
+        try:
+            response = self._transport.request(
+                method, url, headers=self._headers, limiter=self._rate_limiter, **kwargs
+            )
+            response.raise_for_status()
+            return response.json()
+        except requests.RequestException as e:
+            print(f"[{self.source_name}] Request error for {url}: {e}")
+            return None
+
+    def _get_json(self, url: str, params: Optional[Dict] = None) -> Optional[Any]:
+        """GET a JSON document. Returns None on error."""
+        return self._request_json('GET', url, params=params)
+
+    async def _request_json_async(self, method: str, url: str, **kwargs) -> Optional[Any]:
+        """Async counterpart of _request_json."""
+        import aiohttp
+
+        try:
+            return await self._transport.request_json_async(
+                method, url, headers=self._headers, limiter=self._rate_limiter, **kwargs
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            print(f"[{self.source_name}] Request error for {url}: {e}")
+            return None
+
+    async def _get_json_async(self, url: str, params: Optional[Dict] = None) -> Optional[Any]:
+        """GET a JSON document over the async session. Returns None on error."""
+        return await self._request_json_async('GET', url, params=params)
+
+    def _get_json_cached(self, url: str, params: Optional[Dict] = None,
+                         parse: Optional[Callable[[Any], Any]] = None,
+                         name: str = 'parsed',
+                         copy: Optional[Callable[[Any], Any]] = None) -> Optional[Any]:
+        """
+        Conditional GET through the shared response cache.
+
+        Sends the validators of the cached response, if any. On 304 the
+        previous parse(body) result (memoized under `name`) is returned
+        without re-downloading or re-parsing; otherwise the new body is
+        parsed and cached when the server supplied validators. Without
+        `parse` the decoded body itself is returned. With copy, callers get
+        copy(result) instead of the cached instance. Returns None on error.
+        """
+        import requests
+
+        key = ResponseCache.make_key(url, params)
+        entry = self._response_cache.get(key)
+        headers = {**self._headers, **entry.validators()} if entry else self._headers
+        try:
+            response = self._transport.request(
+                'GET', url, params=params, headers=headers, limiter=self._rate_limiter
+            )
+            if response.status_code == 304 and entry is not None:
+                return self._copy_result(entry.derive(name, parse), copy)
+            response.raise_for_status()
+            body = response.json()
+        except requests.RequestException as e:
+            print(f"[{self.source_name}] Request error for {url}: {e}")
+            return None
+
+        entry = self._store_response(key, body, len(response.content), response.headers)
+        return self._copy_result(entry.derive(name, parse), copy)
+
+    async def _get_json_cached_async(self, url: str, params: Optional[Dict] = None,
+                                     parse: Optional[Callable[[Any], Any]] = None,
+                                     name: str = 'parsed',
+                                     copy: Optional[Callable[[Any], Any]] = None) -> Optional[Any]:
+        """Async counterpart of _get_json_cached."""
+        import aiohttp
+
+        key = ResponseCache.make_key(url, params)
+        entry = self._response_cache.get(key)
+        headers = {**self._headers, **entry.validators()} if entry else self._headers
+        try:
+            response = await self._transport.request_async(
+                'GET', url, params=params, headers=headers, limiter=self._rate_limiter
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            print(f"[{self.source_name}] Request error for {url}: {e}")
+            return None
+
+        if response.status == 304 and entry is not None:
+            return self._copy_result(entry.derive(name, parse), copy)
+        entry = self._store_response(key, response.body, response.size, response.headers)
+        return self._copy_result(entry.derive(name, parse), copy)
+
+    def _get_json_items_cached(self, url: str, params: Optional[Dict],
+                               map_item: Callable[[Any], Any],
+                               name: str,
+                               copy_item: Optional[Callable[[Any], Any]] = None
+                               ) -> Optional[List[Any]]:
+        """
+        Conditional GET of a JSON array, decoded while it streams in.
+
+        Returns [map_item(element), ...]. Elements are converted as soon as
+        they are complete, so the decoded page is never held in full; only
+        the mapped list is cached (under `name`) for reuse on 304. With
+        copy_item, callers get copy_item(item) of each cached item instead
+        of the cached instances (e.g. to re-stamp them on every fetch).
+        """
+        import requests
+
+        # Only the mapped items are kept, so these entries get their own key
+        key = f"{ResponseCache.make_key(url, params)}#{name}"
+        entry = self._response_cache.get(key)
+        headers = {**self._headers, **entry.validators()} if entry else self._headers
+        try:
+            response = self._transport.request(
+                'GET', url, params=params, headers=headers, limiter=self._rate_limiter,
+                stream=True,
+            )
+            with response:
+                if response.status_code == 304 and entry is not None:
+                    return self._copy_items(entry.derived[name], copy_item)
+                response.raise_for_status()
+                decoder = JsonArrayDecoder()
+                items = []
+                size = 0
+                for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+                    size += len(chunk)
+                    items.extend(map_item(item) for item in decoder.feed(chunk))
+                decoder.close()
+        except (requests.RequestException, ValueError) as e:
+            print(f"[{self.source_name}] Request error for {url}: {e}")
+            return None
+
+        self._store_response(key, None, size, response.headers, {name: items})
+        return self._copy_items(items, copy_item)
+
+    async def _get_json_items_cached_async(self, url: str, params: Optional[Dict],
+                                           map_item: Callable[[Any], Any],
+                                           name: str,
+                                           copy_item: Optional[Callable[[Any], Any]] = None
+                                           ) -> Optional[List[Any]]:
+        """Async counterpart of _get_json_items_cached."""
+        import aiohttp
+
+        key = f"{ResponseCache.make_key(url, params)}#{name}"
+        entry = self._response_cache.get(key)
+        headers = {**self._headers, **entry.validators()} if entry else self._headers
+        try:
+            response = await self._transport.request_async(
+                'GET', url, params=params, headers=headers, limiter=self._rate_limiter,
+                map_items=map_item,
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            print(f"[{self.source_name}] Request error for {url}: {e}")
+            return None
+
+        if response.status == 304 and entry is not None:
+            return self._copy_items(entry.derived[name], copy_item)
+        self._store_response(key, None, response.size, response.headers, {name: response.body})
+        return self._copy_items(response.body, copy_item)
+
+    @staticmethod
+    def _copy_result(result: Any, copy: Optional[Callable[[Any], Any]]) -> Any:
+        if copy is None or result is None:
+            return result
+        return copy(result)
+
+    @staticmethod
+    def _copy_items(items: Optional[List[Any]],
+                    copy_item: Optional[Callable[[Any], Any]]) -> Optional[List[Any]]:
+        if copy_item is None or items is None:
+            return items
+        return [copy_item(item) for item in items]
+
+    def _store_response(self, key: str, body: Any, size: int, headers,
+                        derived: Optional[Dict[str, Any]] = None) -> CacheEntry:
+        entry = CacheEntry(
+            body=body,
+            size=size,
+            etag=headers.get('ETag'),
+            last_modified=headers.get('Last-Modified'),
+            derived=derived or {},
+        )
+        if entry.cacheable:
+            self._response_cache.put(key, entry)
+        return entry
+
     def normalize_price(self, price: Any, price_format: str = "decimal") -> float:
         """
         Normalize price to 0.0-1.0 probability scale.
@@ -150,7 +408,12 @@ class BaseMarketClient(ABC):
             return float(price)
 
     def close(self):
-        """Clean up resources."""
-        if self._session:
-            self._session.close()
-            self._session = None
+        """Clean up resources.
+
+        Connections belong to the shared transport and stay pooled for other
+        clients, so there is nothing client-specific to release.
+        """
+
+    async def aclose(self):
+        """Release the running loop's async session. Call before the loop shuts down."""
+        await self._transport.aclose()
@@ -0,0 +1,215 @@
+"""
+Columnar representation of fetched contracts.
+
+A MarketBatch holds one row per contract as parallel columns: numeric
+fields in array.array('d') buffers (NaN for missing), flags in
+array.array('B') buffers, string fields in plain lists. It is built once per fetch and converts to NumPy arrays, a
+pandas DataFrame or DB insert rows without going through per-row dicts.
+"""
+
+import math
+from array import array
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .base import MarketData
+
+_NAN = float('nan')
+
+
+def _float(value: Any) -> float:
+    if value is None:
+        return _NAN
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return _NAN
+
+
+class MarketBatch:
+    """Parallel typed columns for a set of contracts, one row per contract."""
+
+    STRING_COLUMNS = (
+        'source', 'market_id', 'market_name', 'contract_id', 'contract_name',
+        'status', 'url',
+    )
+    FLOAT_COLUMNS = (
+        'yes_price', 'no_price', 'yes_bid', 'yes_ask', 'no_bid', 'no_ask',
+        'volume', 'market_volume',
+        'last_updated',  # Unix seconds
+    )
+    # Per-market flags, repeated on each contract row; not exported
+    FLAG_COLUMNS = (
+        'mutually_exclusive',
+    )
+
+    def __init__(self, snapshot_time: Optional[datetime] = None):
+        """
+        Args:
+            snapshot_time: Cycle timestamp shared by every row (default: now, UTC)
+        """
+        self.snapshot_time = snapshot_time or datetime.now(timezone.utc)
+        self.strings: Dict[str, List[Optional[str]]] = {c: [] for c in self.STRING_COLUMNS}
+        self.floats: Dict[str, array] = {c: array('d') for c in self.FLOAT_COLUMNS}
+        self.flags: Dict[str, array] = {c: array('B') for c in self.FLAG_COLUMNS}
+
+    @classmethod
+    def from_markets(cls, markets: Iterable[MarketData],
+                     snapshot_time: Optional[datetime] = None) -> 'MarketBatch':
+        batch = cls(snapshot_time)
+        batch.add_markets(markets)
+        return batch
+
+    @classmethod
+    def concat(cls, batches: Sequence['MarketBatch'],
+               snapshot_time: Optional[datetime] = None) -> 'MarketBatch':
+        """Join batches; the result takes snapshot_time or the first batch's."""
+        if snapshot_time is None and batches:
+            snapshot_time = batches[0].snapshot_time
+        result = cls(snapshot_time)
+        for batch in batches:
+            for name in cls.STRING_COLUMNS:
+                result.strings[name].extend(batch.strings[name])
+            for name in cls.FLOAT_COLUMNS:
+                result.floats[name].extend(batch.floats[name])
+            for name in cls.FLAG_COLUMNS:
+                result.flags[name].extend(batch.flags[name])
+        return result
+
+    def add_markets(self, markets: Iterable[MarketData]):
+        for market in markets:
+            self.add_market(market)
+
+    def add_market(self, market: MarketData):
+        """Append one row per contract of market."""
+        contracts = market.contracts
+        n = len(contracts)
+        if not n:
+            return
+
+        s = self.strings
+        s['source'].extend([market.source] * n)
+        s['market_id'].extend([market.market_id] * n)
+        s['market_name'].extend([market.market_name] * n)
+        s['status'].extend([market.status.value] * n)
+        s['url'].extend([market.url] * n)
+        s['contract_id'].extend([c.contract_id for c in contracts])
+        s['contract_name'].extend([c.contract_name for c in contracts])
+
+        f = self.floats
+        f['yes_price'].extend([_float(c.yes_price) for c in contracts])
+        f['no_price'].extend([_float(c.no_price) for c in contracts])
+        f['yes_bid'].extend([_float(c.yes_bid) for c in contracts])
+        f['yes_ask'].extend([_float(c.yes_ask) for c in contracts])
+        f['no_bid'].extend([_float(c.no_bid) for c in contracts])
+        f['no_ask'].extend([_float(c.no_ask) for c in contracts])
+        f['volume'].extend([_float(c.volume) for c in contracts])
+        f['market_volume'].extend([_float(market.total_volume)] * n)
+        f['last_updated'].extend([
+            c.last_updated.timestamp() if c.last_updated else _NAN for c in contracts
+        ])
+        self.flags['mutually_exclusive'].extend([market.mutually_exclusive] * n)
+
+    def __len__(self) -> int:
+        return len(self.strings['contract_id'])
+
+    def column(self, name: str) -> List[Any]:
+        """A column as Python values, with None for missing numbers."""
+        if name in self.strings:
+            return self.strings[name]
+        if name in self.flags:
+            return [bool(v) for v in self.flags[name]]
+        return [None if math.isnan(v) else v for v in self.floats[name]]
+
+    def rows(self, columns: Sequence[str]) -> Iterator[Tuple[Any, ...]]:
+        """Row tuples over the given columns, e.g. for executemany()."""
+        return zip(*(self.column(name) for name in columns))
+
+    def snapshot_rows(self) -> Iterator[Tuple[Any, ...]]:
+        """
+        Rows for the price_snapshots table:
+        (source, market_id, contract_id, snapshot_time, yes_price, no_price,
+        yes_bid, yes_ask, volume).
+        """
+        snapshot_time = [self.snapshot_time.isoformat()] * len(self)
+        return zip(
+            self.strings['source'], self.strings['market_id'], self.strings['contract_id'],
+            snapshot_time,
+            *(self.column(name) for name in ('yes_price', 'no_price', 'yes_bid', 'yes_ask', 'volume')),
+        )
+
+    def to_numpy(self) -> Dict[str, Any]:
+        """
+        Columns as NumPy arrays. Numeric columns are float64 views of the
+        batch buffers (no copy), so the batch cannot grow while they are
+        alive; flags are bool arrays and string columns are object arrays.
+        """
+        import numpy as np
+
+        columns: Dict[str, Any] = {
+            name: np.array(values, dtype=object) for name, values in self.strings.items()
+        }
+        for name, values in self.floats.items():
+            columns[name] = np.frombuffer(values, dtype=np.float64) if len(values) else np.empty(0)
+        for name, values in self.flags.items():
+            columns[name] = np.array(values, dtype=bool)
+        return columns
+
+    def to_dataframe(self, columns: Optional[Sequence[str]] = None,
+                     categorical: Sequence[str] = ()):
+        """
+        Columns as a pandas DataFrame, built column by column.
+
+        Args:
+            columns: Columns to include, in order (default: all)
+            categorical: String columns to store as pandas categoricals;
+                worthwhile for low-cardinality or heavily repeated values
+
+        last_updated becomes a UTC datetime column.
+        """
+        import numpy as np
+        import pandas as pd
+
+        data = {}
+        for name in columns or self.STRING_COLUMNS + self.FLOAT_COLUMNS:
+            if name in self.strings:
+                values = self.strings[name]
+                data[name] = (pd.Categorical(values) if name in categorical
+                              else np.array(values, dtype=object))
+            else:
+                # Copied out of the buffer so the batch stays appendable
+                values = np.array(self.floats[name], dtype=np.float64)
+                if name == 'last_updated':
+                    values = pd.to_datetime(values, unit='s', utc=True)
+                data[name] = values
+        return pd.DataFrame(data)
+
+    def to_record_batches(self, columns: Optional[Sequence[str]] = None,
+                          chunk_rows: int = 65536) -> Iterator[Any]:
+        """
+        Columns as pyarrow RecordBatches of at most chunk_rows rows, for
+        streaming into Parquet or Arrow IPC writers. Missing numbers become
+        nulls; last_updated becomes a UTC timestamp column.
+        """
+        import numpy as np
+        import pyarrow as pa
+
+        names = list(columns or self.STRING_COLUMNS + self.FLOAT_COLUMNS)
+        floats = {name: np.frombuffer(self.floats[name], dtype=np.float64)
+                  for name in names if name in self.floats and len(self)}
+        # An empty batch still yields one (empty) chunk so writers get a schema
+        for start in range(0, max(len(self), 1), chunk_rows):
+            stop = min(start + chunk_rows, len(self))
+            arrays = []
+            for name in names:
+                if name in self.strings:
+                    arrays.append(pa.array(self.strings[name][start:stop], type=pa.string()))
+                    continue
+                values = floats[name][start:stop] if len(self) else np.empty(0)
+                if name == 'last_updated':
+                    micros = np.where(np.isnan(values), 0, values * 1e6).astype(np.int64)
+                    arrays.append(pa.array(micros, type=pa.timestamp('us', tz='UTC'),
+                                           mask=np.isnan(values)))
+                else:
+                    arrays.append(pa.array(values, type=pa.float64(), from_pandas=True))
+            yield pa.RecordBatch.from_arrays(arrays, names=names)
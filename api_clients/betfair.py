@@ -21,13 +21,19 @@ ENVIRONMENT VARIABLES:
 - BETFAIR_APP_KEY: Your Betfair API application key
 - BETFAIR_USERNAME: Betfair account username
 - BETFAIR_PASSWORD: Betfair account password
+- BETFAIR_SESSION_FILE: Where the session token is cached between runs
+  (default: ~/.cache/election_odds/betfair_session.json)
 """
 
+import json
 import os
-import requests
+import threading
+import time
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from pathlib import Path
+from typing import List, Optional, Dict, Any, Union
 from .base import BaseMarketClient, MarketData, ContractData, MarketStatus
+from .ratelimit import TokenBucket
 
 
 class BetfairClient(BaseMarketClient):
@@ -35,11 +41,39 @@ class BetfairClient(BaseMarketClient):
 
     # API endpoints
     AUTH_URL = "https://identitysso.betfair.com/api/login"
+    KEEP_ALIVE_URL = "https://identitysso.betfair.com/api/keepAlive"
     EXCHANGE_URL = "https://api.betfair.com/exchange/betting/rest/v1.0"
 
     # Event Type IDs
     POLITICS_EVENT_TYPE_ID = "2378961"  # Politics
 
+    RATE_LIMIT_PER_SECOND = 12
+    _rate_limiter = TokenBucket(RATE_LIMIT_PER_SECOND)
+
+    # listMarketCatalogue results per request; the projections used cost no
+    # request weight, so this is the API's cap. Events are batched into one
+    # request, split only if a response comes back full (possibly truncated)
+    CATALOGUE_MAX_RESULTS = 1000
+
+    # Exchange API error codes meaning the session token is no longer valid
+    SESSION_ERRORS = ('INVALID_SESSION_INFORMATION', 'NO_SESSION')
+
+    # listMarketBook request weight: sum over markets of the weights of the
+    # requested price data must not exceed MARKET_BOOK_WEIGHT_LIMIT
+    MARKET_BOOK_WEIGHT_LIMIT = 200
+    PRICE_DATA_WEIGHTS = {
+        'SP_AVAILABLE': 3,
+        'SP_TRADED': 7,
+        'EX_BEST_OFFERS': 5,
+        'EX_ALL_OFFERS': 17,
+        'EX_TRADED': 17,
+    }
+    PRICE_DATA = ["EX_BEST_OFFERS", "EX_TRADED"]
+
+    # Cached sessions are refreshed with keepAlive once older than this
+    KEEP_ALIVE_INTERVAL = 30 * 60
+    DEFAULT_SESSION_FILE = Path.home() / ".cache" / "election_odds" / "betfair_session.json"
+
     @property
     def source_name(self) -> str:
         return "Betfair"
@@ -50,8 +84,9 @@ class BetfairClient(BaseMarketClient):
 
     def __init__(self, app_key: Optional[str] = None,
                  username: Optional[str] = None,
-                 password: Optional[str] = None):
-        super().__init__(api_key=app_key)
+                 password: Optional[str] = None,
+                 slim_raw_data: bool = False):
+        super().__init__(api_key=app_key, slim_raw_data=slim_raw_data)
 
         # Get credentials from env vars if not provided
         self.app_key = app_key or os.environ.get('BETFAIR_APP_KEY')
@@ -59,12 +94,13 @@ class BetfairClient(BaseMarketClient):
         self.password = password or os.environ.get('BETFAIR_PASSWORD')
 
         self._session_token = None
-        self._session = requests.Session()
+        self._session_refreshed = 0.0  # time.time() of last login/keepAlive
+        self._session_lock = threading.Lock()
+        self.session_file = Path(os.environ.get('BETFAIR_SESSION_FILE') or self.DEFAULT_SESSION_FILE)
 
         if self.app_key:
-            self._session.headers.update({
+            self._headers.update({
                 'X-Application': self.app_key,
-                'Accept': 'application/json',
                 'Content-Type': 'application/json',
             })
 
@@ -74,12 +110,15 @@ class BetfairClient(BaseMarketClient):
 
     def login(self) -> bool:
         """Authenticate with Betfair and get session token."""
+        import requests
+
         if not self.is_configured():
             print("[Betfair] Missing credentials. Set BETFAIR_APP_KEY, BETFAIR_USERNAME, BETFAIR_PASSWORD")
             return False
 
         try:
-            response = requests.post(
+            response = self._transport.request(
+                'POST',
                 self.AUTH_URL,
                 headers={
                     'X-Application': self.app_key,
@@ -89,14 +128,13 @@ class BetfairClient(BaseMarketClient):
                     'username': self.username,
                     'password': self.password,
                 },
-                timeout=30
             )
             response.raise_for_status()
             data = response.json()
 
             if data.get('status') == 'SUCCESS':
-                self._session_token = data.get('token')
-                self._session.headers['X-Authentication'] = self._session_token
+                self._set_session(data.get('token'))
+                self._save_session()
                 print("[Betfair] Login successful")
                 return True
             else:
@@ -107,20 +145,134 @@ class BetfairClient(BaseMarketClient):
             print(f"[Betfair] Login error: {e}")
             return False
 
-    def _make_request(self, operation: str, params: Dict) -> Optional[Any]:
-        """Make a POST request to the Exchange API."""
+    def _set_session(self, token: Optional[str], refreshed: Optional[float] = None):
+        self._session_token = token
+        self._session_refreshed = time.time() if refreshed is None else refreshed
+        if token:
+            self._headers['X-Authentication'] = token
+        else:
+            self._headers.pop('X-Authentication', None)
+
+    def _load_session(self) -> bool:
+        """Restore a session token saved by a previous run for this account."""
+        try:
+            cached = json.loads(self.session_file.read_text())
+        except (OSError, ValueError):
+            return False
+
+        if (not cached.get('token') or cached.get('app_key') != self.app_key
+                or cached.get('username') != self.username):
+            return False
+
+        self._set_session(cached['token'], cached.get('refreshed', 0.0))
+        return True
+
+    def _save_session(self):
+        """Persist the session token so the next run can skip login."""
+        try:
+            self.session_file.parent.mkdir(parents=True, exist_ok=True)
+            self.session_file.touch(mode=0o600, exist_ok=True)
+            self.session_file.write_text(json.dumps({
+                'token': self._session_token,
+                'app_key': self.app_key,
+                'username': self.username,
+                'refreshed': self._session_refreshed,
+            }))
+        except OSError as e:
+            print(f"[Betfair] Could not cache session: {e}")
+
+    def keep_alive(self) -> bool:
+        """Extend the current session; returns False if it has expired."""
+        import requests
+
         if not self._session_token:
-            if not self.login():
-                return None
+            return False
 
         try:
-            url = f"{self.EXCHANGE_URL}/{operation}/"
-            response = self._session.post(url, json=params, timeout=30)
+            response = self._transport.request(
+                'POST',
+                self.KEEP_ALIVE_URL,
+                headers={
+                    'Accept': 'application/json',
+                    'X-Application': self.app_key,
+                    'X-Authentication': self._session_token,
+                },
+            )
             response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            print(f"[Betfair] Request error for {operation}: {e}")
-            return None
+            data = response.json()
+        except (requests.RequestException, ValueError) as e:
+            print(f"[Betfair] Keep-alive error: {e}")
+            return False
+
+        if data.get('status') != 'SUCCESS':
+            return False
+
+        self._set_session(data.get('token') or self._session_token)
+        self._save_session()
+        return True
+
+    def _ensure_session(self) -> bool:
+        """
+        Make sure a live session token is set.
+
+        Reuses the token cached by a previous run, refreshing it with
+        keepAlive when it is older than KEEP_ALIVE_INTERVAL, and only logs
+        in again when that fails.
+        """
+        with self._session_lock:
+            if not self._session_token:
+                self._load_session()
+
+            if self._session_token:
+                if time.time() - self._session_refreshed < self.KEEP_ALIVE_INTERVAL:
+                    return True
+                if self.keep_alive():
+                    return True
+                self._set_session(None)
+
+            return self.login()
+
+    def _invalidate_session(self, token: Optional[str]):
+        """Drop a session the API rejected, and its cached copy, unless another thread already replaced it."""
+        with self._session_lock:
+            if self._session_token != token:
+                return
+            self._set_session(None)
+            try:
+                self.session_file.unlink(missing_ok=True)
+            except OSError as e:
+                print(f"[Betfair] Could not remove cached session: {e}")
+
+    def _make_request(self, operation: str, params: Dict) -> Optional[Any]:
+        """
+        Make a POST request to the Exchange API.
+
+        A session the API rejects (e.g. expired server-side while the cached
+        token still looked fresh) is dropped, and the request is retried
+        once after logging in again.
+        """
+        import requests
+
+        url = f"{self.EXCHANGE_URL}/{operation}/"
+        for attempt in range(2):
+            if not self._ensure_session():
+                return None
+            token = self._session_token
+            try:
+                response = self._transport.request(
+                    'POST', url, headers=self._headers, limiter=self._rate_limiter, json=params
+                )
+                if not response.ok and any(code in response.text for code in self.SESSION_ERRORS):
+                    self._invalidate_session(token)
+                    if attempt == 0:
+                        print("[Betfair] Session rejected; logging in again")
+                        continue
+                response.raise_for_status()
+                return response.json()
+            except (requests.RequestException, ValueError) as e:
+                print(f"[{self.source_name}] Request error for {url}: {e}")
+                return None
+        return None
 
     def list_event_types(self) -> List[Dict]:
         """List all event types (sports/categories)."""
@@ -138,11 +290,14 @@ class BetfairClient(BaseMarketClient):
         data = self._make_request("listEvents", params)
         return data if data else []
 
-    def list_market_catalogue(self, event_id: str, max_results: int = 100) -> List[Dict]:
-        """List markets for an event."""
+    def list_market_catalogue(self, event_ids: Union[str, List[str]],
+                              max_results: int = 100) -> List[Dict]:
+        """List markets for one event or a list of events (one request)."""
+        if isinstance(event_ids, str):
+            event_ids = [event_ids]
         params = {
             "filter": {
-                "eventIds": [event_id],
+                "eventIds": list(event_ids),
             },
             "maxResults": max_results,
             "marketProjection": ["RUNNER_DESCRIPTION", "EVENT", "MARKET_START_TIME"],
@@ -150,17 +305,64 @@ class BetfairClient(BaseMarketClient):
         data = self._make_request("listMarketCatalogue", params)
         return data if data else []
 
+    def get_market_catalogues(self, event_ids: List[str]) -> List[Dict]:
+        """
+        Catalogues of every market of the given events, in as few
+        listMarketCatalogue calls as possible: all events at once, halving
+        any batch whose response fills CATALOGUE_MAX_RESULTS. The API
+        cannot page past that cap, so a single event that fills it on its
+        own is reported as possibly truncated.
+        """
+        catalogs = []
+        pending = [list(event_ids)] if event_ids else []
+        while pending:
+            batch = pending.pop()
+            result = self.list_market_catalogue(batch, self.CATALOGUE_MAX_RESULTS)
+            if len(result) >= self.CATALOGUE_MAX_RESULTS:
+                if len(batch) > 1:
+                    middle = len(batch) // 2
+                    pending += [batch[middle:], batch[:middle]]
+                    continue
+                print(f"[Betfair] Event {batch[0]} has at least {self.CATALOGUE_MAX_RESULTS} "
+                      f"markets; its catalogue may be truncated")
+            catalogs.extend(result)
+        return catalogs
+
     def list_market_book(self, market_ids: List[str]) -> List[Dict]:
-        """Get current prices for markets."""
+        """Get current prices for markets (one request; see plan_market_book)."""
         params = {
             "marketIds": market_ids,
             "priceProjection": {
-                "priceData": ["EX_BEST_OFFERS", "EX_TRADED"],
+                "priceData": self.PRICE_DATA,
             },
         }
         data = self._make_request("listMarketBook", params)
         return data if data else []
 
+    def plan_market_book(self, market_ids: List[str]) -> List[List[str]]:
+        """
+        Split market ids into the fewest listMarketBook requests that stay
+        within MARKET_BOOK_WEIGHT_LIMIT for the configured PRICE_DATA.
+
+        Every market costs the same weight under one price projection, so
+        filling each request to the limit in order is optimal.
+        """
+        weight = sum(self.PRICE_DATA_WEIGHTS.get(p, 0) for p in self.PRICE_DATA)
+        per_request = max(1, self.MARKET_BOOK_WEIGHT_LIMIT // weight) if weight else len(market_ids)
+        unique_ids = list(dict.fromkeys(market_ids))
+        return [
+            unique_ids[i:i + per_request]
+            for i in range(0, len(unique_ids), per_request)
+        ]
+
+    def get_market_books(self, market_ids: List[str]) -> Dict[str, Dict]:
+        """Fetch books for any number of markets, keyed by market id."""
+        books = {}
+        for chunk in self.plan_market_book(market_ids):
+            for book in self.list_market_book(chunk):
+                books[book['marketId']] = book
+        return books
+
     def _fractional_to_probability(self, decimal_odds: float) -> float:
         """Convert decimal odds to probability."""
         if decimal_odds <= 1:
@@ -245,45 +447,42 @@ class BetfairClient(BaseMarketClient):
             description=event.get('name'),
             total_volume=total_volume,
             last_updated=datetime.now(),
-            raw_data={'catalog': catalog, 'book': book}
+            raw_data=self._raw_data({'catalog': catalog, 'book': book}),
+            mutually_exclusive=bool(book) and book.get('numberOfWinners') == 1,
         )
 
     def get_political_markets(self) -> List[MarketData]:
-        """Fetch all political/election markets."""
+        """
+        Fetch all political/election markets.
+
+        Catalogues for all events come from one batched listMarketCatalogue
+        call (see get_market_catalogues), then the books for every market are
+        packed into as few listMarketBook calls as the request-weight limit
+        allows.
+        """
         if not self.is_configured():
             print("[Betfair] Not configured - returning empty list")
             print("  Set environment variables: BETFAIR_APP_KEY, BETFAIR_USERNAME, BETFAIR_PASSWORD")
             return []
 
-        results = []
-
         # Get politics events
         events = self.list_events(self.POLITICS_EVENT_TYPE_ID)
+        event_ids = [
+            e.get('event', {}).get('id') for e in events
+            if e.get('event', {}).get('id')
+        ]
+        if not event_ids:
+            return []
 
-        for event_data in events:
-            event = event_data.get('event', {})
-            event_id = event.get('id')
-            if not event_id:
-                continue
-
-            # Get markets for event
-            catalogs = self.list_market_catalogue(event_id)
-
-            if not catalogs:
-                continue
-
-            # Get current prices
-            market_ids = [c['marketId'] for c in catalogs]
-            books = self.list_market_book(market_ids)
-            books_map = {b['marketId']: b for b in books}
+        # Catalogues for all events, then books for all markets at once
+        catalogs = self.get_market_catalogues(event_ids)
 
-            for catalog in catalogs:
-                market_id = catalog['marketId']
-                book = books_map.get(market_id)
-                market_data = self._parse_market(catalog, book)
-                results.append(market_data)
+        books_map = self.get_market_books([c['marketId'] for c in catalogs])
 
-        return results
+        return [
+            self._parse_market(catalog, books_map.get(catalog['marketId']))
+            for catalog in catalogs
+        ]
 
     def get_market_prices(self, market_id: str) -> Optional[MarketData]:
         """Fetch current prices for a specific market."""
@@ -0,0 +1,102 @@
+"""
+Conditional-GET response cache shared by all market clients.
+
+Entries keep the validators (ETag / Last-Modified) and decoded body of a
+previous response, plus whatever the client derived from that body. When
+the server answers 304 Not Modified, the client gets the derived value
+back without downloading or re-parsing anything.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlencode
+
+
+@dataclass
+class CacheEntry:
+    """A cached response body with its validators and derived values."""
+    body: Any
+    size: int  # Encoded body size in bytes, used for the LRU budget
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    derived: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def cacheable(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+    def validators(self) -> Dict[str, str]:
+        """Request headers that make the next GET conditional."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    def derive(self, name: str, fn: Optional[Callable[[Any], Any]] = None) -> Any:
+        """Return fn(body), computing it only once per entry."""
+        if fn is None:
+            return self.body
+        if name not in self.derived:
+            self.derived[name] = fn(self.body)
+        return self.derived[name]
+
+
+class ResponseCache:
+    """Thread-safe LRU of CacheEntry objects bounded by total body size."""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict] = None) -> str:
+        if not params:
+            return url
+        return f"{url}?{urlencode(sorted(params.items()))}"
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, entry: CacheEntry):
+        if entry.size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= old.size
+            self._entries[key] = entry
+            self._size += entry.size
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= evicted.size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Return the process-wide response cache, creating it on first use."""
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = ResponseCache()
+        return _response_cache
@@ -0,0 +1,160 @@
+"""
+Incremental decoding of top-level JSON arrays.
+
+Large list endpoints (e.g. Polymarket event pages) can be decoded element
+by element while the body is still arriving, so each element can be
+converted and dropped instead of holding the whole decoded page at once.
+"""
+
+import codecs
+import json
+import re
+from typing import Any, List, Optional
+
+_WHITESPACE = ' \t\n\r'
+# Characters that can change nesting depth or string state
+_STRUCTURAL = re.compile(r'[\[\]{}"]')
+# Characters that end a string or escape the next character
+_STRING_SPECIAL = re.compile(r'["\\]')
+# Characters that end a scalar element
+_SCALAR_END = re.compile(r'[,\]\s]')
+
+
+class JsonArrayDecoder:
+    """
+    Push decoder for a JSON document whose top level is an array.
+
+    feed() takes raw bytes in arbitrary chunks and returns the elements that
+    became complete; close() checks that the array was terminated.
+
+    An element that arrives whole is decoded directly. One that doesn't is
+    scanned once, resuming where the previous chunk stopped (bracket depth
+    and string state are kept), and decoded only when its end has arrived,
+    so a large element split over many chunks costs linear time rather
+    than a re-parse per chunk.
+    """
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._started = False
+        self._finished = False
+        self.count = 0
+        # Scan state of the element in progress: its start in the buffer and
+        # how far it has been scanned (None between elements)
+        self._start = 0
+        self._scan: Optional[int] = None
+        self._depth = 0
+        self._in_string = False
+
+    def _skip(self, pos: int, chars: str = _WHITESPACE) -> int:
+        while pos < len(self._buffer) and self._buffer[pos] in chars:
+            pos += 1
+        return pos
+
+    def _element_end(self) -> Optional[int]:
+        """End of the element in progress, or None if it hasn't all arrived."""
+        buffer = self._buffer
+        pos = self._scan
+        if buffer[self._start] not in '[{"':
+            match = _SCALAR_END.search(buffer, pos)
+            if match is None:
+                self._scan = len(buffer)
+                return None
+            return match.start()
+
+        while True:
+            if self._in_string:
+                match = _STRING_SPECIAL.search(buffer, pos)
+                if match is None:
+                    pos = len(buffer)
+                    break
+                if match.group() == '\\':
+                    if match.end() == len(buffer):
+                        # Resume at the backslash once the escaped char arrives
+                        pos = match.start()
+                        break
+                    pos = match.end() + 1
+                    continue
+                self._in_string = False
+                pos = match.end()
+                if self._depth == 0:
+                    return pos
+            else:
+                match = _STRUCTURAL.search(buffer, pos)
+                if match is None:
+                    pos = len(buffer)
+                    break
+                char = match.group()
+                pos = match.end()
+                if char == '"':
+                    self._in_string = True
+                elif char in '[{':
+                    self._depth += 1
+                else:
+                    self._depth -= 1
+                    if self._depth == 0:
+                        return pos
+        self._scan = pos
+        return None
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        self._buffer += self._utf8.decode(chunk)
+        items = []
+        pos = 0
+
+        if not self._started:
+            pos = self._skip(0)
+            if pos == len(self._buffer):
+                self._buffer = ''
+                return items
+            if self._buffer[pos] != '[':
+                raise ValueError("Expected a JSON array")
+            self._started = True
+            pos += 1
+
+        while not self._finished:
+            if self._scan is None:
+                pos = self._skip(pos, _WHITESPACE + ',')
+                if pos == len(self._buffer):
+                    break
+                if self._buffer[pos] == ']':
+                    self._finished = True
+                    pos += 1
+                    break
+                if self._buffer[pos] in '[{"':
+                    # Fast path: most elements arrive whole within a chunk
+                    try:
+                        item, pos = self._decoder.raw_decode(self._buffer, pos)
+                    except json.JSONDecodeError:
+                        pass
+                    else:
+                        items.append(item)
+                        continue
+                self._start = self._scan = pos
+                self._depth = 0
+                self._in_string = False
+
+            if self._element_end() is None:
+                break
+            # raw_decode stops at the element's end; a malformed element
+            # raises JSONDecodeError (a ValueError)
+            item, pos = self._decoder.raw_decode(self._buffer, self._start)
+            items.append(item)
+            self._scan = None
+
+        if self._scan is None:
+            self._buffer = self._buffer[pos:]
+        else:
+            # Keep only the element in progress
+            self._buffer = self._buffer[self._start:]
+            self._scan -= self._start
+            self._start = 0
+        self.count += len(items)
+        return items
+
+    def close(self):
+        self._buffer += self._utf8.decode(b'', final=True)
+        if not self._finished or self._buffer.strip():
+            raise ValueError("Truncated or trailing data after JSON array")
@@ -10,11 +10,12 @@ Data Freshness: Real-time
 Auth: API key required for trading, public endpoints for market data
 """
 
-import requests
-import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable, Iterator, Sequence
 from .base import BaseMarketClient, MarketData, ContractData, MarketStatus
+from .ratelimit import TokenBucket
 
 
 class KalshiClient(BaseMarketClient):
@@ -33,6 +34,30 @@ class KalshiClient(BaseMarketClient):
         "CONGRESS",
     ]
 
+    # Keywords that mark an event as political
+    POLITICAL_KEYWORDS = [
+        'president', 'trump', 'vance', 'harris', 'newsom', 'desantis',
+        'election', 'congress', 'senate', 'house', 'tariff', 'scotus',
+        'impeach', 'border', 'deport', 'cabinet', 'fed chair', 'secretary',
+        'speaker', 'governor', 'nominee', 'primary'
+    ]
+
+    # Event fields category tagging reads (kept with slim_raw_data)
+    RAW_DATA_FIELDS = ('category',)
+
+    # Documented public rate limit, shared by every client in the process
+    RATE_LIMIT_PER_SECOND = 10
+    _rate_limiter = TokenBucket(RATE_LIMIT_PER_SECOND)
+
+    # Max in-flight per-event market requests; the rate limiter sets the pace
+    EVENT_CONCURRENCY = RATE_LIMIT_PER_SECOND
+
+    # Largest page the markets endpoint accepts
+    MARKETS_PAGE_SIZE = 1000
+
+    # Event tickers the markets endpoint accepts in one comma-separated filter
+    MARKETS_EVENT_BATCH = 10
+
     @property
     def source_name(self) -> str:
         return "Kalshi"
@@ -41,36 +66,26 @@ class KalshiClient(BaseMarketClient):
     def base_url(self) -> str:
         return self.API_BASE
 
-    def __init__(self, api_key: Optional[str] = None, use_demo: bool = False):
-        super().__init__(api_key)
+    def __init__(self, api_key: Optional[str] = None, use_demo: bool = False,
+                 slim_raw_data: bool = False):
+        super().__init__(api_key, slim_raw_data=slim_raw_data)
         self._base = self.DEMO_API_BASE if use_demo else self.API_BASE
-        self._session = requests.Session()
-        self._session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (compatible; PredictionMarketAggregator/1.0)',
-            'Accept': 'application/json',
-            'Content-Type': 'application/json',
-        })
+        self._headers['Content-Type'] = 'application/json'
         if api_key:
-            self._session.headers['Authorization'] = f'Bearer {api_key}'
+            self._headers['Authorization'] = f'Bearer {api_key}'
 
     def _make_request(self, endpoint: str, params: Optional[Dict] = None) -> Optional[Dict[str, Any]]:
-        """Make a GET request to the API with rate limiting."""
-        try:
-            url = f"{self._base}/{endpoint}"
-            response = self._session.get(url, params=params, timeout=30)
-
-            # Handle rate limiting
-            if response.status_code == 429:
-                retry_after = int(response.headers.get('Retry-After', 1))
-                time.sleep(retry_after)
-                response = self._session.get(url, params=params, timeout=30)
-
-            response.raise_for_status()
-            time.sleep(0.15)  # 6-7 requests/second to stay under limit
-            return response.json()
-        except requests.RequestException as e:
-            print(f"[Kalshi] Request error for {endpoint}: {e}")
-            return None
+        """Make a GET request to the API.
+
+        Requests draw from the shared rate limiter; a 429 pauses it for
+        Retry-After seconds, so every in-flight request backs off.
+        """
+        return self._get_json(f"{self._base}/{endpoint}", params)
+
+    async def _make_request_async(self, endpoint: str,
+                                  params: Optional[Dict] = None) -> Optional[Dict[str, Any]]:
+        """Async counterpart of _make_request."""
+        return await self._get_json_async(f"{self._base}/{endpoint}", params)
 
     def _parse_market(self, event: Dict[str, Any], markets: List[Dict]) -> MarketData:
         """Parse an event and its markets from API response."""
@@ -123,7 +138,8 @@ class KalshiClient(BaseMarketClient):
             description=event.get('subtitle', ''),
             total_volume=total_volume,
             last_updated=datetime.now(),
-            raw_data=event
+            raw_data=self._raw_data(event),
+            mutually_exclusive=bool(event.get('mutually_exclusive')),
         )
 
     def get_events(self, series_ticker: Optional[str] = None,
@@ -164,6 +180,41 @@ class KalshiClient(BaseMarketClient):
 
         return all_events[:max_events]
 
+    async def get_events_async(self, series_ticker: Optional[str] = None,
+                               status: str = "open", limit: int = 100,
+                               cursor: Optional[str] = None) -> tuple[List[Dict], Optional[str]]:
+        """Async counterpart of get_events."""
+        params = {
+            'status': status,
+            'limit': limit,
+        }
+        if series_ticker:
+            params['series_ticker'] = series_ticker
+        if cursor:
+            params['cursor'] = cursor
+
+        data = await self._make_request_async("events", params)
+        if not data:
+            return [], None
+        return data.get('events', []), data.get('cursor')
+
+    async def get_all_events_paginated_async(self, status: str = "open",
+                                             max_events: int = 1000) -> List[Dict]:
+        """Async counterpart of get_all_events_paginated."""
+        all_events = []
+        cursor = None
+
+        while len(all_events) < max_events:
+            events, next_cursor = await self.get_events_async(status=status, limit=100, cursor=cursor)
+            if not events:
+                break
+            all_events.extend(events)
+            if not next_cursor:
+                break
+            cursor = next_cursor
+
+        return all_events[:max_events]
+
     def get_markets_for_event(self, event_ticker: str) -> List[Dict]:
         """Fetch markets for a specific event."""
         params = {'event_ticker': event_ticker}
@@ -172,32 +223,132 @@ class KalshiClient(BaseMarketClient):
             return []
         return data.get('markets', [])
 
-    def get_all_markets(self, status: str = "open", limit: int = 200) -> List[Dict]:
-        """Fetch all markets."""
-        params = {
-            'status': status,
-            'limit': limit,
-        }
-        data = self._make_request("markets", params)
+    async def get_markets_for_event_async(self, event_ticker: str) -> List[Dict]:
+        """Async counterpart of get_markets_for_event."""
+        params = {'event_ticker': event_ticker}
+        data = await self._make_request_async("markets", params)
         if not data:
             return []
         return data.get('markets', [])
 
-    def get_political_markets(self, max_events: int = 500) -> List[MarketData]:
-        """Fetch all political/election markets with pagination."""
-        results = []
+    def _market_params(self, status: str, limit: int,
+                       event_tickers: Optional[Sequence[str]]) -> Dict[str, Any]:
+        params: Dict[str, Any] = {
+            'status': status,
+            'limit': limit,
+        }
+        if event_tickers:
+            params['event_ticker'] = ','.join(event_tickers)
+        return params
+
+    def _event_batches(self, event_tickers: Sequence[str]) -> List[List[str]]:
+        tickers = list(dict.fromkeys(event_tickers))
+        return [tickers[i:i + self.MARKETS_EVENT_BATCH]
+                for i in range(0, len(tickers), self.MARKETS_EVENT_BATCH)]
+
+    def iter_markets(self, status: str = "open",
+                     limit: int = MARKETS_PAGE_SIZE,
+                     event_tickers: Optional[Sequence[str]] = None) -> Iterator[Dict]:
+        """
+        Stream every market with the given status, following the cursor;
+        with event_tickers (at most MARKETS_EVENT_BATCH), only those
+        events' markets.
 
-        # Fetch events first with pagination, then get their markets
-        events = self.get_all_events_paginated(max_events=max_events)
+        Raises RuntimeError if a page fails, so a truncated listing is never
+        mistaken for the complete one.
+        """
+        cursor = None
+        pages = 0
+        while True:
+            params = self._market_params(status, limit, event_tickers)
+            if cursor:
+                params['cursor'] = cursor
+
+            data = self._make_request("markets", params)
+            if not data:
+                raise self._listing_error(pages)
+            pages += 1
+            yield from data.get('markets', [])
+
+            cursor = data.get('cursor')
+            if not cursor or not data.get('markets'):
+                return
+
+    def get_all_markets(self, status: str = "open", limit: int = MARKETS_PAGE_SIZE) -> List[Dict]:
+        """Fetch all markets, paginating through every page."""
+        return list(self.iter_markets(status=status, limit=limit))
+
+    def get_markets_by_event(self, status: str = "open",
+                             event_tickers: Optional[Sequence[str]] = None) -> Dict[str, List[Dict]]:
+        """
+        Bulk-list markets and group them by event_ticker. With
+        event_tickers, only those events are listed, MARKETS_EVENT_BATCH
+        per listing, instead of every market with the status.
+        """
+        if event_tickers is None:
+            return self._group_by_event(self.iter_markets(status=status))
 
-        # Filter for political events
-        political_keywords = [
-            'president', 'trump', 'vance', 'harris', 'newsom', 'desantis',
-            'election', 'congress', 'senate', 'house', 'tariff', 'scotus',
-            'impeach', 'border', 'deport', 'cabinet', 'fed chair', 'secretary',
-            'speaker', 'governor', 'nominee', 'primary'
-        ]
+        with ThreadPoolExecutor(max_workers=self.EVENT_CONCURRENCY) as executor:
+            listings = executor.map(
+                lambda batch: list(self.iter_markets(status=status, event_tickers=batch)),
+                self._event_batches(event_tickers),
+            )
+            return self._group_by_event(market for listing in listings for market in listing)
+
+    async def _list_markets_async(self, status: str,
+                                  event_tickers: Optional[Sequence[str]] = None) -> List[Dict]:
+        """Async counterpart of get_all_markets, optionally scoped like iter_markets."""
+        markets = []
+        cursor = None
+        pages = 0
+        while True:
+            params = self._market_params(status, self.MARKETS_PAGE_SIZE, event_tickers)
+            if cursor:
+                params['cursor'] = cursor
+
+            data = await self._make_request_async("markets", params)
+            if not data:
+                raise self._listing_error(pages)
+            pages += 1
+            markets.extend(data.get('markets', []))
+
+            cursor = data.get('cursor')
+            if not cursor or not data.get('markets'):
+                return markets
+
+    async def get_markets_by_event_async(self, status: str = "open",
+                                         event_tickers: Optional[Sequence[str]] = None
+                                         ) -> Dict[str, List[Dict]]:
+        """Async counterpart of get_markets_by_event."""
+        if event_tickers is None:
+            return self._group_by_event(await self._list_markets_async(status))
+
+        semaphore = asyncio.Semaphore(self.EVENT_CONCURRENCY)
+
+        async def fetch(batch: List[str]) -> List[Dict]:
+            async with semaphore:
+                return await self._list_markets_async(status, batch)
+
+        listings = await asyncio.gather(*(fetch(b) for b in self._event_batches(event_tickers)))
+        return self._group_by_event(market for listing in listings for market in listing)
+
+    def _listing_error(self, pages: int) -> RuntimeError:
+        return RuntimeError(
+            f"[{self.source_name}] Market listing failed after {pages} page(s); "
+            "not returning a partial listing"
+        )
 
+    @staticmethod
+    def _group_by_event(markets: Iterable[Dict]) -> Dict[str, List[Dict]]:
+        by_event: Dict[str, List[Dict]] = {}
+        for market in markets:
+            event_ticker = market.get('event_ticker')
+            if event_ticker:
+                by_event.setdefault(event_ticker, []).append(market)
+        return by_event
+
+    def _filter_political_events(self, events: List[Dict]) -> List[Dict]:
+        """Keep events in a political category or mentioning a political keyword."""
         political_events = []
         for event in events:
             category = event.get('category', '').lower()
@@ -206,27 +357,93 @@ class KalshiClient(BaseMarketClient):
 
             is_political = (
                 category in ['politics', 'elections'] or
-                any(kw in title or kw in ticker for kw in political_keywords)
+                any(kw in title or kw in ticker for kw in self.POLITICAL_KEYWORDS)
             )
 
             if is_political:
                 political_events.append(event)
 
-        # Get markets for each political event
-        for event in political_events:
-            event_ticker = event.get('event_ticker', '')
-            if not event_ticker:
-                continue
+        return political_events
 
-            markets = self.get_markets_for_event(event_ticker)
-            if not markets:
-                continue
+    def get_political_markets(self, max_events: int = 500,
+                              bulk: bool = True) -> List[MarketData]:
+        """Fetch all political/election markets with pagination.
 
-            market_data = self._parse_market(event, markets)
-            results.append(market_data)
+        With bulk=True, the political events' markets are listed
+        MARKETS_EVENT_BATCH events per request (about P/10 requests for P
+        political events, instead of paging through every open market);
+        otherwise each political event's markets are requested individually.
+        A failed listing page raises RuntimeError instead of returning a
+        partial list.
+        """
+        results = []
+
+        # Fetch events first with pagination, then get their markets
+        events = self.get_all_events_paginated(max_events=max_events)
+        political_events = self._filter_political_events(events)
+
+        political_events = [e for e in political_events if e.get('event_ticker')]
+
+        if bulk:
+            markets_by_event = self.get_markets_by_event(
+                event_tickers=[e['event_ticker'] for e in political_events]
+            )
+            for event in political_events:
+                markets = markets_by_event.get(event['event_ticker'])
+                if markets:
+                    results.append(self._parse_market(event, markets))
+            return results
+
+        # Get markets for each political event concurrently; the shared
+        # limiter keeps the combined request rate within budget
+        with ThreadPoolExecutor(max_workers=self.EVENT_CONCURRENCY) as executor:
+            event_markets = executor.map(
+                lambda e: self.get_markets_for_event(e['event_ticker']),
+                political_events,
+            )
+            for event, markets in zip(political_events, event_markets):
+                if not markets:
+                    continue
+
+                market_data = self._parse_market(event, markets)
+                results.append(market_data)
 
         return results
 
+    async def get_political_markets_async(self, max_events: int = 500,
+                                          bulk: bool = True) -> List[MarketData]:
+        """Async counterpart of get_political_markets.
+
+        Batched (bulk) or per-event market requests fan out up to
+        EVENT_CONCURRENCY.
+        """
+        events = await self.get_all_events_paginated_async(max_events=max_events)
+        political_events = [
+            e for e in self._filter_political_events(events) if e.get('event_ticker')
+        ]
+
+        if bulk:
+            markets_by_event = await self.get_markets_by_event_async(
+                event_tickers=[e['event_ticker'] for e in political_events]
+            )
+            return [
+                self._parse_market(event, markets_by_event[event['event_ticker']])
+                for event in political_events
+                if markets_by_event.get(event['event_ticker'])
+            ]
+
+        semaphore = asyncio.Semaphore(self.EVENT_CONCURRENCY)
+
+        async def fetch(event: Dict) -> Optional[MarketData]:
+            async with semaphore:
+                markets = await self.get_markets_for_event_async(event['event_ticker'])
+            if not markets:
+                return None
+            return self._parse_market(event, markets)
+
+        results = await asyncio.gather(*(fetch(e) for e in political_events))
+        return [m for m in results if m is not None]
+
     def get_market_prices(self, market_id: str) -> Optional[MarketData]:
         """Fetch current prices for a specific market/event."""
         # Try to get as event first
@@ -10,10 +10,12 @@ Data Freshness: Real-time (CLOB prices)
 Auth: Not required for read-only market data
 """
 
-import requests
+import asyncio
 import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple, Callable, Awaitable
 from .base import BaseMarketClient, MarketData, ContractData, MarketStatus
 
 
@@ -36,6 +38,16 @@ class PolymarketClient(BaseMarketClient):
         'primary', 'nominee', 'nomination',
     ]
 
+    # Gamma tag covering politics and elections, for server-side filtering
+    POLITICAL_TAG_SLUG = "politics"
+
+    # Event fields category tagging reads (kept with slim_raw_data)
+    RAW_DATA_FIELDS = ('tags',)
+
+    # Events per page, and pages requested at once
+    PAGE_SIZE = 100
+    PAGE_CONCURRENCY = 5
+
     @property
     def source_name(self) -> str:
         return "Polymarket"
@@ -44,25 +56,15 @@ class PolymarketClient(BaseMarketClient):
     def base_url(self) -> str:
         return self.GAMMA_API
 
-    def __init__(self):
-        super().__init__()
-        self._session = requests.Session()
-        self._session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (compatible; PredictionMarketAggregator/1.0)',
-            'Accept': 'application/json',
-        })
-
     def _make_request(self, base: str, endpoint: str,
                       params: Optional[Dict] = None) -> Optional[Any]:
         """Make a GET request to the API."""
-        try:
-            url = f"{base}/{endpoint}"
-            response = self._session.get(url, params=params, timeout=30)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            print(f"[Polymarket] Request error for {endpoint}: {e}")
-            return None
+        return self._get_json(f"{base}/{endpoint}", params)
+
+    async def _make_request_async(self, base: str, endpoint: str,
+                                  params: Optional[Dict] = None) -> Optional[Any]:
+        """Async counterpart of _make_request."""
+        return await self._get_json_async(f"{base}/{endpoint}", params)
 
     def _is_political(self, event: Dict[str, Any]) -> bool:
         """Check if an event is political based on keywords."""
@@ -104,9 +106,22 @@ class PolymarketClient(BaseMarketClient):
         except json.JSONDecodeError:
             return ['Yes', 'No']
 
+    @staticmethod
+    def _quote(market: Dict[str, Any], field: str) -> Optional[float]:
+        """A top-of-book YES price from Gamma (bestBid/bestAsk), if quoted."""
+        try:
+            value = float(market.get(field) or 0)
+        except (TypeError, ValueError):
+            return None
+        return value if 0 < value < 1 else None
+
     def _parse_contract(self, market: Dict[str, Any]) -> ContractData:
         """Parse a single market into a contract."""
         yes_price, no_price = self._parse_market_prices(market)
+        # outcomePrices are mids; executable prices come from the YES book,
+        # and a side without a quote has no ask (so no arbitrage leg)
+        best_bid = self._quote(market, 'bestBid')
+        best_ask = self._quote(market, 'bestAsk')
 
         volume = None
         if market.get('volumeNum'):
@@ -122,10 +137,10 @@ class PolymarketClient(BaseMarketClient):
             contract_name=market.get('question', market.get('title', '')),
             yes_price=yes_price,
             no_price=no_price,
-            yes_bid=yes_price,  # CLOB would have better bid/ask
-            yes_ask=yes_price,
-            no_bid=no_price,
-            no_ask=no_price,
+            yes_bid=best_bid,
+            yes_ask=best_ask,
+            no_bid=1.0 - best_ask if best_ask is not None else None,
+            no_ask=1.0 - best_bid if best_bid is not None else None,
             volume=volume,
             volume_24h=market.get('volume24hr'),
             last_trade_price=market.get('lastTradePrice'),
@@ -184,46 +199,181 @@ class PolymarketClient(BaseMarketClient):
             end_date=end_date,
             total_volume=total_volume,
             last_updated=datetime.now(),
-            raw_data=event
+            raw_data=self._raw_data(event),
+            # negRisk events settle exactly one of their markets YES
+            mutually_exclusive=bool(event.get('negRisk') or event.get('enableNegRisk')),
         )
 
-    def get_events(self, active: bool = True, closed: bool = False,
-                   limit: int = 100, offset: int = 0) -> List[Dict]:
-        """Fetch events from gamma API."""
+    def _event_params(self, active: bool, closed: bool, limit: int, offset: int,
+                      tag_slug: Optional[str]) -> Dict[str, Any]:
         params = {
             'active': str(active).lower(),
             'closed': str(closed).lower(),
             'limit': limit,
             'offset': offset,
         }
+        if tag_slug:
+            params['tag_slug'] = tag_slug
+        return params
+
+    def _fetch_pages(self, max_events: int,
+                     fetch_page: Callable[[int], Tuple[List, int]]) -> List:
+        """Fetch event pages by offset, PAGE_CONCURRENCY at a time.
+
+        fetch_page(offset) returns (items, raw_event_count). Items are joined in
+        offset order; no further pages are requested once a short page arrives.
+        """
+        limit = self.PAGE_SIZE
+        offsets = list(range(0, max_events, limit))
+        items = []
+
+        with ThreadPoolExecutor(max_workers=self.PAGE_CONCURRENCY) as executor:
+            for i in range(0, len(offsets), self.PAGE_CONCURRENCY):
+                pages = executor.map(fetch_page, offsets[i:i + self.PAGE_CONCURRENCY])
+                for page_items, raw_count in pages:
+                    items.extend(page_items)
+                    if raw_count < limit:
+                        return items
+
+        return items
+
+    async def _fetch_pages_async(self, max_events: int,
+                                 fetch_page: Callable[[int], Awaitable[Tuple[List, int]]]) -> List:
+        """Async counterpart of _fetch_pages."""
+        limit = self.PAGE_SIZE
+        offsets = list(range(0, max_events, limit))
+        items = []
+
+        for i in range(0, len(offsets), self.PAGE_CONCURRENCY):
+            pages = await asyncio.gather(*(
+                fetch_page(offset) for offset in offsets[i:i + self.PAGE_CONCURRENCY]
+            ))
+            for page_items, raw_count in pages:
+                items.extend(page_items)
+                if raw_count < limit:
+                    return items
+
+        return items
+
+    def _parse_political_event(self, event: Dict[str, Any]) -> Optional[Tuple[MarketData, Dict[str, str]]]:
+        """Parse a streamed event into (market, token ids), or None if not political."""
+        if not self._is_political(event):
+            return None
+        return self._parse_event(event), self._event_token_ids(event)
+
+    @staticmethod
+    def _fresh_political_event(item: Optional[Tuple[MarketData, Dict[str, str]]]
+                               ) -> Optional[Tuple[MarketData, Dict[str, str]]]:
+        """
+        A caller's own copy of a cached (market, token ids) entry, stamped
+        now: the cached page is unchanged, and these prices are current.
+        """
+        if item is None:
+            return None
+        market, token_ids = item
+        return replace(
+            market,
+            contracts=[replace(contract) for contract in market.contracts],
+            last_updated=datetime.now(),
+        ), dict(token_ids)
+
+    def _political_page(self, items: Optional[List]) -> Tuple[List[Tuple[MarketData, Dict[str, str]]], int]:
+        """Split a mapped page into its political entries and its event count."""
+        items = items or []
+        return [item for item in items if item is not None], len(items)
+
+    def get_events(self, active: bool = True, closed: bool = False,
+                   limit: int = 100, offset: int = 0,
+                   tag_slug: Optional[str] = None) -> List[Dict]:
+        """Fetch events from gamma API, optionally restricted to one tag."""
+        params = self._event_params(active, closed, limit, offset, tag_slug)
 
-        data = self._make_request(self.GAMMA_API, "events", params)
+        data = self._get_json_cached(f"{self.GAMMA_API}/events", params)
         return data if data else []
 
-    def get_all_events(self, max_events: int = 500) -> List[Dict]:
-        """Fetch all events with pagination."""
-        all_events = []
-        offset = 0
-        limit = 100
+    def get_all_events(self, max_events: int = 500,
+                       tag_slug: Optional[str] = None) -> List[Dict]:
+        """Fetch all events with pagination.
 
-        while len(all_events) < max_events:
-            events = self.get_events(limit=limit, offset=offset)
-            if not events:
-                break
-            all_events.extend(events)
-            offset += limit
-            if len(events) < limit:
-                break
+        Page offsets are known up front, so pages are requested PAGE_CONCURRENCY
+        at a time; no further pages are requested once a short page arrives.
+        """
+        def fetch_page(offset: int) -> Tuple[List[Dict], int]:
+            events = self.get_events(limit=self.PAGE_SIZE, offset=offset, tag_slug=tag_slug)
+            return events, len(events)
+
+        return self._fetch_pages(max_events, fetch_page)[:max_events]
+
+    async def get_events_async(self, active: bool = True, closed: bool = False,
+                               limit: int = 100, offset: int = 0,
+                               tag_slug: Optional[str] = None) -> List[Dict]:
+        """Async counterpart of get_events."""
+        params = self._event_params(active, closed, limit, offset, tag_slug)
+
+        data = await self._get_json_cached_async(f"{self.GAMMA_API}/events", params)
+        return data if data else []
+
+    async def get_all_events_async(self, max_events: int = 500,
+                                   tag_slug: Optional[str] = None) -> List[Dict]:
+        """Async counterpart of get_all_events."""
+        async def fetch_page(offset: int) -> Tuple[List[Dict], int]:
+            events = await self.get_events_async(limit=self.PAGE_SIZE, offset=offset, tag_slug=tag_slug)
+            return events, len(events)
+
+        return (await self._fetch_pages_async(max_events, fetch_page))[:max_events]
+
+    def _get_political_events(self, tag_slug: Optional[str],
+                              max_events: int) -> List[Tuple[MarketData, Dict[str, str]]]:
+        """
+        (market, token ids) for every political event.
+
+        Event pages are decoded while they stream in and each event is parsed
+        and dropped as soon as it is complete. Pages are conditional
+        requests; an unchanged page yields copies of the results parsed from
+        it last time, re-stamped with the current time, without re-parsing.
+        """
+        name = self._derived_name('political')
 
-        return all_events[:max_events]
+        def fetch_page(offset: int):
+            params = self._event_params(True, False, self.PAGE_SIZE, offset, tag_slug)
+            return self._political_page(self._get_json_items_cached(
+                f"{self.GAMMA_API}/events", params, self._parse_political_event, name,
+                copy_item=self._fresh_political_event,
+            ))
 
-    def get_political_markets(self) -> List[MarketData]:
-        """Fetch all political/election markets."""
-        all_events = self.get_all_events(max_events=500)
+        return self._fetch_pages(max_events, fetch_page)
 
-        political_events = [e for e in all_events if self._is_political(e)]
+    async def _get_political_events_async(self, tag_slug: Optional[str],
+                                          max_events: int) -> List[Tuple[MarketData, Dict[str, str]]]:
+        """Async counterpart of _get_political_events."""
+        name = self._derived_name('political')
 
-        return [self._parse_event(e) for e in political_events]
+        async def fetch_page(offset: int):
+            params = self._event_params(True, False, self.PAGE_SIZE, offset, tag_slug)
+            return self._political_page(await self._get_json_items_cached_async(
+                f"{self.GAMMA_API}/events", params, self._parse_political_event, name,
+                copy_item=self._fresh_political_event,
+            ))
+
+        return await self._fetch_pages_async(max_events, fetch_page)
+
+    def get_political_markets(self, tag_slug: Optional[str] = None,
+                              max_events: int = 500) -> List[MarketData]:
+        """Fetch all political/election markets.
+
+        Args:
+            tag_slug: Only request events carrying this Polymarket tag (e.g.
+                POLITICAL_TAG_SLUG), so unrelated events never cross the wire.
+                The keyword filter still applies on top.
+            max_events: Max events to scan
+        """
+        return [market for market, _ in self._get_political_events(tag_slug, max_events)]
+
+    async def get_political_markets_async(self, tag_slug: Optional[str] = None,
+                                          max_events: int = 500) -> List[MarketData]:
+        """Async counterpart of get_political_markets."""
+        events = await self._get_political_events_async(tag_slug, max_events)
+        return [market for market, _ in events]
 
     def get_market_prices(self, market_id: str) -> Optional[MarketData]:
         """Fetch current prices for a specific market/event."""
@@ -283,51 +433,53 @@ class PolymarketClient(BaseMarketClient):
             return data['history']
         return data if isinstance(data, list) else None
 
+    def _event_token_ids(self, event: Dict[str, Any]) -> Dict[str, str]:
+        """Map "<question> - <outcome>" to CLOB token id for an event's markets."""
+        tokens = {}
+
+        for m in event.get('markets', []):
+            # Token IDs are in clobTokenIds field (may be JSON string)
+            clob_ids = m.get('clobTokenIds', [])
+            if isinstance(clob_ids, str):
+                try:
+                    clob_ids = json.loads(clob_ids)
+                except json.JSONDecodeError:
+                    clob_ids = []
+
+            # Outcomes may also be JSON string
+            outcomes = m.get('outcomes', '["Yes", "No"]')
+            if isinstance(outcomes, str):
+                try:
+                    outcomes = json.loads(outcomes)
+                except json.JSONDecodeError:
+                    outcomes = ['Yes', 'No']
+
+            question = m.get('question', m.get('title', ''))
+
+            # Map each outcome to its token ID
+            for i, token_id in enumerate(clob_ids):
+                if i < len(outcomes):
+                    outcome_name = outcomes[i]
+                    key = f"{question} - {outcome_name}" if question else outcome_name
+                    tokens[key] = token_id
+
+        return tokens
+
     def get_all_token_ids(self) -> Dict[str, Dict[str, str]]:
         """
         Get all token IDs for political markets.
 
+        Token ids are extracted while events are parsed, so this works with
+        slim_raw_data as well.
+
         Returns:
             Dict mapping market_id -> {contract_name: token_id}
         """
-        markets = self.get_political_markets()
-        token_map = {}
-
-        for market in markets:
-            market_tokens = {}
-            raw_data = market.raw_data or {}
-            nested_markets = raw_data.get('markets', [])
-
-            for m in nested_markets:
-                # Token IDs are in clobTokenIds field (may be JSON string)
-                clob_ids = m.get('clobTokenIds', [])
-                if isinstance(clob_ids, str):
-                    try:
-                        clob_ids = json.loads(clob_ids)
-                    except json.JSONDecodeError:
-                        clob_ids = []
-
-                # Outcomes may also be JSON string
-                outcomes = m.get('outcomes', '["Yes", "No"]')
-                if isinstance(outcomes, str):
-                    try:
-                        outcomes = json.loads(outcomes)
-                    except json.JSONDecodeError:
-                        outcomes = ['Yes', 'No']
-
-                question = m.get('question', m.get('title', ''))
-
-                # Map each outcome to its token ID
-                for i, token_id in enumerate(clob_ids):
-                    if i < len(outcomes):
-                        outcome_name = outcomes[i]
-                        key = f"{question} - {outcome_name}" if question else outcome_name
-                        market_tokens[key] = token_id
-
-            if market_tokens:
-                token_map[market.market_id] = market_tokens
-
-        return token_map
+        return {
+            market.market_id: tokens
+            for market, tokens in self._get_political_events(None, 500)
+            if tokens
+        }
 
 
 # Quick test
@@ -9,17 +9,132 @@ Rate Limits: Unknown, be conservative (1 req/sec)
 Data Freshness: Real-time prices
 """
 
-import requests
+import re
+import threading
+import time
+from bisect import bisect_left
+from dataclasses import replace
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable, Set, Tuple
 from .base import BaseMarketClient, MarketData, ContractData, MarketStatus
 
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+def _tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+class PredictItSnapshot:
+    """
+    One parsed `/all` response with lookup indexes.
+
+    Markets and contracts are indexed by id, and market names by word, so
+    lookups against the snapshot are dictionary hits (or, for keyword
+    search, a scan of the word vocabulary) instead of scans of every market.
+    """
+
+    def __init__(self, markets: List[MarketData]):
+        self.markets = markets
+        self.fetched_at = time.monotonic()
+
+        self._markets_by_id: Dict[str, MarketData] = {}
+        self._contracts_by_id: Dict[str, Tuple[MarketData, ContractData]] = {}
+        self._names: Dict[str, str] = {}
+        self._positions: Dict[str, int] = {}
+        self._token_index: Dict[str, Set[str]] = {}
+
+        for position, market in enumerate(markets):
+            market_id = market.market_id
+            self._markets_by_id[market_id] = market
+            self._positions[market_id] = position
+            self._names[market_id] = market.market_name.lower()
+            for contract in market.contracts:
+                self._contracts_by_id[contract.contract_id] = (market, contract)
+            for token in _tokenize(market.market_name):
+                self._token_index.setdefault(token, set()).add(market_id)
+
+        # Sorted vocabulary for prefix lookups
+        self._vocabulary = sorted(self._token_index)
+
+    def age(self) -> float:
+        """Seconds since this snapshot was taken."""
+        return time.monotonic() - self.fetched_at
+
+    def market(self, market_id: str) -> Optional[MarketData]:
+        return self._markets_by_id.get(str(market_id))
+
+    def contract(self, contract_id: str) -> Optional[Tuple[MarketData, ContractData]]:
+        """Return (market, contract) for a contract id."""
+        return self._contracts_by_id.get(str(contract_id))
+
+    def _prefix_matches(self, prefix: str) -> Set[str]:
+        """Ids of markets with a name word starting with prefix."""
+        matches: Set[str] = set()
+        i = bisect_left(self._vocabulary, prefix)
+        while i < len(self._vocabulary) and self._vocabulary[i].startswith(prefix):
+            matches |= self._token_index[self._vocabulary[i]]
+            i += 1
+        return matches
+
+    def _substring_matches(self, fragment: str) -> Set[str]:
+        """Ids of markets with a name word containing fragment (a scan of the vocabulary)."""
+        matches: Set[str] = set()
+        for word in self._vocabulary:
+            if fragment in word:
+                matches |= self._token_index[word]
+        return matches
+
+    def search(self, keyword: str) -> List[MarketData]:
+        """
+        Markets whose name contains keyword (case-insensitive).
+
+        Candidates come from the word index. The keyword may start mid-word
+        ("rump" finds Trump), so its first word only has to occur inside a
+        word of the market name (a scan of the vocabulary, not of every
+        name); each later word must start one (a prefix lookup). Candidates
+        are then checked against the full keyword, so multi-word keywords
+        match as phrases.
+        """
+        keyword_lower = keyword.lower()
+        tokens = _tokenize(keyword_lower)
+        if not tokens:
+            candidates: Iterable[str] = self._markets_by_id
+        else:
+            candidates = None
+            for token in tokens[1:]:
+                matches = self._prefix_matches(token)
+                candidates = matches if candidates is None else candidates & matches
+                if not candidates:
+                    break
+            if candidates is None or candidates:
+                matches = self._substring_matches(tokens[0])
+                candidates = matches if candidates is None else candidates & matches
+
+        matches = [
+            market_id for market_id in candidates
+            if keyword_lower in self._names[market_id]
+        ]
+        matches.sort(key=self._positions.__getitem__)
+        return [self._markets_by_id[market_id] for market_id in matches]
+
 
 class PredictItClient(BaseMarketClient):
     """Client for PredictIt prediction market API."""
 
     API_BASE = "https://www.predictit.org/api/marketdata"
 
+    # Seconds a fetched `/all` snapshot is served before refreshing
+    SNAPSHOT_TTL = 30.0
+
+    def __init__(self, api_key: Optional[str] = None,
+                 snapshot_ttl: Optional[float] = None,
+                 slim_raw_data: bool = False):
+        super().__init__(api_key, slim_raw_data=slim_raw_data)
+        self.snapshot_ttl = self.SNAPSHOT_TTL if snapshot_ttl is None else snapshot_ttl
+        self._snapshot: Optional[PredictItSnapshot] = None
+        self._snapshot_lock = threading.Lock()
+
     @property
     def source_name(self) -> str:
         return "PredictIt"
@@ -28,24 +143,9 @@ class PredictItClient(BaseMarketClient):
     def base_url(self) -> str:
         return self.API_BASE
 
-    def __init__(self):
-        super().__init__()
-        self._session = requests.Session()
-        self._session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (compatible; PredictionMarketAggregator/1.0)',
-            'Accept': 'application/json',
-        })
-
     def _make_request(self, endpoint: str) -> Optional[Dict[str, Any]]:
         """Make a GET request to the API."""
-        try:
-            url = f"{self.API_BASE}/{endpoint}"
-            response = self._session.get(url, timeout=30)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            print(f"[PredictIt] Request error: {e}")
-            return None
+        return self._get_json(f"{self.API_BASE}/{endpoint}")
 
     def _parse_contract(self, contract: Dict[str, Any]) -> ContractData:
         """Parse a contract from API response."""
@@ -107,16 +207,85 @@ class PredictItClient(BaseMarketClient):
             url=market.get('url'),
             description=market.get('shortName'),
             last_updated=last_updated,
-            raw_data=market
+            raw_data=self._raw_data(market),
+            # Multi-contract markets are linked: exactly one contract wins
+            mutually_exclusive=len(contracts) > 1,
+        )
+
+    def _parse_all(self, data: Optional[Dict[str, Any]]) -> PredictItSnapshot:
+        """Parse the full `/all` payload into an indexed snapshot."""
+        if not data or 'markets' not in data:
+            return PredictItSnapshot([])
+
+        return PredictItSnapshot([self._parse_market(m) for m in data['markets']])
+
+    @staticmethod
+    def _copy_snapshot(snapshot: PredictItSnapshot) -> PredictItSnapshot:
+        """
+        A snapshot of copies of the cached markets and contracts, so what
+        callers do with one fetch's markets never shows up in the next.
+        """
+        return PredictItSnapshot([
+            replace(market, contracts=[replace(contract) for contract in market.contracts])
+            for market in snapshot.markets
+        ])
+
+    def _fresh_snapshot(self) -> Optional[PredictItSnapshot]:
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.age() < self.snapshot_ttl:
+            return snapshot
+        return None
+
+    def get_snapshot(self, refresh: bool = False) -> Optional[PredictItSnapshot]:
+        """
+        Return the current `/all` snapshot, fetching it if older than the TTL.
+
+        The `/all` request is conditional: when the dataset is unchanged the
+        markets parsed from the previous response are reused (as copies, see
+        _copy_snapshot). Returns None if no snapshot could be fetched.
+        """
+        if not refresh and (snapshot := self._fresh_snapshot()):
+            return snapshot
+
+        with self._snapshot_lock:
+            # Another thread may have refreshed while we waited
+            if not refresh and (snapshot := self._fresh_snapshot()):
+                return snapshot
+
+            snapshot = self._get_json_cached(
+                f"{self.API_BASE}/all", parse=self._parse_all, name=self._derived_name('snapshot'),
+                copy=self._copy_snapshot,
+            )
+            if snapshot is None:
+                return self._snapshot
+            snapshot.fetched_at = time.monotonic()
+            self._snapshot = snapshot
+            return snapshot
+
+    async def get_snapshot_async(self, refresh: bool = False) -> Optional[PredictItSnapshot]:
+        """Async counterpart of get_snapshot."""
+        if not refresh and (snapshot := self._fresh_snapshot()):
+            return snapshot
+
+        snapshot = await self._get_json_cached_async(
+            f"{self.API_BASE}/all", parse=self._parse_all, name=self._derived_name('snapshot'),
+            copy=self._copy_snapshot,
         )
+        if snapshot is None:
+            return self._snapshot
+        snapshot.fetched_at = time.monotonic()
+        self._snapshot = snapshot
+        return snapshot
 
     def get_all_markets(self) -> List[MarketData]:
         """Fetch all available markets."""
-        data = self._make_request("all")
-        if not data or 'markets' not in data:
-            return []
+        snapshot = self.get_snapshot()
+        return list(snapshot.markets) if snapshot else []
 
-        return [self._parse_market(m) for m in data['markets']]
+    async def get_all_markets_async(self) -> List[MarketData]:
+        """Async counterpart of get_all_markets."""
+        snapshot = await self.get_snapshot_async()
+        return list(snapshot.markets) if snapshot else []
 
     def get_political_markets(self) -> List[MarketData]:
         """
@@ -126,27 +295,46 @@ class PredictItClient(BaseMarketClient):
         """
         return self.get_all_markets()
 
+    async def get_political_markets_async(self) -> List[MarketData]:
+        """Async counterpart of get_political_markets."""
+        return await self.get_all_markets_async()
+
     def get_market_prices(self, market_id: str) -> Optional[MarketData]:
         """
         Fetch current prices for a specific market.
 
         Note: PredictIt doesn't have a single-market endpoint in public API,
-        so we fetch all and filter.
+        so this is a lookup in the current `/all` snapshot.
         """
-        all_markets = self.get_all_markets()
-        for market in all_markets:
-            if market.market_id == market_id:
-                return market
-        return None
+        snapshot = self.get_snapshot()
+        return snapshot.market(market_id) if snapshot else None
+
+    def get_markets_by_id(self, market_ids: Iterable[str]) -> Dict[str, MarketData]:
+        """
+        Fetch current prices for several markets from one snapshot.
+
+        Refreshing a set of featured markets costs at most one request.
+        Ids missing from the snapshot are left out.
+        """
+        snapshot = self.get_snapshot()
+        if not snapshot:
+            return {}
+        markets = {}
+        for market_id in market_ids:
+            market = snapshot.market(market_id)
+            if market is not None:
+                markets[market.market_id] = market
+        return markets
+
+    def get_contract(self, contract_id: str) -> Optional[Tuple[MarketData, ContractData]]:
+        """Look up a contract and its market by contract id."""
+        snapshot = self.get_snapshot()
+        return snapshot.contract(contract_id) if snapshot else None
 
     def get_markets_by_keyword(self, keyword: str) -> List[MarketData]:
         """Filter markets by keyword in name."""
-        all_markets = self.get_all_markets()
-        keyword_lower = keyword.lower()
-        return [
-            m for m in all_markets
-            if keyword_lower in m.market_name.lower()
-        ]
+        snapshot = self.get_snapshot()
+        return snapshot.search(keyword) if snapshot else []
 
 
 # Quick test
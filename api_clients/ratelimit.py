@@ -0,0 +1,72 @@
+"""
+Token-bucket rate limiting shared by blocking and asyncio callers.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Callers reserve a token and then wait until it is due, so concurrent
+    callers are spaced out at `rate` per second after an initial burst of
+    `capacity`. pause() stops all callers, including ones already waiting,
+    until the pause expires (used to honor Retry-After).
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token and return how long to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            if now > self._updated:
+                self._tokens = min(self.capacity,
+                                   self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+            self._tokens -= 1
+            wait = max(0.0, -self._tokens / self.rate)
+            return wait + max(0.0, self._updated - now)
+
+    def _pause_remaining(self) -> float:
+        with self._lock:
+            return max(0.0, self._paused_until - time.monotonic())
+
+    def pause(self, seconds: float):
+        """Block every caller for `seconds`; refilling resumes afterwards."""
+        with self._lock:
+            until = time.monotonic() + seconds
+            if until > self._paused_until:
+                self._paused_until = until
+                self._tokens = min(self._tokens, 0.0)
+                self._updated = max(self._updated, until)
+
+    def acquire(self):
+        """Block until a token is available."""
+        time.sleep(self._reserve())
+        while (delay := self._pause_remaining()) > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        """Wait on the event loop until a token is available."""
+        await asyncio.sleep(self._reserve())
+        while (delay := self._pause_remaining()) > 0:
+            await asyncio.sleep(delay)
+
+
+def parse_retry_after(value: Optional[str], default: float = 1.0) -> float:
+    """Parse a Retry-After header given in seconds."""
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return default
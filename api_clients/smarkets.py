@@ -10,9 +10,10 @@ Data Freshness: Real-time
 Auth: Not required for market data
 """
 
-import requests
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from .base import BaseMarketClient, MarketData, ContractData, MarketStatus
 
 
@@ -35,6 +36,12 @@ class SmarketsClient(BaseMarketClient):
         "784698",    # Donald Trump
     ]
 
+    # Max in-flight requests when fanning out
+    MARKET_CONCURRENCY = 8
+
+    # Market ids per batched contracts/quotes/volumes request
+    MARKET_BATCH_SIZE = 50
+
     @property
     def source_name(self) -> str:
         return "Smarkets"
@@ -43,24 +50,14 @@ class SmarketsClient(BaseMarketClient):
     def base_url(self) -> str:
         return self.API_BASE
 
-    def __init__(self):
-        super().__init__()
-        self._session = requests.Session()
-        self._session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (compatible; PredictionMarketAggregator/1.0)',
-            'Accept': 'application/json',
-        })
-
     def _make_request(self, endpoint: str, params: Optional[Dict] = None) -> Optional[Dict[str, Any]]:
         """Make a GET request to the API."""
-        try:
-            url = f"{self.API_BASE}/{endpoint}"
-            response = self._session.get(url, params=params, timeout=30)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            print(f"[Smarkets] Request error for {endpoint}: {e}")
-            return None
+        return self._get_json(f"{self.API_BASE}/{endpoint}", params)
+
+    async def _make_request_async(self, endpoint: str,
+                                  params: Optional[Dict] = None) -> Optional[Dict[str, Any]]:
+        """Async counterpart of _make_request."""
+        return await self._get_json_async(f"{self.API_BASE}/{endpoint}", params)
 
     def get_events(self, type_domain: str = "politics",
                    state: str = "upcoming", limit: int = 50) -> List[Dict]:
@@ -71,7 +68,7 @@ class SmarketsClient(BaseMarketClient):
             'limit': limit,
         }
 
-        data = self._make_request("events/", params)
+        data = self._get_json_cached(f"{self.API_BASE}/events/", params)
         if not data:
             return []
         return data.get('events', [])
@@ -121,6 +118,112 @@ class SmarketsClient(BaseMarketClient):
                 break
         return {'market_volume': market_volume}
 
+    async def get_events_async(self, type_domain: str = "politics",
+                               state: str = "upcoming", limit: int = 50) -> List[Dict]:
+        """Async counterpart of get_events."""
+        params = {
+            'type_domain': type_domain,
+            'state': state,
+            'limit': limit,
+        }
+
+        data = await self._get_json_cached_async(f"{self.API_BASE}/events/", params)
+        if not data:
+            return []
+        return data.get('events', [])
+
+    async def get_markets_async(self, event_id: str) -> List[Dict]:
+        """Async counterpart of get_markets."""
+        data = await self._make_request_async(f"events/{event_id}/markets/")
+        if not data:
+            return []
+        return data.get('markets', [])
+
+    def get_market_batch(self, market_ids: List[str]) -> Tuple[Dict[str, List[Dict]], Dict[str, Dict], Dict[str, int]]:
+        """Fetch contracts, quotes and volumes for many markets in three requests.
+
+        If any of the three fails, the ids are split in half and each half is
+        retried, so one bad market (or a transient error) only drops the
+        markets it cannot be separated from; a single market that still
+        fails is left out.
+
+        Returns (contracts_by_market, quotes_by_contract, volume_by_market).
+        """
+        ids = ','.join(market_ids)
+        responses = (
+            self._make_request(f"markets/{ids}/contracts/"),
+            self._make_request(f"markets/{ids}/quotes/"),
+            self._make_request(f"markets/{ids}/volumes/"),
+        )
+        if all(r is not None for r in responses):
+            return self._split_batch(*responses)
+        if len(market_ids) < 2:
+            # Contracts without their quotes would read as zero prices
+            return self._split_batch(None, None, None)
+
+        middle = len(market_ids) // 2
+        return self._merge_batches(
+            self.get_market_batch(market_ids[:middle]),
+            self.get_market_batch(market_ids[middle:]),
+        )
+
+    async def get_market_batch_async(self, market_ids: List[str]) -> Tuple[Dict[str, List[Dict]], Dict[str, Dict], Dict[str, int]]:
+        """Async counterpart of get_market_batch; the three requests (and the halves) run concurrently."""
+        ids = ','.join(market_ids)
+        responses = await asyncio.gather(
+            self._make_request_async(f"markets/{ids}/contracts/"),
+            self._make_request_async(f"markets/{ids}/quotes/"),
+            self._make_request_async(f"markets/{ids}/volumes/"),
+        )
+        if all(r is not None for r in responses):
+            return self._split_batch(*responses)
+        if len(market_ids) < 2:
+            # Contracts without their quotes would read as zero prices
+            return self._split_batch(None, None, None)
+
+        middle = len(market_ids) // 2
+        return self._merge_batches(*await asyncio.gather(
+            self.get_market_batch_async(market_ids[:middle]),
+            self.get_market_batch_async(market_ids[middle:]),
+        ))
+
+    @staticmethod
+    def _merge_batches(first: Tuple[Dict[str, List[Dict]], Dict[str, Dict], Dict[str, int]],
+                       second: Tuple[Dict[str, List[Dict]], Dict[str, Dict], Dict[str, int]]
+                       ) -> Tuple[Dict[str, List[Dict]], Dict[str, Dict], Dict[str, int]]:
+        return tuple({**a, **b} for a, b in zip(first, second))
+
+    def _split_batch(self, contracts_data: Optional[Dict], quotes_data: Optional[Dict],
+                     volumes_data: Optional[Dict]) -> Tuple[Dict[str, List[Dict]], Dict[str, Dict], Dict[str, int]]:
+        """Key batched responses by market (contracts, volumes) and contract (quotes)."""
+        contracts_by_market: Dict[str, List[Dict]] = {}
+        for contract in (contracts_data or {}).get('contracts', []):
+            contracts_by_market.setdefault(str(contract.get('market_id', '')), []).append(contract)
+
+        volume_by_market = {
+            str(v.get('market_id', '')): v.get('volume', 0)
+            for v in (volumes_data or {}).get('volumes', [])
+        }
+
+        return contracts_by_market, quotes_data or {}, volume_by_market
+
+    def _build_batch(self, pairs: List[Tuple[Dict, Dict]],
+                     batch: Tuple[Dict[str, List[Dict]], Dict[str, Dict], Dict[str, int]]) -> List[MarketData]:
+        """Build MarketData for (event, market) pairs from one batched fetch."""
+        contracts_by_market, quotes, volume_by_market = batch
+        results = []
+        for event, market in pairs:
+            market_id = str(market.get('id', ''))
+            contracts = self._build_contracts(contracts_by_market.get(market_id, []), quotes)
+            results.append(self._build_market(
+                event, market, contracts, volume_by_market.get(market_id, 0)
+            ))
+        return results
+
+    def _chunk_pairs(self, pairs: List[Tuple[Dict, Dict]]) -> List[List[Tuple[Dict, Dict]]]:
+        size = self.MARKET_BATCH_SIZE
+        return [pairs[i:i + size] for i in range(0, len(pairs), size)]
+
     def _parse_price(self, price_bp: int) -> float:
         """Convert basis points (0-10000) to probability (0-1)."""
         return price_bp / 10000.0
@@ -135,6 +238,11 @@ class SmarketsClient(BaseMarketClient):
         volumes_data = self.get_volumes(market_id)
         market_volume = volumes_data.get('market_volume', 0)
 
+        return self._build_contracts(contracts_data, quotes_data), market_volume
+
+    def _build_contracts(self, contracts_data: List[Dict],
+                         quotes_data: Dict[str, Dict]) -> List[ContractData]:
+        """Combine contract metadata with quotes into ContractData objects."""
         contracts = []
         for contract in contracts_data:
             contract_id = contract.get('id', '')
@@ -169,12 +277,17 @@ class SmarketsClient(BaseMarketClient):
                 volume=None,  # Smarkets only provides market-level volume
             ))
 
-        return contracts, market_volume
+        return contracts
 
     def _parse_market(self, event: Dict, market: Dict) -> MarketData:
         """Parse market data."""
+        contracts, market_volume = self._parse_contracts(market.get('id', ''))
+        return self._build_market(event, market, contracts, market_volume)
+
+    def _build_market(self, event: Dict, market: Dict,
+                      contracts: List[ContractData], market_volume: int) -> MarketData:
+        """Assemble MarketData from a market, its event and its priced contracts."""
         market_id = market.get('id', '')
-        contracts, market_volume = self._parse_contracts(market_id)
 
         # Use market-level volume from the API (in pence, convert to pounds)
         total_volume = market_volume / 100.0 if market_volume else 0
@@ -200,40 +313,79 @@ class SmarketsClient(BaseMarketClient):
             description=market.get('description'),
             total_volume=total_volume if total_volume > 0 else None,  # GBP
             last_updated=datetime.now(),
-            raw_data={'event': event, 'market': market}
+            raw_data=self._raw_data({'event': event, 'market': market}),
+            mutually_exclusive=market.get('winner_count') == 1,
         )
 
-    def get_political_markets(self) -> List[MarketData]:
-        """Fetch all political/election markets."""
-        results = []
-
-        # Get all politics events
-        all_events = self.get_events(type_domain="politics", limit=100)
-
-        # Filter for US politics
+    def _filter_us_events(self, events: List[Dict]) -> List[Dict]:
+        """Keep US politics events."""
         us_events = []
-        for event in all_events:
+        for event in events:
             slug = event.get('full_slug', '').lower()
             name = event.get('name', '').lower()
             if '/us' in slug or 'america' in name or event.get('id') in self.US_POLITICS_EVENTS:
                 us_events.append(event)
+        return us_events
 
-        # Get markets for each event
-        for event in us_events:
-            event_id = event.get('id')
-            if not event_id:
-                continue
-
-            markets = self.get_markets(event_id)
-            for market in markets:
-                if market.get('state') != 'open':
-                    continue
-
-                market_data = self._parse_market(event, market)
-                if market_data.contracts:  # Only add if has contracts
-                    results.append(market_data)
+    def get_political_markets(self) -> List[MarketData]:
+        """Fetch all political/election markets.
 
-        return results
+        Market listings are fetched per event concurrently; contracts, quotes
+        and volumes are then fetched in batches of MARKET_BATCH_SIZE markets.
+        """
+        # Get all politics events
+        all_events = self.get_events(type_domain="politics", limit=100)
+        us_events = [e for e in self._filter_us_events(all_events) if e.get('id')]
+
+        with ThreadPoolExecutor(max_workers=self.MARKET_CONCURRENCY) as executor:
+            event_markets = list(executor.map(lambda e: self.get_markets(e['id']), us_events))
+
+            pairs = [
+                (event, market)
+                for event, markets in zip(us_events, event_markets)
+                for market in markets
+                if market.get('state') == 'open'
+            ]
+            chunks = self._chunk_pairs(pairs)
+            batches = executor.map(
+                lambda chunk: self.get_market_batch([str(m.get('id', '')) for _, m in chunk]),
+                chunks,
+            )
+
+            results = []
+            for chunk, batch in zip(chunks, batches):
+                results.extend(self._build_batch(chunk, batch))
+
+        # Only add markets that have contracts
+        return [m for m in results if m.contracts]
+
+    async def get_political_markets_async(self) -> List[MarketData]:
+        """Async counterpart of get_political_markets."""
+        all_events = await self.get_events_async(type_domain="politics", limit=100)
+        us_events = [e for e in self._filter_us_events(all_events) if e.get('id')]
+
+        semaphore = asyncio.Semaphore(self.MARKET_CONCURRENCY)
+
+        async def fetch_markets(event: Dict) -> List[Dict]:
+            async with semaphore:
+                return await self.get_markets_async(event['id'])
+
+        event_markets = await asyncio.gather(*(fetch_markets(e) for e in us_events))
+
+        pairs = [
+            (event, market)
+            for event, markets in zip(us_events, event_markets)
+            for market in markets
+            if market.get('state') == 'open'
+        ]
+
+        async def fetch_batch(chunk: List[Tuple[Dict, Dict]]) -> List[MarketData]:
+            async with semaphore:
+                batch = await self.get_market_batch_async([str(m.get('id', '')) for _, m in chunk])
+            return self._build_batch(chunk, batch)
+
+        batches = await asyncio.gather(*(fetch_batch(c) for c in self._chunk_pairs(pairs)))
+        return [m for batch in batches for m in batch if m.contracts]
 
     def get_market_prices(self, market_id: str) -> Optional[MarketData]:
         """Fetch current prices for a specific market."""
@@ -0,0 +1,254 @@
+"""
+Shared HTTP transport for all market clients.
+
+One process-wide transport owns the connection pools (a requests.Session
+for blocking calls, one aiohttp session per running event loop for async
+calls, closed when that loop shuts down),
+so every client instance reuses the same keep-alive connections. It also
+applies a common retry policy: exponential backoff with full jitter on
+connection errors, 429 and 5xx responses, honoring Retry-After.
+"""
+
+import asyncio
+import json
+import random
+import threading
+import time
+from typing import Any, AsyncGenerator, Callable, Dict, Mapping, NamedTuple, Optional, Tuple, TYPE_CHECKING
+
+from .jsonstream import JsonArrayDecoder
+from .ratelimit import TokenBucket, parse_retry_after
+
+if TYPE_CHECKING:
+    import requests
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (compatible; PredictionMarketAggregator/1.0)',
+    'Accept': 'application/json',
+}
+
+# Status codes worth retrying
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Read size when decoding a body incrementally
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class AsyncResponse(NamedTuple):
+    """Final response of an async request, already read and decoded."""
+    status: int
+    headers: Mapping[str, str]  # Case-insensitive
+    body: Any
+    size: int
+
+
+class HttpTransport:
+    """Pooled HTTP transport with retries and per-host connection limits."""
+
+    def __init__(self, max_per_host: int = 8, max_retries: int = 3,
+                 backoff_base: float = 0.5, backoff_max: float = 30.0,
+                 timeout: float = 30.0):
+        """
+        Args:
+            max_per_host: Max simultaneous connections to any one host
+            max_retries: Retries after the first attempt
+            backoff_base: First backoff ceiling in seconds (doubles per retry)
+            backoff_max: Upper bound for a single backoff
+            timeout: Per-request timeout in seconds
+        """
+        self.max_per_host = max_per_host
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+
+        # requests (like aiohttp below) is imported only once a transport is needed
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self._session = requests.Session()
+        self._session.headers.update(DEFAULT_HEADERS)
+        # pool_block makes callers wait for a free connection instead of
+        # opening extra ones, which enforces max_per_host
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=max_per_host, pool_block=True)
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+
+        # loop -> (session, the started guard that closes it at loop shutdown)
+        self._async_sessions: Dict[asyncio.AbstractEventLoop, Tuple[Any, AsyncGenerator]] = {}
+        self._async_lock = threading.Lock()
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Seconds to wait before retry number `attempt` (0-based)."""
+        if retry_after is not None:
+            return parse_retry_after(retry_after, default=self.backoff_base)
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    def request(self, method: str, url: str, *,
+                limiter: Optional[TokenBucket] = None, **kwargs) -> 'requests.Response':
+        """
+        Send a request, retrying transient failures.
+
+        Returns the final response (which may still be an error status);
+        raises requests.RequestException if every attempt failed to connect.
+        When a limiter is given, a token is taken before each attempt and a
+        429 pauses the limiter for everyone sharing it.
+        """
+        import requests
+
+        kwargs.setdefault('timeout', self.timeout)
+        for attempt in range(self.max_retries + 1):
+            if limiter:
+                limiter.acquire()
+            try:
+                response = self._session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(self._backoff(attempt))
+                continue
+
+            if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                return response
+
+            delay = self._backoff(attempt, response.headers.get('Retry-After'))
+            response.close()
+            if limiter and response.status_code == 429:
+                limiter.pause(delay)
+            else:
+                time.sleep(delay)
+        return response
+
+    async def _get_async_session(self):
+        """
+        Return the aiohttp session for the running loop, creating it on first use.
+
+        A new session is closed when its loop shuts down its async
+        generators (asyncio.run does this), even if aclose() is never
+        called. Sessions of loops that were closed without that step are
+        dropped here, so they can be collected.
+        """
+        import aiohttp
+
+        loop = asyncio.get_running_loop()
+        with self._async_lock:
+            for other in [other for other in self._async_sessions if other.is_closed()]:
+                del self._async_sessions[other]
+            entry = self._async_sessions.get(loop)
+        if entry is not None and not entry[0].closed:
+            return entry[0]
+
+        session = aiohttp.ClientSession(
+            headers=DEFAULT_HEADERS,
+            connector=aiohttp.TCPConnector(limit_per_host=self.max_per_host),
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+        guard = self._close_at_shutdown(loop, session)
+        # Starting the generator registers it with the loop for shutdown_asyncgens()
+        await guard.__anext__()
+        with self._async_lock:
+            self._async_sessions[loop] = (session, guard)
+        return session
+
+    async def _close_at_shutdown(self, loop: asyncio.AbstractEventLoop, session) -> AsyncGenerator:
+        try:
+            yield
+        finally:
+            with self._async_lock:
+                entry = self._async_sessions.get(loop)
+                if entry is not None and entry[0] is session:
+                    del self._async_sessions[loop]
+            await session.close()
+
+    async def request_async(self, method: str, url: str, *,
+                            limiter: Optional[TokenBucket] = None,
+                            map_items: Optional[Callable[[Any], Any]] = None,
+                            **kwargs) -> AsyncResponse:
+        """
+        Async counterpart of request().
+
+        Returns the status, headers and decoded JSON body (None for a 304)
+        of the final response. With map_items, the body must be a JSON array;
+        it is decoded while streaming and the returned body is the list of
+        map_items(element). Raises aiohttp.ClientError (including
+        ClientResponseError for a final error status), asyncio.TimeoutError
+        or ValueError on failure.
+        """
+        import aiohttp
+
+        session = await self._get_async_session()
+        for attempt in range(self.max_retries + 1):
+            if limiter:
+                await limiter.acquire_async()
+            try:
+                async with session.request(method, url, **kwargs) as response:
+                    if response.status not in RETRY_STATUSES or attempt == self.max_retries:
+                        response.raise_for_status()
+                        if map_items is not None and response.status != 304:
+                            return await self._stream_items_async(response, map_items)
+                        raw = await response.read()
+                        return AsyncResponse(
+                            status=response.status,
+                            headers=response.headers.copy(),
+                            body=json.loads(raw) if raw and response.status != 304 else None,
+                            size=len(raw),
+                        )
+                    delay = self._backoff(attempt, response.headers.get('Retry-After'))
+                    status = response.status
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt == self.max_retries:
+                    raise
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+
+            if limiter and status == 429:
+                limiter.pause(delay)
+            else:
+                await asyncio.sleep(delay)
+
+    @staticmethod
+    async def _stream_items_async(response, map_items: Callable[[Any], Any]) -> AsyncResponse:
+        decoder = JsonArrayDecoder()
+        items = []
+        size = 0
+        async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+            size += len(chunk)
+            items.extend(map_items(item) for item in decoder.feed(chunk))
+        decoder.close()
+        return AsyncResponse(
+            status=response.status,
+            headers=response.headers.copy(),
+            body=items,
+            size=size,
+        )
+
+    async def request_json_async(self, method: str, url: str, *,
+                                 limiter: Optional[TokenBucket] = None,
+                                 **kwargs) -> Any:
+        """Async request returning only the decoded JSON body."""
+        response = await self.request_async(method, url, limiter=limiter, **kwargs)
+        return response.body
+
+    async def aclose(self):
+        """Close the async session bound to the running loop."""
+        with self._async_lock:
+            entry = self._async_sessions.pop(asyncio.get_running_loop(), None)
+        if entry is not None:
+            await entry[1].aclose()
+
+    def close(self):
+        self._session.close()
+
+
+_transport: Optional[HttpTransport] = None
+_transport_lock = threading.Lock()
+
+
+def get_transport() -> HttpTransport:
+    """Return the process-wide transport, creating it on first use."""
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = HttpTransport()
+        return _transport
@@ -0,0 +1,315 @@
+"""
+Cross-venue arbitrage evaluation on executable prices.
+
+For every matched group (the same outcome listed on several venues) the
+engine considers buying YES on one venue at its ask and NO on another at
+its ask. One of the two legs pays out 1, so the position locks in
+
+    min(payout if YES, payout if NO) - cost
+
+after each venue's fees. All groups are laid out as flat NumPy arrays and
+every cross-venue leg pair is evaluated in one vectorized pass.
+
+Within one venue, the outcomes of a market the venue flags as mutually
+exclusive (MarketData.mutually_exclusive: a Kalshi mutually_exclusive
+event, a Polymarket negRisk event, a linked PredictIt market, a
+single-winner Smarkets or Betfair market) are a complete field: buying YES
+on every outcome locks in a profit when the asks sum below 1, and buying
+NO on every outcome when the YES bids sum above 1. scan_book_sums() checks
+every flagged market of a MarketBatch in one pass.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from api_clients import ContractData, MarketBatch, MarketData
+
+# (source, market, contract), as grouped by matching.MarketMatcher
+Entry = Tuple[str, MarketData, ContractData]
+
+
+@dataclass(frozen=True)
+class FeeModel:
+    """
+    Venue fees for one contract bought at price p (0-1) that pays 1 if it wins.
+
+    profit_fee: Share of the winnings (1 - p) kept by the venue when the
+        contract wins (PredictIt's 10% profit fee, exchange commission on
+        net winnings).
+    trade_fee_rate: Fee charged at purchase as rate * p * (1 - p)
+        (Kalshi's trading fee schedule).
+    """
+    profit_fee: float = 0.0
+    trade_fee_rate: float = 0.0
+
+
+DEFAULT_FEE_MODELS: Dict[str, FeeModel] = {
+    'PredictIt': FeeModel(profit_fee=0.10),
+    'Kalshi': FeeModel(trade_fee_rate=0.07),
+    'Polymarket': FeeModel(),
+    'Smarkets': FeeModel(profit_fee=0.02),
+    'Betfair': FeeModel(profit_fee=0.05),
+}
+
+
+@dataclass
+class ArbitrageOpportunity:
+    """Best YES/NO leg pair for one matched group."""
+    canonical_name: str
+    yes_source: str
+    yes_contract: ContractData
+    yes_ask: float
+    no_source: str
+    no_contract: ContractData
+    no_ask: float
+    gross_edge: float  # 1 - yes_ask - no_ask
+    net_edge: float    # Worst-case profit per 1 of payout after fees
+
+
+@dataclass
+class BookSumOpportunity:
+    """Buying one side of every outcome of a single multi-outcome market."""
+    source: str
+    market_id: str
+    market_name: str
+    side: str            # 'yes': buy YES on every outcome; 'no': buy NO on every outcome
+    outcomes: int
+    book_sum: float      # Sum of YES asks ('yes') or of implied YES bids ('no')
+    gross_edge: float    # 1 - book_sum ('yes') or book_sum - 1 ('no')
+    net_edge: float      # Worst-case profit after fees, per set of outcomes
+    stale_outcomes: int  # Outcomes whose quote is older than the staleness limit
+
+    @property
+    def stale(self) -> bool:
+        return self.stale_outcomes > 0
+
+
+def _ask(value: Optional[float]) -> float:
+    """Executable ask, NaN when the side has no offer."""
+    if value is None or not 0 < value < 1:
+        return np.nan
+    return float(value)
+
+
+def _no_ask(contract: ContractData) -> float:
+    """NO ask, or the complement of the YES bid where NO isn't quoted separately."""
+    no_ask = _ask(contract.no_ask)
+    if np.isnan(no_ask) and contract.yes_bid and 0 < contract.yes_bid < 1:
+        return 1.0 - contract.yes_bid
+    return no_ask
+
+
+class ArbitrageEngine:
+    """Evaluates matched groups for cross-venue arbitrage."""
+
+    def __init__(self, fee_models: Optional[Dict[str, FeeModel]] = None):
+        self.fee_models = dict(DEFAULT_FEE_MODELS if fee_models is None else fee_models)
+
+    def _layout(self, groups: Sequence[Tuple[str, Sequence[Entry]]]):
+        """Flatten groups into parallel arrays, one row per contract."""
+        group_ids, yes_asks, no_asks = [], [], []
+        profit_fees, trade_fees, venues, entries = [], [], [], []
+        venue_codes: Dict[str, int] = {}
+
+        for g, (_, group) in enumerate(groups):
+            for entry in group:
+                source, _, contract = entry
+                fees = self.fee_models.get(source, FeeModel())
+                group_ids.append(g)
+                yes_asks.append(_ask(contract.yes_ask))
+                no_asks.append(_no_ask(contract))
+                profit_fees.append(fees.profit_fee)
+                trade_fees.append(fees.trade_fee_rate)
+                venues.append(venue_codes.setdefault(source, len(venue_codes)))
+                entries.append(entry)
+
+        return (
+            np.array(group_ids, dtype=np.int64),
+            np.array(yes_asks, dtype=np.float64),
+            np.array(no_asks, dtype=np.float64),
+            np.array(profit_fees, dtype=np.float64),
+            np.array(trade_fees, dtype=np.float64),
+            np.array(venues, dtype=np.int64),
+            entries,
+        )
+
+    def evaluate(self, groups: Sequence[Tuple[str, Sequence[Entry]]],
+                 top_k: Optional[int] = None,
+                 min_edge: Optional[float] = None) -> List[ArbitrageOpportunity]:
+        """
+        Best net-edge leg pair per group, ranked by net edge.
+
+        Args:
+            groups: (canonical_name, entries) pairs, e.g. MarketMatcher.groups()
+            top_k: Return at most this many opportunities
+            min_edge: Drop opportunities whose net edge is below this
+        """
+        if not groups:
+            return []
+
+        group_ids, yes_ask, no_ask, profit_fee, trade_fee, venue, entries = self._layout(groups)
+        if not len(group_ids):
+            return []
+
+        # Rows are already grouped contiguously; pair every row with every
+        # row of its own group
+        sizes = np.bincount(group_ids, minlength=len(groups))
+        starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+        repeat = sizes[group_ids]
+        i = np.repeat(np.arange(len(group_ids)), repeat)
+        offset = np.arange(len(i)) - np.repeat(np.cumsum(repeat) - repeat, repeat)
+        j = starts[group_ids[i]] + offset
+
+        valid = (venue[i] != venue[j]) & ~np.isnan(yes_ask[i]) & ~np.isnan(no_ask[j])
+        i, j = i[valid], j[valid]
+        if not len(i):
+            return []
+
+        # YES leg on venue i, NO leg on venue j
+        ya, na = yes_ask[i], no_ask[j]
+        cost = ya + na + trade_fee[i] * ya * (1 - ya) + trade_fee[j] * na * (1 - na)
+        payout_if_yes = 1 - profit_fee[i] * (1 - ya)
+        payout_if_no = 1 - profit_fee[j] * (1 - na)
+        net = np.minimum(payout_if_yes, payout_if_no) - cost
+        gross = 1 - ya - na
+
+        # Best pair per group: sort by (group, -net) and take each group's first
+        g = group_ids[i]
+        order = np.lexsort((-net, g))
+        first = order[np.concatenate(([True], g[order][1:] != g[order][:-1]))]
+
+        if min_edge is not None:
+            first = first[net[first] >= min_edge]
+        if top_k is not None and top_k < len(first):
+            first = first[np.argpartition(-net[first], top_k)[:top_k]]
+        first = first[np.argsort(-net[first], kind='stable')]
+
+        opportunities = []
+        for k in first:
+            yes_source, _, yes_contract = entries[i[k]]
+            no_source, _, no_contract = entries[j[k]]
+            opportunities.append(ArbitrageOpportunity(
+                canonical_name=groups[g[k]][0],
+                yes_source=yes_source,
+                yes_contract=yes_contract,
+                yes_ask=float(ya[k]),
+                no_source=no_source,
+                no_contract=no_contract,
+                no_ask=float(na[k]),
+                gross_edge=float(gross[k]),
+                net_edge=float(net[k]),
+            ))
+        return opportunities
+
+    def scan_book_sums(self, batch: MarketBatch, top_k: Optional[int] = None,
+                       min_edge: Optional[float] = None, min_outcomes: int = 2,
+                       stale_after: Optional[float] = 900,
+                       now: Optional[float] = None) -> List[BookSumOpportunity]:
+        """
+        Over/underround of every multi-outcome market, ranked by net edge.
+
+        Treats the contracts of each market as mutually exclusive and
+        exhaustive, so only markets flagged mutually_exclusive with at least
+        min_outcomes contracts are scanned, and a side is only considered
+        when every outcome has an executable price on it.
+
+        Args:
+            batch: Contracts to scan; rows of one market must be contiguous,
+                as MarketBatch.add_market() writes them
+            top_k: Return at most this many results
+            min_edge: Drop results whose net edge is below this
+            min_outcomes: Smallest market to treat as a field
+            stale_after: Quotes last updated more than this many seconds
+                before `now` are counted as stale (None: don't check)
+            now: Reference Unix time for staleness (default: current time)
+        """
+        n = len(batch)
+        if not n:
+            return []
+
+        source = np.array(batch.strings['source'], dtype=object)
+        market_id = np.array(batch.strings['market_id'], dtype=object)
+        columns = batch.to_numpy()
+        yes_ask, yes_bid, no_ask = columns['yes_ask'], columns['yes_bid'], columns['no_ask']
+        last_updated = columns['last_updated']
+        exclusive = columns['mutually_exclusive']
+
+        # Market segments: a new one starts wherever source or market_id changes
+        starts = np.flatnonzero(np.concatenate((
+            [True], (source[1:] != source[:-1]) | (market_id[1:] != market_id[:-1])
+        )))
+        outcomes = np.diff(np.append(starts, n))
+
+        # Per-row fees by venue
+        venues, venue_idx = np.unique(source, return_inverse=True)
+        venue_fees = [self.fee_models.get(v, FeeModel()) for v in venues]
+        profit_fee = np.array([f.profit_fee for f in venue_fees])[venue_idx]
+        trade_fee = np.array([f.trade_fee_rate for f in venue_fees])[venue_idx]
+
+        # Executable prices; NO falls back to the complement of the YES bid
+        with np.errstate(invalid='ignore'):
+            ya = np.where((yes_ask > 0) & (yes_ask < 1), yes_ask, np.nan)
+            na = np.where((no_ask > 0) & (no_ask < 1), no_ask, np.nan)
+            na = np.where(np.isnan(na) & (yes_bid > 0) & (yes_bid < 1), 1 - yes_bid, na)
+
+        def segment_sum(values):
+            return np.add.reduceat(values, starts)
+
+        # Buy YES on every outcome: exactly one pays 1
+        yes_complete = segment_sum(np.isnan(ya).astype(np.int64)) == 0
+        yes_cost = segment_sum(np.nan_to_num(ya + trade_fee * ya * (1 - ya)))
+        yes_payout = np.minimum.reduceat(np.nan_to_num(1 - profit_fee * (1 - ya), nan=np.inf), starts)
+        yes_sum = segment_sum(np.nan_to_num(ya))
+        yes_net = yes_payout - yes_cost
+
+        # Buy NO on every outcome: all but one pay 1
+        no_complete = segment_sum(np.isnan(na).astype(np.int64)) == 0
+        no_cost = segment_sum(np.nan_to_num(na + trade_fee * na * (1 - na)))
+        no_payouts = np.nan_to_num(1 - profit_fee * (1 - na))
+        no_payout = segment_sum(no_payouts) - np.maximum.reduceat(no_payouts, starts)
+        no_sum = outcomes - segment_sum(np.nan_to_num(na))  # Implied YES bids
+        no_net = no_payout - no_cost
+
+        if stale_after is not None:
+            reference = time.time() if now is None else now
+            with np.errstate(invalid='ignore'):
+                stale = segment_sum((reference - last_updated > stale_after).astype(np.int64))
+        else:
+            stale = np.zeros(len(starts), dtype=np.int64)
+
+        eligible = (outcomes >= min_outcomes) & exclusive[starts]
+        market = np.concatenate((
+            np.flatnonzero(eligible & yes_complete), np.flatnonzero(eligible & no_complete)
+        ))
+        is_yes = np.arange(len(market)) < np.count_nonzero(eligible & yes_complete)
+        net = np.where(is_yes, yes_net[market], no_net[market])
+        book_sum = np.where(is_yes, yes_sum[market], no_sum[market])
+        gross = np.where(is_yes, 1 - book_sum, book_sum - 1)
+
+        keep = np.arange(len(market))
+        if min_edge is not None:
+            keep = keep[net >= min_edge]
+        if top_k is not None and top_k < len(keep):
+            keep = keep[np.argpartition(-net[keep], top_k)[:top_k]]
+        keep = keep[np.argsort(-net[keep], kind='stable')]
+
+        market_names = batch.strings['market_name']
+        results = []
+        for k in keep:
+            m = market[k]
+            row = starts[m]
+            results.append(BookSumOpportunity(
+                source=source[row],
+                market_id=market_id[row],
+                market_name=market_names[row],
+                side='yes' if is_yes[k] else 'no',
+                outcomes=int(outcomes[m]),
+                book_sum=float(book_sum[k]),
+                gross_edge=float(gross[k]),
+                net_edge=float(net[k]),
+                stale_outcomes=int(stale[m]),
+            ))
+        return results
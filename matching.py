@@ -0,0 +1,326 @@
+"""
+Cross-venue market matching.
+
+Pairs contracts that describe the same outcome on different platforms,
+e.g. "Who will win the 2028 presidential election? JD Vance" on one venue
+and "2028 US Presidential Election winner? J.D. Vance" on another.
+
+Market and contract names are normalized with precompiled patterns and
+scored separately: the contract's subject (its name minus words repeated
+from the market name, e.g. the candidate) and the market name must each
+be similar enough. Two hard constraints apply before any scoring: the
+subjects must end in the same word (the surname, for candidates) and the
+names must mention exactly the same numbers, dates and parties, so
+"above 45%" never pairs with "above 40%" nor "House Democratic" with
+"House Republican". Identical names form one node; nodes are compared only
+within their surname block (narrowed to names that also share a market-name
+token when the surname is very common; for yes/no contracts, when they
+share a reasonably rare market-name token), and linked when they are each
+other's best match. This keeps matching near-linear in the number of
+contracts instead of comparing every pair.
+"""
+
+import re
+from collections import Counter, defaultdict
+from typing import Dict, FrozenSet, Generic, Hashable, List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar('T')
+
+# Words that carry no identity across venues, removed before punctuation
+# so "J.D." and "JD" both normalize to "jd". Party words are kept: they
+# tell "House Democratic" from "House Republican".
+_NOISE_WORDS = re.compile(
+    r'\b(?:to win|will win|wins?|winner'
+    r'|the|a|an|who|which|will|be|next|us|of|in|for|by'
+    r'|presidential|president|election|nominee|nomination)\b'
+)
+# Election years are dropped from normalize_name() (and so from candidate
+# slugs), but the matcher keeps them: they must agree between venues
+_YEARS = re.compile(r'\b(?:2024|2025|2026|2027|2028|2029|2030)\b')
+# Punctuation, except a decimal point, so "4.5%" stays distinct from "45%"
+_PUNCTUATION = re.compile(r'(?!(?<=\d)\.(?=\d))[^\w\s]')
+
+# Tokens that must agree exactly between two matched names
+_KEY_TOKENS = re.compile(
+    r'\d+(?:\.\d+)?'
+    r'|\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec'
+    r'|january|february|march|april|june|july|august|september|october|november|december)\b'
+    r'|\b(?:democrats?|democratic|dems?|republicans?|gop)\b'
+)
+# Trailing words that are not a surname
+_NAME_SUFFIXES = frozenset(('jr', 'sr', 'ii', 'iii', 'iv'))
+# Contract names that describe a side of a binary market, not a subject
+_SIDE_NAMES = frozenset(('yes', 'no'))
+
+
+def _normalize(text: str) -> str:
+    text = _NOISE_WORDS.sub('', text)
+    text = _PUNCTUATION.sub('', text)
+    return ' '.join(text.split())
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a market/contract name for matching."""
+    return _normalize(_YEARS.sub('', name.lower()))
+
+
+def _key_token(token: str) -> str:
+    if token[0].isdigit():
+        return token.rstrip('0').rstrip('.') if '.' in token else token.lstrip('0') or '0'
+    if token.startswith(('dem', 'democrat')):
+        return 'democratic'
+    if token.startswith(('rep', 'gop')):
+        return 'republican'
+    return token[:3]
+
+
+def signature(text: str) -> FrozenSet[str]:
+    """Numbers, months and parties mentioned in a normalized name."""
+    return frozenset(_key_token(token) for token in _KEY_TOKENS.findall(text))
+
+
+def trigrams(text: str) -> FrozenSet[str]:
+    """Character trigrams of text, padded so short words still produce some."""
+    padded = f"  {text} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    shared = len(a & b)
+    return shared / (len(a) + len(b) - shared)
+
+
+class _Node(Generic[T]):
+    """All entries sharing one normalized (market name, contract name) pair."""
+    __slots__ = ('id', 'key', 'name', 'market', 'subject', 'surname', 'signature',
+                 'entries', 'sources', 'market_grams', 'subject_grams')
+
+    def __init__(self, node_id: int, key: Tuple[str, str]):
+        market, contract = key
+        self.id = node_id
+        self.key = key
+        self.name = f"{market} {contract}".strip()
+        self.market = market
+        # The contract minus words it repeats from the market name, so
+        # "Will Kevin Hassett be the next Fed Chair?" under a Fed Chair
+        # market scores as "kevin hassett"
+        market_tokens = set(market.split())
+        subject = [token for token in contract.split() if token not in market_tokens]
+        self.subject = ' '.join(subject) if subject else contract
+        while subject and subject[-1] in _NAME_SUFFIXES:
+            subject.pop()
+        self.surname: Optional[str] = (
+            subject[-1] if subject and self.subject not in _SIDE_NAMES else None
+        )
+        self.signature = signature(f"{market} {contract}")
+        self.entries: List[T] = []
+        self.sources: Counter = Counter()
+        self.market_grams: FrozenSet[str] = trigrams(market)
+        self.subject_grams: FrozenSet[str] = trigrams(self.subject)
+
+
+class MarketMatcher(Generic[T]):
+    """
+    Groups entries from different sources whose names refer to the same thing.
+
+    The matcher is incremental: entries can be added and removed between
+    calls to groups(), and only names not seen before are scored. Links
+    between names are never undone, so after many removals call rebuild()
+    (see stale_ratio()).
+
+    Usage:
+        matcher = MarketMatcher()
+        for source, market, contract in entries:
+            matcher.add(source, market.market_name, contract.contract_name,
+                        (source, market, contract))
+        for name, group in matcher.groups():
+            ...
+    """
+
+    def __init__(self, threshold: float = 0.5, market_threshold: float = 0.3,
+                 max_block_size: int = 200, min_token_length: int = 2):
+        """
+        Args:
+            threshold: Minimum trigram Jaccard similarity of two contract
+                subjects (candidate names) to link them
+            market_threshold: Minimum trigram Jaccard similarity of the
+                market names they belong to
+            max_block_size: Tokens shared by more names than this are too
+                common to block on (they would reintroduce quadratic work);
+                a surname this common is blocked on together with each
+                market-name token instead
+            min_token_length: Shorter tokens (other than numbers) are not
+                used for blocking
+        """
+        self.threshold = threshold
+        self.market_threshold = market_threshold
+        self.max_block_size = max_block_size
+        self.min_token_length = min_token_length
+        self._reset()
+
+    def _reset(self):
+        self._nodes: Dict[Tuple[str, str], _Node[T]] = {}
+        self._node_list: List[_Node[T]] = []
+        self._index: Dict[Tuple[str, ...], List[int]] = defaultdict(list)
+        self._best: Dict[int, Tuple[float, int]] = {}
+        self._parent: List[int] = []
+        self._pending: List[int] = []
+
+    @staticmethod
+    def _key(market_name: str, contract_name: str) -> Tuple[str, str]:
+        return _normalize(market_name.lower()), _normalize(contract_name.lower())
+
+    def _new_node(self, key: Tuple[str, str]) -> _Node[T]:
+        node = _Node(len(self._node_list), key)
+        self._nodes[key] = node
+        self._node_list.append(node)
+        self._parent.append(node.id)
+        self._pending.append(node.id)
+        return node
+
+    def add(self, source: Hashable, market_name: str, contract_name: str, entry: T):
+        key = self._key(market_name, contract_name)
+        node = self._nodes.get(key) or self._new_node(key)
+        node.entries.append(entry)
+        node.sources[source] += 1
+
+    def remove(self, source: Hashable, market_name: str, contract_name: str, entry: T) -> bool:
+        """Remove an entry added under the same source and names."""
+        node = self._nodes.get(self._key(market_name, contract_name))
+        if node is None or entry not in node.entries:
+            return False
+        node.entries.remove(entry)
+        node.sources[source] -= 1
+        if node.sources[source] <= 0:
+            del node.sources[source]
+        return True
+
+    def __len__(self) -> int:
+        return sum(len(node.entries) for node in self._node_list)
+
+    def stale_ratio(self) -> float:
+        """Share of names that no longer have any entries."""
+        if not self._node_list:
+            return 0.0
+        return sum(1 for node in self._node_list if not node.entries) / len(self._node_list)
+
+    def rebuild(self):
+        """Re-match the live entries from scratch, dropping links through removed names."""
+        live = [(node.key, list(node.entries), Counter(node.sources))
+                for node in self._node_list if node.entries]
+        self._reset()
+        for key, entries, sources in live:
+            node = self._new_node(key)
+            node.entries = entries
+            node.sources = sources
+
+    def _find(self, i: int) -> int:
+        parent = self._parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def _offer(self, i: int, j: int, score: float):
+        if score > self._best.get(i, (0.0, -1))[0]:
+            self._best[i] = (score, j)
+
+    def _blocks(self, node: _Node[T]) -> List[Tuple[str, ...]]:
+        """
+        Index keys of a node: its surname followed by the surname with each
+        market token, or market tokens for yes/no contracts.
+        """
+        tokens = [token for token in set(node.market.split())
+                  if len(token) >= self.min_token_length or token.isdigit()]
+        if node.surname is not None:
+            return [('surname', node.surname)] + [('surname', node.surname, token) for token in tokens]
+        return [('market', token) for token in tokens]
+
+    def _score(self, a: _Node[T], b: _Node[T]) -> float:
+        """Similarity of two nodes, or 0.0 when they cannot be the same outcome."""
+        if a.surname != b.surname or a.signature != b.signature:
+            return 0.0
+        if a.surname is None and a.subject != b.subject:
+            return 0.0
+        subject = jaccard(a.subject_grams, b.subject_grams)
+        if subject < self.threshold:
+            return 0.0
+        market = jaccard(a.market_grams, b.market_grams)
+        if market < self.market_threshold:
+            return 0.0
+        return (subject + market) / 2
+
+    def _score_pending(self):
+        """Score names added since the last call against their blocks."""
+        nodes = self._node_list
+        touched = set()
+
+        for i in self._pending:
+            node_i = nodes[i]
+            candidates = set()
+            blocks = self._blocks(node_i)
+            lookup = blocks
+            if node_i.surname is not None:
+                # A surname shared by too many names is narrowed by market token
+                small = len(self._index[blocks[0]]) < self.max_block_size
+                lookup = blocks[:1] if small else blocks[1:]
+            for block in lookup:
+                postings = self._index[block]
+                if len(postings) < self.max_block_size:
+                    candidates.update(postings)
+            for block in blocks:
+                self._index[block].append(i)
+
+            for j in candidates:
+                node_j = nodes[j]
+                # Linking only helps if it brings in another source
+                if len(node_i.sources) == 1 and node_i.sources.keys() == node_j.sources.keys():
+                    continue
+                score = self._score(node_i, node_j)
+                if not score:
+                    continue
+                self._offer(i, j, score)
+                self._offer(j, i, score)
+                touched.update((i, j))
+
+        self._pending = []
+        for i in touched:
+            j = self._best[i][1]
+            if self._best.get(j, (0.0, -1))[1] == i:
+                self._parent[self._find(i)] = self._find(j)
+
+    def groups(self) -> List[Tuple[str, List[T]]]:
+        """
+        Matched groups spanning at least two sources, as (name, entries).
+
+        Names that normalize identically are always grouped. Distinct names
+        are linked when each is the other's best match, so one loose match
+        cannot chain unrelated names together. The group name is that of
+        its largest node.
+        """
+        self._score_pending()
+
+        members: Dict[int, List[_Node[T]]] = defaultdict(list)
+        for node in self._node_list:
+            if node.entries:
+                members[self._find(node.id)].append(node)
+
+        result = []
+        for group in members.values():
+            sources = set().union(*(node.sources for node in group))
+            if len(sources) < 2:
+                continue
+            name = max(group, key=lambda node: len(node.entries)).name
+            result.append((name, [entry for node in group for entry in node.entries]))
+        return result
+
+
+def match_entries(entries: Sequence[Tuple[Hashable, str, str, T]],
+                  threshold: float = 0.5) -> List[Tuple[str, List[T]]]:
+    """Group (source, market_name, contract_name, entry) tuples; see MarketMatcher.groups()."""
+    matcher: MarketMatcher[T] = MarketMatcher(threshold=threshold)
+    for source, market_name, contract_name, entry in entries:
+        matcher.add(source, market_name, contract_name, entry)
+    return matcher.groups()
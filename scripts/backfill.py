@@ -166,66 +166,49 @@ class BackfillJob:
             if markets and stats['fetched'] == 0:
                 sample_data = {
                     'market_count': len(markets),
-                    'sample_market': markets[0].__dict__ if markets else None
+                    'sample_market': {**markets[0].to_dict(), 'raw_data': markets[0].raw_data} if markets else None
                 }
                 save_sample_response(source, 'markets', sample_data, window_start.isoformat())
 
-            for market in markets:
-                stats['fetched'] += 1
-
-                # Upsert market (convert status enum to string)
-                status_str = market.status.value if hasattr(market.status, 'value') else str(market.status)
-                _, market_inserted = self.storage.upsert_market(
-                    source=source,
-                    market_id=market.market_id,
-                    market_name=market.market_name,
-                    category=market.category,
-                    status=status_str,
-                    url=market.url,
-                    total_volume=market.total_volume
+            # Data and the 'completed' checkpoint commit together
+            with self.storage.batch() as tx:
+                for market in markets:
+                    stats['fetched'] += 1
+
+                    # Convert status enum to string
+                    status_str = market.status.value if hasattr(market.status, 'value') else str(market.status)
+                    tx.add_market((source, market.market_id, market.market_name, market.category,
+                                   status_str, market.url, market.total_volume, None))
+
+                    for contract in market.contracts:
+                        tx.add_contract((source, market.market_id, contract.contract_id,
+                                         contract.contract_name, None))
+                        tx.add_snapshot((
+                            source, market.market_id, contract.contract_id, snapshot_time,
+                            contract.yes_price, contract.no_price, contract.yes_bid,
+                            contract.yes_ask, contract.volume,
+                            {
+                                'market_name': market.market_name,
+                                'contract_name': contract.contract_name,
+                                'last_updated': contract.last_updated
+                            }
+                        ))
+
+                tx.flush()
+                stats['inserted'] += tx.counts['price_snapshots']['inserted']
+                # Same key, or same values as the contract's last point
+                stats['deduped'] += (tx.counts['price_snapshots']['updated']
+                                     + tx.counts['price_snapshots']['unchanged'])
+
+                self.storage.update_sync_checkpoint(
+                    checkpoint_id,
+                    status='completed',
+                    records_fetched=stats['fetched'],
+                    records_inserted=stats['inserted'],
+                    records_updated=stats['updated'],
+                    records_deduped=stats['deduped']
                 )
 
-                # Upsert contracts and price snapshots
-                for contract in market.contracts:
-                    _, contract_inserted = self.storage.upsert_contract(
-                        source=source,
-                        market_id=market.market_id,
-                        contract_id=contract.contract_id,
-                        contract_name=contract.contract_name
-                    )
-
-                    # Upsert price snapshot
-                    _, snapshot_inserted = self.storage.upsert_price_snapshot(
-                        source=source,
-                        market_id=market.market_id,
-                        contract_id=contract.contract_id,
-                        snapshot_time=snapshot_time,
-                        yes_price=contract.yes_price,
-                        no_price=contract.no_price,
-                        yes_bid=contract.yes_bid,
-                        yes_ask=contract.yes_ask,
-                        volume=contract.volume,
-                        raw_data={
-                            'market_name': market.market_name,
-                            'contract_name': contract.contract_name,
-                            'last_updated': contract.last_updated
-                        }
-                    )
-
-                    if snapshot_inserted:
-                        stats['inserted'] += 1
-                    else:
-                        stats['deduped'] += 1
-
-            self.storage.update_sync_checkpoint(
-                checkpoint_id,
-                status='completed',
-                records_fetched=stats['fetched'],
-                records_inserted=stats['inserted'],
-                records_updated=stats['updated'],
-                records_deduped=stats['deduped']
-            )
-
             logger.info(f"[{source}] Window complete: fetched={stats['fetched']}, "
                        f"inserted={stats['inserted']}, deduped={stats['deduped']}")
 
@@ -403,32 +386,36 @@ def main():
 
     # Initialize storage
     storage = Storage(args.db)
-    job = BackfillJob(storage, concurrency=args.concurrency)
 
-    if args.status:
-        job.show_status()
-        return
+    try:
+        job = BackfillJob(storage, concurrency=args.concurrency)
 
-    if args.resume:
-        job.resume_backfill()
-        return
+        if args.status:
+            job.show_status()
+            return
+
+        if args.resume:
+            job.resume_backfill()
+            return
 
-    # Parse dates
-    from_date = parse_date(args.from_date or '2025-08-01')
-    to_date = parse_date(args.to_date or datetime.now().strftime('%Y-%m-%d'))
-    window_size = parse_window(args.window)
+        # Parse dates
+        from_date = parse_date(args.from_date or '2025-08-01')
+        to_date = parse_date(args.to_date or datetime.now().strftime('%Y-%m-%d'))
+        window_size = parse_window(args.window)
 
-    logger.info(f"Backfill: {from_date.date()} to {to_date.date()}, window={args.window}")
+        logger.info(f"Backfill: {from_date.date()} to {to_date.date()}, window={args.window}")
 
-    job.run_backfill(
-        start_date=from_date,
-        end_date=to_date,
-        window_size=window_size,
-        sources=args.sources
-    )
+        job.run_backfill(
+            start_date=from_date,
+            end_date=to_date,
+            window_size=window_size,
+            sources=args.sources
+        )
 
-    # Show final status
-    job.show_status()
+        # Show final status
+        job.show_status()
+    finally:
+        storage.close()
 
 
 if __name__ == '__main__':
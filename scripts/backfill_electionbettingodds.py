@@ -151,59 +151,35 @@ def store_chart_data(
     data_points: List[ChartDataPoint]
 ) -> Tuple[int, int]:
     """Store extracted chart data. Returns (inserted, updated) counts."""
-    inserted = 0
-    updated = 0
-
-    # Upsert market
-    storage.upsert_market(
-        source=SOURCE_NAME,
-        market_id=market_id,
-        market_name=market_name,
-        category='elections',
-        status='open',
-        url=f"{BASE_URL}/President2028.html"
+    storage.bulk_upsert_markets([{
+        'source': SOURCE_NAME,
+        'market_id': market_id,
+        'market_name': market_name,
+        'category': 'elections',
+        'status': 'open',
+        'url': f"{BASE_URL}/President2028.html",
+    }])
+
+    contract_ids = [candidate.lower().replace(' ', '_').replace('.', '') for candidate in candidates]
+    storage.bulk_upsert_contracts(
+        (SOURCE_NAME, market_id, contract_id, candidate, candidate)
+        for contract_id, candidate in zip(contract_ids, candidates)
     )
 
-    # Upsert contracts
-    for candidate in candidates:
-        contract_id = candidate.lower().replace(' ', '_').replace('.', '')
-        storage.upsert_contract(
-            source=SOURCE_NAME,
-            market_id=market_id,
-            contract_id=contract_id,
-            contract_name=candidate,
-            short_name=candidate
-        )
-
-    # Store each data point
+    rows = []
     for point in data_points:
         snapshot_time = point.timestamp.isoformat()
 
-        for i, candidate in enumerate(candidates):
-            if i >= len(point.values):
-                continue
-
-            contract_id = candidate.lower().replace(' ', '_').replace('.', '')
-            value = point.values[i]
-
+        # zip stops at the shorter of candidates and values
+        for contract_id, value in zip(contract_ids, point.values):
             # Value is already a percentage (e.g., 26.2 = 26.2%)
-            yes_price = value / 100.0
-
-            _, was_inserted = storage.upsert_price_snapshot(
-                source=SOURCE_NAME,
-                market_id=market_id,
-                contract_id=contract_id,
-                snapshot_time=snapshot_time,
-                yes_price=yes_price,
-                raw_data={'chart_value': value}
-            )
-
-            if was_inserted:
-                inserted += 1
-            else:
-                updated += 1
+            rows.append((
+                SOURCE_NAME, market_id, contract_id, snapshot_time,
+                value / 100.0, None, None, None, None, {'chart_value': value}
+            ))
 
-    return inserted, updated
+    counts = storage.bulk_upsert_price_snapshots(rows)
+    return counts['inserted'], counts['updated']
 
 
 async def backfill_from_charts(storage: Storage) -> Dict:
@@ -319,14 +295,8 @@ def show_status(storage: Storage):
 
 def clear_old_data(storage: Storage):
     """Clear previously scraped flat data."""
-    with storage._get_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM price_snapshots WHERE source = ?", (SOURCE_NAME,))
-        cursor.execute("DELETE FROM contracts WHERE source = ?", (SOURCE_NAME,))
-        cursor.execute("DELETE FROM markets WHERE source = ?", (SOURCE_NAME,))
-        cursor.execute("DELETE FROM sync_checkpoints WHERE source = ?", (SOURCE_NAME,))
-        deleted = cursor.rowcount
-        logger.info(f"Cleared {deleted} old records")
+    deleted = storage.delete_source(SOURCE_NAME)
+    logger.info(f"Cleared {sum(deleted.values())} old records")
 
 
 def main():
@@ -345,26 +315,29 @@ def main():
     # Initialize storage
     storage = Storage(args.db)
 
-    if args.status:
-        show_status(storage)
-        return
+    try:
+        if args.status:
+            show_status(storage)
+            return
 
-    if args.clear:
-        logger.info("Clearing old data...")
-        clear_old_data(storage)
+        if args.clear:
+            logger.info("Clearing old data...")
+            clear_old_data(storage)
 
-    # Run backfill
-    logger.info("Starting chart data extraction...")
-    stats = asyncio.run(backfill_from_charts(storage))
+        # Run backfill
+        logger.info("Starting chart data extraction...")
+        stats = asyncio.run(backfill_from_charts(storage))
 
-    print(f"\nBackfill complete:")
-    print(f"  Pages processed: {stats['pages_processed']}")
-    print(f"  Candidates found: {stats['candidates_found']}")
-    print(f"  Data points extracted: {stats['data_points']}")
-    print(f"  Records inserted: {stats['records_inserted']}")
-    print(f"  Records updated: {stats['records_updated']}")
+        print(f"\nBackfill complete:")
+        print(f"  Pages processed: {stats['pages_processed']}")
+        print(f"  Candidates found: {stats['candidates_found']}")
+        print(f"  Data points extracted: {stats['data_points']}")
+        print(f"  Records inserted: {stats['records_inserted']}")
+        print(f"  Records updated: {stats['records_updated']}")
 
-    show_status(storage)
+        show_status(storage)
+    finally:
+        storage.close()
 
 
 if __name__ == '__main__':
@@ -53,7 +53,8 @@ def process_token(
     token_id: str,
     interval: str,
     fidelity: int,
-    storage: Storage
+    storage: Storage,
+    client: PolymarketClient
 ) -> Tuple[int, int, int]:
     """
     Process a single token - fetch and store its historical data.
@@ -61,7 +62,6 @@ def process_token(
     Returns:
         Tuple of (data_points_fetched, data_points_inserted, errors)
     """
-    client = PolymarketClient()
     fetched = 0
     inserted = 0
     errors = 0
@@ -89,7 +89,8 @@ def process_token(
         fetched = len(history)
         logger.info(f"  {contract_name[:40]}...: {fetched} data points")
 
-        # Store each data point
+        # Store all data points in one bulk upsert
+        rows = []
         for point in history:
             timestamp = point.get('t')
             price = point.get('p')
@@ -97,22 +98,12 @@ def process_token(
             if timestamp and price is not None:
                 # Convert Unix timestamp to ISO format
                 dt = datetime.fromtimestamp(timestamp, tz=timezone.utc)
-                snapshot_time = dt.isoformat()
-
-                # Store as price snapshot
-                try:
-                    _, was_inserted = storage.upsert_price_snapshot(
-                        source='Polymarket',
-                        market_id=market_id,
-                        contract_id=token_id,
-                        snapshot_time=snapshot_time,
-                        yes_price=float(price),
-                        no_price=1.0 - float(price),
-                    )
-                    if was_inserted:
-                        inserted += 1
-                except Exception as e:
-                    logger.debug(f"    Insert error: {e}")
+                rows.append((
+                    'Polymarket', market_id, token_id, dt.isoformat(),
+                    float(price), 1.0 - float(price), None, None, None, None
+                ))
+
+        inserted = storage.bulk_upsert_price_snapshots(rows)['inserted']
 
     except Exception as e:
         errors = 1
@@ -170,7 +161,7 @@ def backfill_polymarket_history(
             executor.submit(
                 process_token,
                 market_id, contract_name, token_id,
-                interval, fidelity, storage
+                interval, fidelity, storage, client
             ): (market_id, contract_name)
             for market_id, contract_name, token_id in tasks
         }
@@ -192,6 +183,7 @@ def backfill_polymarket_history(
     # Count markets processed
     stats['markets_processed'] = len(token_map)
 
+    storage.close()
     logger.info(f"Backfill complete: {stats}")
     return stats
 
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Benchmark memory footprint and serialization speed of MarketData/ContractData.
+
+Markets are rebuilt from the captured sync samples in audit/api_samples and
+replicated up to the requested number of contracts, roughly the size of a
+`--source all` cycle.
+
+Reports:
+    - bytes per contract for the slotted ContractData vs. an equivalent
+      dataclass with a per-instance __dict__
+    - to_dict() throughput vs. dataclasses.asdict()
+
+Usage:
+    python bench_models.py
+    python bench_models.py --contracts 100000
+    python bench_models.py --samples path/to/api_samples
+"""
+
+import argparse
+import ast
+import dataclasses
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api_clients.base import ContractData, MarketData, MarketStatus
+
+DEFAULT_SAMPLES_DIR = Path(__file__).parent.parent / "audit" / "api_samples"
+
+# Same fields as ContractData, but with a regular per-instance __dict__
+PlainContractData = dataclasses.make_dataclass(
+    'PlainContractData',
+    [(f.name, f.type, dataclasses.field(default=f.default))
+     if f.default is not dataclasses.MISSING else (f.name, f.type)
+     for f in dataclasses.fields(ContractData)],
+)
+
+
+def _parse_datetime(value: Any):
+    if isinstance(value, str) and value:
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    return None
+
+
+def _parse_status(value: Any) -> MarketStatus:
+    # Older samples store str(MarketStatus.OPEN), newer ones the value
+    value = str(value or '').split('.')[-1].lower()
+    try:
+        return MarketStatus(value)
+    except ValueError:
+        return MarketStatus.UNKNOWN
+
+
+def _parse_contract(value: Any) -> ContractData:
+    """Build a contract from a sample entry (a to_dict() dict or a repr string)."""
+    if isinstance(value, str):
+        call = ast.parse(value, mode='eval').body
+        value = {kw.arg: ast.literal_eval(kw.value) for kw in call.keywords}
+    fields = {f.name for f in dataclasses.fields(ContractData)}
+    data = {k: v for k, v in value.items() if k in fields}
+    data['last_updated'] = _parse_datetime(data.get('last_updated'))
+    return ContractData(**data)
+
+
+def _parse_market(value: Dict[str, Any]) -> MarketData:
+    return MarketData(
+        market_id=str(value.get('market_id', '')),
+        market_name=value.get('market_name', ''),
+        source=value.get('source', ''),
+        category=value.get('category', ''),
+        status=_parse_status(value.get('status')),
+        contracts=[_parse_contract(c) for c in value.get('contracts', [])],
+        url=value.get('url'),
+        description=value.get('description'),
+        end_date=_parse_datetime(value.get('end_date')),
+        total_volume=value.get('total_volume'),
+        category_tag=value.get('category_tag'),
+        last_updated=_parse_datetime(value.get('last_updated')),
+        raw_data=value.get('raw_data'),
+    )
+
+
+def load_sample_markets(samples_dir: Path) -> List[MarketData]:
+    """Rebuild MarketData objects from every sync sample file."""
+    markets = []
+    for path in sorted(samples_dir.glob('*.json')):
+        with open(path) as f:
+            data = json.load(f).get('data') or {}
+        samples = data.get('sample_markets') or []
+        if data.get('sample_market'):
+            samples.append(data['sample_market'])
+        markets.extend(_parse_market(m) for m in samples)
+    return markets
+
+
+def replicate(markets: List[MarketData], target_contracts: int) -> List[MarketData]:
+    """Fresh copies of the sample markets until target_contracts is reached."""
+    result = []
+    count = 0
+    while count < target_contracts:
+        for market in markets:
+            contracts = [dataclasses.replace(c) for c in market.contracts]
+            result.append(dataclasses.replace(market, contracts=contracts))
+            count += len(contracts)
+            if count >= target_contracts:
+                break
+    return result
+
+
+def bytes_per_object(build: Callable[[], List[Any]]) -> float:
+    """Average bytes allocated per object returned by build()."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    return allocated / len(objects) if objects else 0.0
+
+
+def throughput(fn: Callable[[Any], Any], items: List[Any], repeat: int = 3) -> float:
+    """Best items-per-second of fn over items."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            fn(item)
+        best = min(best, time.perf_counter() - start)
+    return len(items) / best if best else float('inf')
+
+
+def asdict_serializable(obj) -> Dict[str, Any]:
+    """The previous to_dict(): a recursive asdict() copy plus datetime fix-up."""
+    d = dataclasses.asdict(obj)
+    if d.get('last_updated'):
+        d['last_updated'] = d['last_updated'].isoformat()
+    return d
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark market data models')
+    parser.add_argument('--samples', type=Path, default=DEFAULT_SAMPLES_DIR,
+                        help=f'Sample directory (default: {DEFAULT_SAMPLES_DIR})')
+    parser.add_argument('--contracts', type=int, default=50000,
+                        help='Contracts to hold in memory (default: 50000)')
+    args = parser.parse_args()
+
+    samples = [m for m in load_sample_markets(args.samples) if m.contracts]
+    if not samples:
+        print(f"No sample markets with contracts found in {args.samples}")
+        sys.exit(1)
+
+    sample_contracts = [c for m in samples for c in m.contracts]
+    print(f"Loaded {len(samples)} sample markets, {len(sample_contracts)} contracts")
+
+    # Memory: same field values, only the container differs
+    n = args.contracts
+    slotted = bytes_per_object(
+        lambda: [dataclasses.replace(sample_contracts[i % len(sample_contracts)]) for i in range(n)]
+    )
+    plain = bytes_per_object(
+        lambda: [PlainContractData(**sample_contracts[i % len(sample_contracts)].to_dict())
+                 for i in range(n)]
+    )
+    print(f"\nMemory ({n:,} contracts):")
+    print(f"  ContractData (slotted):   {slotted:8.1f} bytes/contract")
+    print(f"  with __dict__:            {plain:8.1f} bytes/contract")
+
+    # Serialization
+    markets = replicate(samples, n)
+    contracts = [c for m in markets for c in m.contracts]
+    print(f"\nSerialization ({len(markets):,} markets, {len(contracts):,} contracts):")
+    print(f"  ContractData.to_dict:     {throughput(ContractData.to_dict, contracts):12,.0f} contracts/s")
+    print(f"  asdict():                 {throughput(asdict_serializable, contracts):12,.0f} contracts/s")
+    print(f"  MarketData.to_dict:       {throughput(MarketData.to_dict, markets):12,.0f} markets/s")
+
+    start = time.perf_counter()
+    encoded = json.dumps([m.to_dict() for m in markets]).encode()
+    elapsed = time.perf_counter() - start
+    print(f"  to_dict + json.dumps:     {len(encoded) / elapsed / 1e6:12,.1f} MB/s "
+          f"({len(encoded) / len(contracts):.0f} bytes/contract)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Check the cold-start import cost of the scheduled entry points.
+
+Each entry point is imported in a fresh interpreter under
+`python -X importtime`; the check fails if the median cumulative import
+time goes over its budget, or if a heavy optional dependency (pandas,
+NumPy, pyarrow, psycopg2, aiohttp) is loaded at import time instead of
+where it is used. Cron and GitHub Actions pay this cost on every run.
+
+Usage:
+    python check_startup.py
+    python check_startup.py --runs 7
+    python check_startup.py --scale 2     # Slower machine: double the budgets
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+ROOT = Path(__file__).parent.parent
+
+# Module -> import budget in milliseconds
+BUDGETS_MS = {
+    'aggregator': 150,
+    'scripts.sync': 150,
+    'scripts.sync_supabase': 100,
+}
+
+# Must only be imported where they are actually used
+HEAVY_MODULES = ('pandas', 'numpy', 'pyarrow', 'psycopg2', 'aiohttp')
+
+
+def measure(module: str) -> Tuple[float, Set[str]]:
+    """Import module in a fresh interpreter; returns (cumulative ms, modules imported)."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, env={**os.environ, 'PYTHONPATH': str(ROOT)},
+        capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr.strip()[-2000:]}")
+
+    cumulative_us = None
+    imported = set()
+    # Lines look like "import time:  self [us] | cumulative | name"
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line.split('|', 2)
+        name = name.strip()
+        imported.add(name)
+        if name == module:
+            cumulative_us = int(cumulative)
+    if cumulative_us is None:
+        raise RuntimeError(f"no importtime record for {module}")
+    return cumulative_us / 1000, imported
+
+
+def check(budgets: Dict[str, float], runs: int) -> List[str]:
+    """Returns a list of failures (empty when everything is within budget)."""
+    failures = []
+    for module, budget in budgets.items():
+        timings = []
+        imported: Set[str] = set()
+        try:
+            for _ in range(runs):
+                elapsed, imported = measure(module)
+                timings.append(elapsed)
+        except RuntimeError as e:
+            print(f"  {module:<24} FAIL")
+            failures.append(str(e))
+            continue
+        median = statistics.median(timings)
+
+        heavy = sorted(m for m in HEAVY_MODULES if m in imported)
+        status = 'ok' if median <= budget and not heavy else 'FAIL'
+        print(f"  {module:<24} {median:7.1f} ms (budget {budget:.0f} ms)  {status}")
+
+        if median > budget:
+            failures.append(f"{module}: {median:.1f} ms > {budget:.0f} ms")
+        if heavy:
+            failures.append(f"{module}: imports {', '.join(heavy)} at startup")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check entry point import times against a budget')
+    parser.add_argument('--runs', type=int, default=5,
+                        help='Fresh interpreters per entry point; the median is used (default: 5)')
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help='Multiply every budget, e.g. for slow CI machines (default: 1.0)')
+    args = parser.parse_args()
+
+    print("Startup import times:")
+    failures = check({m: ms * args.scale for m, ms in BUDGETS_MS.items()}, args.runs)
+    if failures:
+        print("\nStartup budget exceeded:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
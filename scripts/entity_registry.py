@@ -0,0 +1,121 @@
+"""
+Persistent cross-source entity registry.
+
+Maps each (source, market_id, contract_id) to a canonical market id (the
+site's canonical market types, e.g. 'presidential-winner-2028') and a
+canonical candidate id (e.g. 'jd-vance'), so cross-venue joins are
+indexed lookups on the entity_registry table instead of name
+normalization passes.
+
+A sync loads the registry rows for its source once, resolves contracts in
+memory, and only classifies (and writes back) contracts that are new or
+whose names changed since they were registered. Rows marked manual are
+never overwritten.
+
+Usage:
+    registry = EntityRegistry(storage, 'Kalshi')
+    for market in markets:
+        for contract in market.contracts:
+            entry = registry.resolve(market.market_id, market.market_name,
+                                     contract.contract_id, contract.contract_name)
+    registry.flush()
+"""
+
+from collections import defaultdict
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from matching import normalize_name
+from scripts.populate_site_markets import get_canonical_market_type
+
+# Contract names that describe a side, not a candidate
+_SIDE_NAMES = {'yes', 'no'}
+
+
+class RegistryEntry(NamedTuple):
+    """One entity_registry row, in column order."""
+    source: str
+    market_id: str
+    contract_id: str
+    market_name: str
+    contract_name: str
+    canonical_market_id: Optional[str]
+    canonical_candidate_id: Optional[str]
+    manual: bool = False
+
+
+def canonical_candidate_id(contract_name: str) -> Optional[str]:
+    """Candidate slug shared across venues, e.g. 'J.D. Vance' -> 'jd-vance'."""
+    normalized = normalize_name(contract_name or '')
+    if not normalized or normalized in _SIDE_NAMES:
+        return None
+    return normalized.replace(' ', '-')
+
+
+class EntityRegistry:
+    """In-memory view of one source's registry rows, written back in bulk."""
+
+    def __init__(self, storage, source: str):
+        """
+        Args:
+            storage: Storage or SupabaseStorage
+            source: Source whose rows are loaded and resolved
+        """
+        self.storage = storage
+        self.source = source
+        self._entries: Dict[Tuple[str, str], RegistryEntry] = {}
+        # canonical_market_id -> keys of its entries
+        self._by_market: Dict[Optional[str], Set[Tuple[str, str]]] = defaultdict(set)
+        self._pending: Dict[Tuple[str, str], RegistryEntry] = {}
+
+        for row in storage.get_registry_entries(source):
+            self._put(RegistryEntry(**{**row, 'manual': bool(row['manual'])}))
+
+    def _put(self, entry: RegistryEntry):
+        key = (entry.market_id, entry.contract_id)
+        previous = self._entries.get(key)
+        if previous is not None:
+            self._by_market[previous.canonical_market_id].discard(key)
+        self._entries[key] = entry
+        self._by_market[entry.canonical_market_id].add(key)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def resolve(self, market_id: str, market_name: str,
+                contract_id: str, contract_name: str) -> RegistryEntry:
+        """Canonical ids for a contract, classifying it only if new or renamed."""
+        key = (market_id, contract_id)
+        entry = self._entries.get(key)
+        if entry is not None and (entry.manual or (
+                entry.market_name == market_name and entry.contract_name == contract_name)):
+            return entry
+
+        entry = RegistryEntry(
+            source=self.source,
+            market_id=market_id,
+            contract_id=contract_id,
+            market_name=market_name,
+            contract_name=contract_name,
+            canonical_market_id=get_canonical_market_type(market_name),
+            canonical_candidate_id=canonical_candidate_id(contract_name),
+        )
+        self._put(entry)
+        self._pending[key] = entry
+        return entry
+
+    def lookup(self, canonical_market_id: str,
+               canonical_candidate_id: Optional[str] = None) -> List[RegistryEntry]:
+        """This source's entries for a canonical market (and candidate)."""
+        entries = (self._entries[key] for key in self._by_market.get(canonical_market_id, ()))
+        return [
+            entry for entry in entries
+            if canonical_candidate_id is None or entry.canonical_candidate_id == canonical_candidate_id
+        ]
+
+    def flush(self) -> int:
+        """Write new and changed entries. Returns the number written."""
+        if not self._pending:
+            return 0
+        written = self.storage.upsert_registry_entries(list(self._pending.values()))
+        self._pending.clear()
+        return written
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Upgrade a SQLite election odds database to the current storage schema.
+
+v1 -> v2 moves the price_snapshots table (TEXT source/market_id/
+contract_id/snapshot_time on every row) into price_points, keyed by
+contracts.id and epoch time (sub-second precision kept), with raw_data
+split out into price_raw. price_snapshots becomes a read-only view with
+the v1 columns. Snapshots whose contract row is missing get a placeholder
+contract. Snapshots of one contract with an identical snapshot_time
+collapse to the latest row; the number collapsed is reported.
+
+v2 -> v3 adds price_points.last_seen, so one row can stand for a run of
+unchanged observations (change-only ingest). --compact folds existing
+runs of repeated values the same way.
+
+The upgrade runs in a single transaction, so an interrupted run leaves
+the database at its old version.
+
+Usage:
+    python migrate_storage.py                    # data/election_odds.db
+    python migrate_storage.py --db path/to.db
+    python migrate_storage.py --backup           # Copy to <db>.v<N>.bak first
+    python migrate_storage.py --compact          # Also fold unchanged runs
+    python migrate_storage.py --no-vacuum        # Skip reclaiming space
+"""
+
+import argparse
+import logging
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Dict
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.storage import DEFAULT_DB_PATH, PRICE_SCHEMA, SCHEMA_VERSION, Storage, to_epoch
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s] %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    """Schema version of an open database (0 = empty, 1 = pre-versioning)."""
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version:
+        return version
+    v1_table = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'price_snapshots'"
+    ).fetchone()
+    return 1 if v1_table else 0
+
+
+def migrate_v1(conn: sqlite3.Connection) -> Dict[str, int]:
+    """
+    Move v1 price_snapshots into the current price tables (so v1 goes
+    straight to SCHEMA_VERSION). Caller owns the transaction.
+    """
+    stats = {}
+    cursor = conn.cursor()
+    cursor.execute("ALTER TABLE price_snapshots RENAME TO price_snapshots_v1")
+    stats['v1_snapshots'] = cursor.execute("SELECT COUNT(*) FROM price_snapshots_v1").fetchone()[0]
+
+    for statement in PRICE_SCHEMA:
+        cursor.execute(statement)
+
+    cursor.execute("""
+        INSERT INTO contracts (source, market_id, contract_id, contract_name, created_at, updated_at)
+        SELECT ps.source, ps.market_id, ps.contract_id, ps.contract_id,
+               MIN(ps.created_at), MIN(ps.created_at)
+        FROM price_snapshots_v1 ps
+        LEFT JOIN contracts c ON c.source = ps.source AND c.market_id = ps.market_id
+            AND c.contract_id = ps.contract_id
+        WHERE c.id IS NULL
+        GROUP BY ps.source, ps.market_id, ps.contract_id
+    """)
+    stats['placeholder_contracts'] = cursor.rowcount
+
+    # Duplicate (contract, snapshot_time) rows: the later v1 row wins
+    cursor.execute("""
+        INSERT OR REPLACE INTO price_points (contract_ref, ts, yes_price, no_price,
+                                             yes_bid, yes_ask, volume)
+        SELECT c.id, to_epoch(ps.snapshot_time), ps.yes_price, ps.no_price,
+               ps.yes_bid, ps.yes_ask, ps.volume
+        FROM price_snapshots_v1 ps
+        JOIN contracts c ON c.source = ps.source AND c.market_id = ps.market_id
+            AND c.contract_id = ps.contract_id
+        ORDER BY ps.id
+    """)
+    stats['price_points'] = cursor.execute("SELECT COUNT(*) FROM price_points").fetchone()[0]
+    stats['duplicate_snapshots'] = stats['v1_snapshots'] - stats['price_points']
+    if stats['duplicate_snapshots']:
+        logger.warning(f"{stats['duplicate_snapshots']:,} v1 snapshots share a contract and "
+                       "snapshot_time with a later row and were replaced by it")
+
+    cursor.execute("""
+        INSERT OR REPLACE INTO price_raw (contract_ref, ts, raw_data)
+        SELECT c.id, to_epoch(ps.snapshot_time), ps.raw_data
+        FROM price_snapshots_v1 ps
+        JOIN contracts c ON c.source = ps.source AND c.market_id = ps.market_id
+            AND c.contract_id = ps.contract_id
+        WHERE ps.raw_data IS NOT NULL
+        ORDER BY ps.id
+    """)
+    stats['price_raw'] = cursor.execute("SELECT COUNT(*) FROM price_raw").fetchone()[0]
+
+    cursor.execute("DROP TABLE price_snapshots_v1")
+    return stats
+
+
+def migrate_v2_to_v3(conn: sqlite3.Connection) -> Dict[str, int]:
+    """Add price_points.last_seen and rebuild the view. Caller owns the transaction."""
+    cursor = conn.cursor()
+    cursor.execute("ALTER TABLE price_points ADD COLUMN last_seen INTEGER")
+    cursor.execute("DROP VIEW IF EXISTS price_snapshots")
+    for statement in PRICE_SCHEMA:
+        cursor.execute(statement)
+    return {'price_points': cursor.execute("SELECT COUNT(*) FROM price_points").fetchone()[0]}
+
+
+def migrate(db_path: Path, backup: bool = False, vacuum: bool = True,
+            compact: bool = False) -> Dict[str, int]:
+    """Upgrade db_path in place to SCHEMA_VERSION. Returns migration statistics."""
+    conn = sqlite3.connect(str(db_path), isolation_level=None)
+    conn.create_function('to_epoch', 1, to_epoch, deterministic=True)
+    stats: Dict[str, int] = {}
+    try:
+        version = schema_version(conn)
+        stats['from_version'] = version
+        if version == 0 or (version >= SCHEMA_VERSION and not compact):
+            logger.info(f"{db_path} is at schema v{version}; nothing to migrate")
+            return stats
+
+        if backup:
+            backup_path = db_path.with_name(db_path.name + f'.v{version}.bak')
+            logger.info(f"Backing up to {backup_path}")
+            with sqlite3.connect(str(backup_path)) as target:
+                conn.backup(target)
+
+        size_before = db_path.stat().st_size
+        if version < SCHEMA_VERSION:
+            logger.info(f"Migrating {db_path} from schema v{version} to v{SCHEMA_VERSION}")
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                stats.update(migrate_v1(conn) if version == 1 else migrate_v2_to_v3(conn))
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        # Also lets Storage create anything else the current schema expects
+        storage = Storage(str(db_path))
+        try:
+            if compact:
+                logger.info("Folding unchanged price points into runs")
+                stats['compacted'] = storage.compact_price_points()
+        finally:
+            storage.close()
+
+        if vacuum:
+            logger.info("Reclaiming free pages (VACUUM)")
+            conn.execute("VACUUM")
+            # In WAL mode the rewritten pages reach the main file at a checkpoint
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        stats['bytes_before'] = size_before
+        stats['bytes_after'] = db_path.stat().st_size
+    finally:
+        conn.close()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Upgrade the SQLite storage schema')
+    parser.add_argument('--db', type=str, default=None,
+                        help='Database path (default: data/election_odds.db)')
+    parser.add_argument('--backup', action='store_true',
+                        help='Copy the database to <db>.v<N>.bak before migrating')
+    parser.add_argument('--no-vacuum', action='store_true',
+                        help='Skip VACUUM after migrating (file keeps its old size)')
+    parser.add_argument('--compact', action='store_true',
+                        help='Fold runs of unchanged price points (as change-only ingest stores them)')
+    args = parser.parse_args()
+
+    db_path = Path(args.db) if args.db else DEFAULT_DB_PATH
+    if not db_path.exists():
+        parser.error(f"{db_path} does not exist")
+
+    stats = migrate(db_path, backup=args.backup, vacuum=not args.no_vacuum,
+                    compact=args.compact)
+    if 'bytes_after' not in stats:
+        return
+
+    print(f"\nMigration Summary:")
+    if 'v1_snapshots' in stats:
+        print(f"  v1 snapshots: {stats['v1_snapshots']:,}")
+        print(f"  Raw payloads: {stats['price_raw']:,}")
+        print(f"  Placeholder contracts: {stats['placeholder_contracts']:,}")
+        print(f"  Duplicate snapshots replaced: {stats['duplicate_snapshots']:,}")
+    if 'price_points' in stats:
+        print(f"  Price points: {stats['price_points']:,}")
+    if 'compacted' in stats:
+        print(f"  Points folded into runs: {stats['compacted']:,}")
+    print(f"  File size: {stats['bytes_before']:,} -> {stats['bytes_after']:,} bytes")
+
+
+if __name__ == '__main__':
+    main()
@@ -267,18 +267,18 @@ def show_status(storage: Storage):
         cursor = conn.cursor()
 
         # Get data density per source for recent data
+        now = int(time.time())
         cursor.execute("""
             SELECT
-                source,
+                c.source,
                 COUNT(*) as total_snapshots,
-                COUNT(DISTINCT SUBSTR(snapshot_time, 1, 16)) as unique_timestamps,
-                MIN(snapshot_time) as earliest,
-                MAX(snapshot_time) as latest
-            FROM price_snapshots
-            WHERE snapshot_time >= datetime('now', '-1 day')
-            GROUP BY source
-            ORDER BY source
-        """)
+                COUNT(DISTINCT p.ts / 60) as unique_timestamps
+            FROM price_points p
+            JOIN contracts c ON c.id = p.contract_ref
+            WHERE p.ts >= ?
+            GROUP BY c.source
+            ORDER BY c.source
+        """, (now - 86400,))
 
         print("\nLast 24 hours:")
         for row in cursor.fetchall():
@@ -287,15 +287,16 @@ def show_status(storage: Storage):
         # Get hourly breakdown for today
         cursor.execute("""
             SELECT
-                SUBSTR(snapshot_time, 1, 13) as hour,
-                COUNT(DISTINCT source) as sources,
+                strftime('%Y-%m-%dT%H', p.ts, 'unixepoch') as hour,
+                COUNT(DISTINCT c.source) as sources,
                 COUNT(*) as records
-            FROM price_snapshots
-            WHERE snapshot_time >= datetime('now', '-12 hours')
+            FROM price_points p
+            JOIN contracts c ON c.id = p.contract_ref
+            WHERE p.ts >= ?
             GROUP BY hour
             ORDER BY hour DESC
             LIMIT 12
-        """)
+        """, (now - 12 * 3600,))
 
         print("\nLast 12 hours (hourly):")
         for row in cursor.fetchall():
@@ -335,16 +336,19 @@ def main():
 
     storage = Storage(args.db)
 
-    if args.status:
-        show_status(storage)
-        return
-
-    if args.continuous:
-        asyncio.run(run_continuous(storage, args.interval))
-    else:
-        stats = asyncio.run(sync_all(storage))
-        print(f"\nSync complete: {stats}")
-        show_status(storage)
+    try:
+        if args.status:
+            show_status(storage)
+            return
+
+        if args.continuous:
+            asyncio.run(run_continuous(storage, args.interval))
+        else:
+            stats = asyncio.run(sync_all(storage))
+            print(f"\nSync complete: {stats}")
+            show_status(storage)
+    finally:
+        storage.close()
 
 
 if __name__ == '__main__':
@@ -6,42 +6,194 @@ Provides idempotent upsert operations using provider record IDs as unique keys.
 import sqlite3
 import json
 import os
+import threading
 from datetime import datetime, timezone
-from typing import List, Dict, Optional, Tuple
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 from pathlib import Path
 from contextlib import contextmanager
 
 # Default database path
 DEFAULT_DB_PATH = Path(__file__).parent.parent / "data" / "election_odds.db"
 
+# PRAGMA user_version of the current schema. v1 stored one price_snapshots
+# row per point with TEXT source/market_id/contract_id/snapshot_time keys;
+# v2 keys points by contracts.id and epoch time; v3 adds last_seen so a
+# point can stand for a run of unchanged observations. See migrate_storage.py.
+SCHEMA_VERSION = 3
+
+
+def to_epoch(value) -> Union[int, float]:
+    """
+    Epoch seconds for an ISO-8601 string, datetime or number (naive means
+    UTC). Sub-second times stay fractional (stored as REAL), so snapshots
+    taken within the same second keep distinct keys.
+    """
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    ts = value.timestamp()
+    return int(ts) if ts.is_integer() else ts
+
+
+def from_epoch(ts: Optional[float]) -> Optional[str]:
+    """ISO-8601 UTC string for epoch seconds, in the v1 snapshot_time format."""
+    if ts is None:
+        return None
+    return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
+
+
+# Price tables of the v2 schema (also run by migrate_storage.py)
+PRICE_SCHEMA = (
+    # Hot time series: one narrow row per contract and observation time
+    # (INTEGER affinity; sub-second times are kept as REAL). A row holds
+    # the values observed from ts through last_seen (NULL: only at ts)
+    """
+    CREATE TABLE IF NOT EXISTS price_points (
+        contract_ref INTEGER NOT NULL REFERENCES contracts(id),
+        ts INTEGER NOT NULL,
+        yes_price REAL,
+        no_price REAL,
+        yes_bid REAL,
+        yes_ask REAL,
+        volume REAL,
+        last_seen INTEGER,
+        PRIMARY KEY (contract_ref, ts)
+    ) WITHOUT ROWID
+    """,
+    # Provider payloads, kept off the rows that range scans read
+    """
+    CREATE TABLE IF NOT EXISTS price_raw (
+        contract_ref INTEGER NOT NULL,
+        ts INTEGER NOT NULL,
+        raw_data TEXT NOT NULL,
+        PRIMARY KEY (contract_ref, ts)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_price_points_ts ON price_points(ts)",
+    # v1-shaped read view, for reports and ad-hoc queries
+    """
+    CREATE VIEW IF NOT EXISTS price_snapshots AS
+    SELECT c.source, c.market_id, c.contract_id,
+           strftime('%Y-%m-%dT%H:%M:%S+00:00', p.ts, 'unixepoch') AS snapshot_time,
+           p.yes_price, p.no_price, p.yes_bid, p.yes_ask, p.volume, r.raw_data,
+           strftime('%Y-%m-%dT%H:%M:%S+00:00', COALESCE(p.last_seen, p.ts), 'unixepoch') AS last_seen,
+           p.contract_ref, p.ts
+    FROM price_points p
+    JOIN contracts c ON c.id = p.contract_ref
+    LEFT JOIN price_raw r ON r.contract_ref = p.contract_ref AND r.ts = p.ts
+    """,
+)
+
 
 class Storage:
     """SQLite storage with idempotent upsert support."""
 
-    def __init__(self, db_path: Optional[str] = None):
+    # Applied to every connection; override per instance with pragmas={...}
+    DEFAULT_PRAGMAS = {
+        'synchronous': 'NORMAL',  # With WAL, durable at checkpoints instead of per commit
+        'cache_size': -65536,     # KiB when negative: 64 MiB page cache
+        'mmap_size': 268435456,   # 256 MiB of the file memory-mapped for reads
+        'temp_store': 'MEMORY',
+    }
+
+    def __init__(self, db_path: Optional[str] = None, pragmas: Optional[Dict[str, object]] = None,
+                 wal: bool = True):
+        """
+        Args:
+            db_path: SQLite file (default: data/election_odds.db)
+            pragmas: PRAGMA name -> value, merged over DEFAULT_PRAGMAS
+            wal: Use write-ahead logging (readers don't block the writer)
+        """
         self.db_path = Path(db_path) if db_path else DEFAULT_DB_PATH
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.pragmas = {**self.DEFAULT_PRAGMAS, **(pragmas or {})}
+        self.wal = wal
+
+        # One long-lived connection per thread; all of them, for close()
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+
         self._init_schema()
 
+    def _connect(self) -> sqlite3.Connection:
+        # check_same_thread is off only so close() can run from another
+        # thread; each connection is otherwise used by the thread that made it
+        conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        if self.wal:
+            conn.execute("PRAGMA journal_mode = WAL")
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        with self._connections_lock:
+            self._connections.append(conn)
+        return conn
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """This thread's connection, opened on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+            self._local.depth = 0
+        return conn
+
     @contextmanager
     def _get_connection(self):
-        """Context manager for database connections."""
-        conn = sqlite3.connect(str(self.db_path))
-        conn.row_factory = sqlite3.Row
+        """
+        Context manager for a transaction on this thread's connection.
+
+        Commits when the outermost block exits and rolls back on error;
+        nested blocks join the enclosing transaction. The connection stays
+        open until close().
+        """
+        conn = self.conn
+        self._local.depth += 1
         try:
             yield conn
-            conn.commit()
+            if self._local.depth == 1:
+                conn.commit()
         except Exception:
-            conn.rollback()
+            if self._local.depth == 1:
+                conn.rollback()
             raise
         finally:
+            self._local.depth -= 1
+
+    def close(self):
+        """Close every thread's connection. The next call reopens lazily."""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
             conn.close()
+        self._local = threading.local()
+
+    def __enter__(self) -> 'Storage':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
 
     def _init_schema(self):
         """Initialize database schema."""
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
+            version = cursor.execute("PRAGMA user_version").fetchone()[0]
+            if not version and cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'price_snapshots'"
+            ).fetchone():
+                version = 1
+            if 0 < version < SCHEMA_VERSION:
+                raise RuntimeError(
+                    f"{self.db_path} uses storage schema v{version}; "
+                    f"run scripts/migrate_storage.py to upgrade it to v{SCHEMA_VERSION}"
+                )
+
             # Markets table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS markets (
@@ -75,25 +227,6 @@ class Storage:
                 )
             """)
 
-            # Price snapshots table (time-series data)
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS price_snapshots (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    source TEXT NOT NULL,
-                    market_id TEXT NOT NULL,
-                    contract_id TEXT NOT NULL,
-                    snapshot_time TEXT NOT NULL,
-                    yes_price REAL,
-                    no_price REAL,
-                    yes_bid REAL,
-                    yes_ask REAL,
-                    volume REAL,
-                    raw_data TEXT,
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(source, market_id, contract_id, snapshot_time)
-                )
-            """)
-
             # Sync checkpoints table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS sync_checkpoints (
@@ -115,20 +248,44 @@ class Storage:
                 )
             """)
 
+            # Cross-source entity registry (see scripts/entity_registry.py)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS entity_registry (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    source TEXT NOT NULL,
+                    market_id TEXT NOT NULL,
+                    contract_id TEXT NOT NULL,
+                    market_name TEXT,
+                    contract_name TEXT,
+                    canonical_market_id TEXT,
+                    canonical_candidate_id TEXT,
+                    manual INTEGER NOT NULL DEFAULT 0,
+                    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE(source, market_id, contract_id)
+                )
+            """)
+
+            # Price points, raw payloads and the price_snapshots view
+            for statement in PRICE_SCHEMA:
+                cursor.execute(statement)
+
             # Create indexes for faster queries
             cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_price_snapshots_time
-                ON price_snapshots(snapshot_time)
+                CREATE INDEX IF NOT EXISTS idx_sync_checkpoints_source
+                ON sync_checkpoints(source, sync_type, status)
             """)
             cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_price_snapshots_source_market
-                ON price_snapshots(source, market_id)
+                CREATE INDEX IF NOT EXISTS idx_entity_registry_canonical
+                ON entity_registry(canonical_market_id, canonical_candidate_id)
             """)
             cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_sync_checkpoints_source
-                ON sync_checkpoints(source, sync_type, status)
+                CREATE INDEX IF NOT EXISTS idx_entity_registry_candidate
+                ON entity_registry(canonical_candidate_id)
             """)
 
+            cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
     def upsert_market(self, source: str, market_id: str, market_name: str,
                       category: str = None, status: str = None, url: str = None,
                       total_volume: float = None, end_date: str = None) -> Tuple[int, bool]:
@@ -198,40 +355,333 @@ class Storage:
                               snapshot_time: str, yes_price: float = None,
                               no_price: float = None, yes_bid: float = None,
                               yes_ask: float = None, volume: float = None,
-                              raw_data: dict = None) -> Tuple[int, bool]:
+                              raw_data: dict = None, change_only: bool = False) -> Tuple[int, bool]:
+        """
+        Upsert a price snapshot. Returns (contract_ref, was_inserted).
+        Uses (contract, snapshot_time) as unique key.
+        See bulk_upsert_price_snapshots for change_only.
+        """
+        with self._get_connection() as conn:
+            key = (source, market_id, contract_id)
+            contract_ref = self._contract_refs(conn, [key])[key]
+            counts = self.bulk_upsert_price_snapshots([(
+                source, market_id, contract_id, snapshot_time,
+                yes_price, no_price, yes_bid, yes_ask, volume, raw_data
+            )], change_only=change_only)
+            return contract_ref, counts['inserted'] == 1
+
+    # Column order of the tuples accepted by the bulk_upsert_* methods
+    MARKET_COLUMNS = ('source', 'market_id', 'market_name', 'category', 'status',
+                      'url', 'total_volume', 'end_date')
+    CONTRACT_COLUMNS = ('source', 'market_id', 'contract_id', 'contract_name', 'short_name')
+    SNAPSHOT_COLUMNS = ('source', 'market_id', 'contract_id', 'snapshot_time',
+                        'yes_price', 'no_price', 'yes_bid', 'yes_ask', 'volume', 'raw_data')
+
+    # Stored columns of the v2 price tables
+    POINT_COLUMNS = ('contract_ref', 'ts', 'yes_price', 'no_price', 'yes_bid', 'yes_ask',
+                     'volume', 'last_seen')
+    RAW_COLUMNS = ('contract_ref', 'ts', 'raw_data')
+
+    # Change-only ingest: an unchanged point is still rewritten once it is
+    # HEARTBEAT_SECONDS old (so every day has a row per observed contract),
+    # and a silence longer than MAX_GAP_SECONDS ends the run (a gap in the
+    # data, not an unchanged price)
+    HEARTBEAT_SECONDS = 24 * 3600
+    MAX_GAP_SECONDS = 12 * 3600
+
+    # On conflict, a price point's run only ever grows
+    LAST_SEEN_MERGE = 'MAX(COALESCE(price_points.last_seen, price_points.ts), excluded.last_seen)'
+
+    # Rows per INSERT statement in bulk upserts (stays far below SQLite's
+    # bound-parameter limit for every table)
+    BULK_CHUNK_ROWS = 500
+
+    def _bulk_upsert(self, table: str, columns: Tuple[str, ...], key: Tuple[str, ...],
+                     rows: Iterable, stamps: Tuple[str, ...] = ('created_at', 'updated_at'),
+                     merge: Optional[Dict[str, str]] = None) -> Dict[str, int]:
+        """
+        INSERT ... ON CONFLICT(key) DO UPDATE over rows, BULK_CHUNK_ROWS per
+        statement, in one transaction. Rows are tuples in `columns` order or
+        dicts (missing keys are NULL). `stamps` columns are set to now
+        (created_at only on insert). `merge` maps a column to the SQL
+        expression it is updated with on conflict (default: excluded.<col>).
+        Returns {'inserted': n, 'updated': m}.
+        """
+        now = datetime.now(timezone.utc).isoformat()
+        insert_columns = columns + stamps
+        merge = merge or {}
+        assignments = [f"{c} = {merge.get(c, f'excluded.{c}')}" for c in columns + stamps
+                       if c not in key and c != 'created_at']
+        update = f"DO UPDATE SET {', '.join(assignments)}" if assignments else "DO NOTHING"
+        row_sql = f"({', '.join('?' * len(insert_columns))})"
+        key_sql = f"({', '.join('?' * len(key))})"
+        key_index = [columns.index(c) for c in key]
+
+        counts = {'inserted': 0, 'updated': 0}
+        rows = iter(rows)
+        with self._get_connection() as conn:
+            while True:
+                chunk: Dict[Tuple, Tuple] = {}
+                for row in islice(rows, self.BULK_CHUNK_ROWS):
+                    if isinstance(row, dict):
+                        row = tuple(row.get(c) for c in columns)
+                    # One statement may touch a key only once; the last row wins
+                    chunk[tuple(row[i] for i in key_index)] = tuple(row) + (now,) * len(stamps)
+                if not chunk:
+                    break
+
+                # A join (unlike a row-value IN) probes the key index per row
+                existing = conn.execute(f"""
+                    SELECT COUNT(*) FROM (VALUES {', '.join([key_sql] * len(chunk))}) AS k
+                    JOIN {table} t ON {' AND '.join(f't.{c} = k.column{i}' for i, c in enumerate(key, 1))}
+                """, [value for k in chunk for value in k]).fetchone()[0]
+                conn.execute(f"""
+                    INSERT INTO {table} ({', '.join(insert_columns)})
+                    VALUES {', '.join([row_sql] * len(chunk))}
+                    ON CONFLICT({', '.join(key)}) {update}
+                """, [value for row in chunk.values() for value in row])
+                counts['inserted'] += len(chunk) - existing
+                counts['updated'] += existing
+        return counts
+
+    def _contract_refs(self, conn: sqlite3.Connection,
+                       keys: Iterable[Tuple[str, str, str]]) -> Dict[Tuple[str, str, str], int]:
+        """
+        contracts.id for each (source, market_id, contract_id), creating a
+        placeholder contract (named after its id) for keys not seen before.
+        Call inside an open transaction; keys must fit one statement.
+        """
+        keys = list(set(keys))
+        if not keys:
+            return {}
+        cursor = conn.execute(f"""
+            SELECT c.id, c.source, c.market_id, c.contract_id
+            FROM (VALUES {', '.join(['(?, ?, ?)'] * len(keys))}) AS k
+            JOIN contracts c ON c.source = k.column1 AND c.market_id = k.column2
+                AND c.contract_id = k.column3
+        """, [value for key in keys for value in key])
+        refs = {(row['source'], row['market_id'], row['contract_id']): row['id']
+                for row in cursor.fetchall()}
+
+        missing = [key for key in keys if key not in refs]
+        if missing:
+            now = datetime.now(timezone.utc).isoformat()
+            cursor = conn.execute(f"""
+                INSERT INTO contracts (source, market_id, contract_id, contract_name,
+                                       created_at, updated_at)
+                VALUES {', '.join(['(?, ?, ?, ?, ?, ?)'] * len(missing))}
+                RETURNING id, source, market_id, contract_id
+            """, [value for key in missing for value in key + (key[2], now, now)])
+            refs.update(((row['source'], row['market_id'], row['contract_id']), row['id'])
+                        for row in cursor.fetchall())
+        return refs
+
+    def bulk_upsert_markets(self, rows: Iterable) -> Dict[str, int]:
+        """Upsert many markets (tuples in MARKET_COLUMNS order or dicts)."""
+        return self._bulk_upsert('markets', self.MARKET_COLUMNS, ('source', 'market_id'), rows)
+
+    def bulk_upsert_contracts(self, rows: Iterable) -> Dict[str, int]:
+        """Upsert many contracts (tuples in CONTRACT_COLUMNS order or dicts)."""
+        return self._bulk_upsert('contracts', self.CONTRACT_COLUMNS,
+                                 ('source', 'market_id', 'contract_id'), rows)
+
+    def bulk_upsert_price_snapshots(self, rows, change_only: bool = False,
+                                    heartbeat: Optional[int] = None,
+                                    max_gap: Optional[int] = None) -> Dict[str, int]:
+        """
+        Upsert many price snapshots: tuples in SNAPSHOT_COLUMNS order, dicts,
+        or a MarketBatch (every row at the batch's snapshot_time).
+        snapshot_time may be an ISO string, datetime or epoch seconds; raw_data
+        may be a dict, stored as JSON. An update without raw_data keeps the
+        stored payload.
+
+        With change_only, a snapshot whose values equal the contract's latest
+        point only moves that point's last_seen forward, unless the point is
+        `heartbeat` seconds old or the contract went unobserved for more than
+        `max_gap` seconds (defaults: HEARTBEAT_SECONDS, MAX_GAP_SECONDS).
+        Off by default: readers of the price_snapshots view (the web app)
+        still expect one row per observation.
+
+        Returns {'inserted': n, 'updated': m, 'unchanged': k}.
         """
-        Upsert a price snapshot. Returns (row_id, was_inserted).
-        Uses (source, market_id, contract_id, snapshot_time) as unique key.
+        if hasattr(rows, 'snapshot_rows'):
+            rows = (row + (None,) for row in rows.snapshot_rows())
+        # 0 is a valid setting (e.g. heartbeat=0 never extends a run)
+        if heartbeat is None:
+            heartbeat = self.HEARTBEAT_SECONDS
+        if max_gap is None:
+            max_gap = self.MAX_GAP_SECONDS
+
+        counts = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+        rows = iter(rows)
+        with self._get_connection() as conn:
+            while True:
+                chunk = [
+                    tuple(row.get(c) for c in self.SNAPSHOT_COLUMNS) if isinstance(row, dict) else row
+                    for row in islice(rows, self.BULK_CHUNK_ROWS)
+                ]
+                if not chunk:
+                    break
+
+                refs = self._contract_refs(conn, (row[:3] for row in chunk))
+                # contract_ref -> [ts, values, last_seen, index in points or None]
+                latest = self._latest_points(conn, set(refs.values())) if change_only else {}
+                points = []
+                raw = []
+                extended: Dict[Tuple[int, int], int] = {}
+                for row in chunk:
+                    contract_ref = refs[tuple(row[:3])]
+                    ts = to_epoch(row[3])
+                    values = tuple(row[4:9])
+
+                    run = latest.get(contract_ref)
+                    if (run is not None and run[0] <= ts and run[1] == values
+                            and ts - run[0] < heartbeat and ts - run[2] <= max_gap):
+                        run[2] = max(run[2], ts)
+                        if run[3] is None:
+                            extended[(contract_ref, run[0])] = run[2]
+                        else:
+                            points[run[3]] = points[run[3]][:-1] + (run[2],)
+                        counts['unchanged'] += 1
+                        continue
+
+                    # A late row (older than the run's last observation) is
+                    # stored but doesn't become the contract's latest point
+                    if change_only and (run is None or ts >= run[2]):
+                        latest[contract_ref] = [ts, values, ts, len(points)]
+                    points.append((contract_ref, ts) + values + (ts,))
+                    if row[9]:
+                        raw_json = row[9] if isinstance(row[9], str) else json.dumps(row[9], default=str)
+                        raw.append((contract_ref, ts, raw_json))
+
+                # Rewriting a point (e.g. a retried sync at its ts) must not
+                # shorten the run it already stands for
+                written = self._bulk_upsert('price_points', self.POINT_COLUMNS,
+                                            ('contract_ref', 'ts'), points, stamps=(),
+                                            merge={'last_seen': self.LAST_SEEN_MERGE})
+                counts['inserted'] += written['inserted']
+                counts['updated'] += written['updated']
+                if raw:
+                    self._bulk_upsert('price_raw', self.RAW_COLUMNS,
+                                      ('contract_ref', 'ts'), raw, stamps=())
+                if extended:
+                    conn.executemany("""
+                        UPDATE price_points SET last_seen = MAX(COALESCE(last_seen, ts), ?)
+                        WHERE contract_ref = ? AND ts = ?
+                    """, [(last_seen,) + key for key, last_seen in extended.items()])
+        return counts
+
+    def _latest_points(self, conn: sqlite3.Connection, contract_refs) -> Dict[int, list]:
+        """Latest stored point per contract: ref -> [ts, values, last_seen, None]."""
+        contract_refs = list(contract_refs)
+        if not contract_refs:
+            return {}
+        cursor = conn.execute(f"""
+            SELECT p.contract_ref, p.ts, p.yes_price, p.no_price, p.yes_bid, p.yes_ask,
+                   p.volume, COALESCE(p.last_seen, p.ts) AS last_seen
+            FROM (VALUES {', '.join(['(?)'] * len(contract_refs))}) AS k
+            JOIN price_points p ON p.contract_ref = k.column1
+                AND p.ts = (SELECT MAX(ts) FROM price_points WHERE contract_ref = k.column1)
+        """, contract_refs)
+        return {
+            row[0]: [row[1], tuple(row[2:7]), row[7], None]
+            for row in cursor.fetchall()
+        }
+
+    def insert_price_snapshots(self, batch) -> int:
+        """
+        Write every row of a MarketBatch as a price snapshot at the batch's
+        snapshot_time, in one transaction. Existing snapshots for the same
+        key are updated. Returns the number of rows written.
         """
-        raw_json = json.dumps(raw_data) if raw_data else None
+        counts = self.bulk_upsert_price_snapshots(batch)
+        return counts['inserted'] + counts['updated']
 
+    # Buffered rows per table before a batch() session writes them out
+    BATCH_FLUSH_ROWS = 5000
+
+    @contextmanager
+    def batch(self, flush_rows: Optional[int] = None, change_only: bool = False):
+        """
+        Unit of work: one transaction on this thread's connection for the
+        whole block. Rows added through the yielded StorageBatch are
+        buffered and written in chunks of at most flush_rows; any other
+        Storage call made inside the block (checkpoint updates, registry
+        writes) joins the same transaction. Commits once on exit, or rolls
+        back everything if the block raises. change_only is passed on to
+        bulk_upsert_price_snapshots.
+
+            with storage.batch() as tx:
+                tx.add_market(...)
+                tx.flush()
+                storage.update_sync_checkpoint(cp_id, status='completed', ...)
+        """
+        with self._get_connection():
+            tx = StorageBatch(self, flush_rows or self.BATCH_FLUSH_ROWS, change_only)
+            yield tx
+            tx.flush()
+
+    REGISTRY_COLUMNS = (
+        'source', 'market_id', 'contract_id', 'market_name', 'contract_name',
+        'canonical_market_id', 'canonical_candidate_id', 'manual',
+    )
+
+    def get_registry_entries(self, source: str = None) -> List[dict]:
+        """Get entity registry rows, optionally for one source."""
         with self._get_connection() as conn:
             cursor = conn.cursor()
+            query = f"SELECT {', '.join(self.REGISTRY_COLUMNS)} FROM entity_registry"
+            params = []
+            if source:
+                query += " WHERE source = ?"
+                params.append(source)
+            cursor.execute(query, params)
+            return [dict(row) for row in cursor.fetchall()]
 
-            cursor.execute("""
-                SELECT id FROM price_snapshots
-                WHERE source = ? AND market_id = ? AND contract_id = ? AND snapshot_time = ?
-            """, (source, market_id, contract_id, snapshot_time))
-            existing = cursor.fetchone()
+    def upsert_registry_entries(self, entries: List[Tuple]) -> int:
+        """
+        Insert or update registry rows, given as tuples in REGISTRY_COLUMNS
+        order (e.g. entity_registry.RegistryEntry). Rows marked manual are
+        left untouched. Returns the number of rows written.
+        """
+        now = datetime.now(timezone.utc).isoformat()
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany("""
+                INSERT INTO entity_registry (source, market_id, contract_id, market_name,
+                                             contract_name, canonical_market_id,
+                                             canonical_candidate_id, manual,
+                                             created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(source, market_id, contract_id) DO UPDATE SET
+                    market_name = excluded.market_name,
+                    contract_name = excluded.contract_name,
+                    canonical_market_id = excluded.canonical_market_id,
+                    canonical_candidate_id = excluded.canonical_candidate_id,
+                    updated_at = excluded.updated_at
+                WHERE NOT entity_registry.manual
+            """, (tuple(entry) + (now, now) for entry in entries))
+            return cursor.rowcount
+
+    def get_registry_by_canonical(self, canonical_market_id: str = None,
+                                  canonical_candidate_id: str = None) -> List[dict]:
+        """Registry rows across all sources for a canonical market and/or candidate."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
 
-            if existing:
-                cursor.execute("""
-                    UPDATE price_snapshots SET
-                        yes_price = ?, no_price = ?, yes_bid = ?, yes_ask = ?,
-                        volume = ?, raw_data = ?
-                    WHERE source = ? AND market_id = ? AND contract_id = ? AND snapshot_time = ?
-                """, (yes_price, no_price, yes_bid, yes_ask, volume, raw_json,
-                      source, market_id, contract_id, snapshot_time))
-                return existing['id'], False
-            else:
-                cursor.execute("""
-                    INSERT INTO price_snapshots (source, market_id, contract_id, snapshot_time,
-                                                yes_price, no_price, yes_bid, yes_ask,
-                                                volume, raw_data, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (source, market_id, contract_id, snapshot_time, yes_price, no_price,
-                      yes_bid, yes_ask, volume, raw_json, datetime.now(timezone.utc).isoformat()))
-                return cursor.lastrowid, True
+            query = f"SELECT {', '.join(self.REGISTRY_COLUMNS)} FROM entity_registry WHERE 1=1"
+            params = []
+
+            if canonical_market_id:
+                query += " AND canonical_market_id = ?"
+                params.append(canonical_market_id)
+            if canonical_candidate_id:
+                query += " AND canonical_candidate_id = ?"
+                params.append(canonical_candidate_id)
+
+            query += " ORDER BY canonical_market_id, canonical_candidate_id, source"
+            cursor.execute(query, params)
+            return [dict(row) for row in cursor.fetchall()]
 
     def create_sync_checkpoint(self, source: str, sync_type: str,
                                window_start: str, window_end: str) -> int:
@@ -378,34 +828,147 @@ class Storage:
     def get_price_history(self, source: str = None, market_id: str = None,
                           contract_id: str = None, start_date: str = None,
                           end_date: str = None, limit: int = 1000) -> List[dict]:
-        """Get price history with optional filters."""
+        """
+        Get price history with optional filters, newest first. A stored run
+        of unchanged observations comes back as two rows with the same
+        values, at its first and last observation (clipped to the range).
+        """
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
-            query = "SELECT * FROM price_snapshots WHERE 1=1"
+            query = """
+                SELECT c.source, c.market_id, c.contract_id, p.yes_price, p.no_price,
+                       p.yes_bid, p.yes_ask, p.volume, r.raw_data,
+                       p.ts, COALESCE(p.last_seen, p.ts) AS last_seen
+                FROM price_points p
+                JOIN contracts c ON c.id = p.contract_ref
+                LEFT JOIN price_raw r ON r.contract_ref = p.contract_ref AND r.ts = p.ts
+                WHERE 1=1
+            """
             params = []
 
             if source:
-                query += " AND source = ?"
+                query += " AND c.source = ?"
                 params.append(source)
             if market_id:
-                query += " AND market_id = ?"
+                query += " AND c.market_id = ?"
                 params.append(market_id)
             if contract_id:
-                query += " AND contract_id = ?"
+                query += " AND c.contract_id = ?"
                 params.append(contract_id)
-            if start_date:
-                query += " AND snapshot_time >= ?"
-                params.append(start_date)
-            if end_date:
-                query += " AND snapshot_time <= ?"
-                params.append(end_date)
-
-            query += " ORDER BY snapshot_time DESC LIMIT ?"
+            start = to_epoch(start_date) if start_date else None
+            end = to_epoch(end_date) if end_date else None
+            if start is not None:
+                query += " AND COALESCE(p.last_seen, p.ts) >= ?"
+                params.append(start)
+            if end is not None:
+                query += " AND p.ts <= ?"
+                params.append(end)
+
+            # The `limit` runs ending last hold the `limit` newest rows
+            query += " ORDER BY last_seen DESC LIMIT ?"
             params.append(limit)
 
             cursor.execute(query, params)
-            return [dict(row) for row in cursor.fetchall()]
+            history = []
+            for row in cursor.fetchall():
+                row = dict(row)
+                first, last = row.pop('ts'), row.pop('last_seen')
+                if start is not None:
+                    first = max(first, start)
+                if end is not None:
+                    last = min(last, end)
+                history.append((first, {**row, 'snapshot_time': from_epoch(first)}))
+                if last > first:
+                    # raw_data belongs to the first observation only
+                    history.append((last, {**row, 'snapshot_time': from_epoch(last), 'raw_data': None}))
+
+            history.sort(key=lambda item: item[0], reverse=True)
+            return [row for _, row in history[:limit]]
+
+    def get_price_series(self, source: str, market_id: str, contract_id: str,
+                         start_date: str, end_date: str, step: int = 3600,
+                         max_gap: Optional[int] = None) -> List[dict]:
+        """
+        Dense series for one contract: the values in effect every `step`
+        seconds from start_date to end_date. A time more than max_gap
+        seconds (default MAX_GAP_SECONDS) after the last observation is a
+        gap, returned with None values.
+        """
+        max_gap = self.MAX_GAP_SECONDS if max_gap is None else max_gap
+        start = int(to_epoch(start_date))
+        end = int(to_epoch(end_date))
+        columns = ('yes_price', 'no_price', 'yes_bid', 'yes_ask', 'volume')
+
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT p.ts, COALESCE(p.last_seen, p.ts) AS last_seen, {', '.join('p.' + c for c in columns)}
+                FROM contracts c
+                JOIN price_points p ON p.contract_ref = c.id
+                WHERE c.source = ? AND c.market_id = ? AND c.contract_id = ?
+                    AND p.ts <= ? AND COALESCE(p.last_seen, p.ts) >= ?
+                ORDER BY p.ts
+            """, (source, market_id, contract_id, end, start - max_gap))
+            runs = cursor.fetchall()
+
+        series = []
+        run = -1
+        for ts in range(start, end + 1, step):
+            # Last run that started at or before ts
+            while run + 1 < len(runs) and runs[run + 1]['ts'] <= ts:
+                run += 1
+            covered = run >= 0 and ts <= runs[run]['last_seen'] + max_gap
+            point = {'snapshot_time': from_epoch(ts)}
+            for c in columns:
+                point[c] = runs[run][c] if covered else None
+            series.append(point)
+        return series
+
+    def compact_price_points(self, heartbeat: Optional[int] = None,
+                             max_gap: Optional[int] = None) -> int:
+        """
+        Fold stored points that repeat their predecessor's values into it
+        (extending its last_seen), as change-only ingest would have stored
+        them. Returns the number of rows removed.
+        """
+        # 0 is a valid setting (e.g. heartbeat=0 never extends a run)
+        if heartbeat is None:
+            heartbeat = self.HEARTBEAT_SECONDS
+        if max_gap is None:
+            max_gap = self.MAX_GAP_SECONDS
+        removed = 0
+        with self._get_connection() as conn:
+            refs = [row[0] for row in conn.execute("SELECT DISTINCT contract_ref FROM price_points")]
+            for contract_ref in refs:
+                deletes = []
+                extended = []
+                run = None
+                for row in conn.execute("""
+                    SELECT ts, yes_price, no_price, yes_bid, yes_ask, volume,
+                           COALESCE(last_seen, ts) AS last_seen
+                    FROM price_points WHERE contract_ref = ? ORDER BY ts
+                """, (contract_ref,)).fetchall():
+                    ts, values, last_seen = row[0], tuple(row[1:6]), row[6]
+                    if (run is not None and run[1] == values
+                            and ts - run[0] < heartbeat and ts - run[2] <= max_gap):
+                        run[2] = max(run[2], last_seen)
+                        run[3] = True
+                        deletes.append((contract_ref, ts))
+                        continue
+                    if run is not None and run[3]:
+                        extended.append((run[2], contract_ref, run[0]))
+                    # [first ts, values, last_seen, extended?]
+                    run = [ts, values, last_seen, False]
+                if run is not None and run[3]:
+                    extended.append((run[2], contract_ref, run[0]))
+
+                conn.executemany("UPDATE price_points SET last_seen = ? WHERE contract_ref = ? AND ts = ?",
+                                 extended)
+                for table in ('price_points', 'price_raw'):
+                    conn.executemany(f"DELETE FROM {table} WHERE contract_ref = ? AND ts = ?", deletes)
+                removed += len(deletes)
+        return removed
 
     def get_daily_counts(self, start_date: str, end_date: str,
                          source: str = None) -> List[dict]:
@@ -413,29 +976,43 @@ class Storage:
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
-            # Use SUBSTR to extract date part from ISO timestamp (handles timezone offset)
             query = """
                 SELECT
-                    SUBSTR(snapshot_time, 1, 10) as date,
-                    source,
+                    date(p.ts, 'unixepoch') as date,
+                    c.source,
                     COUNT(*) as record_count,
-                    COUNT(DISTINCT market_id) as market_count,
-                    COUNT(DISTINCT contract_id) as contract_count
-                FROM price_snapshots
-                WHERE SUBSTR(snapshot_time, 1, 10) >= ? AND SUBSTR(snapshot_time, 1, 10) <= ?
+                    COUNT(DISTINCT c.market_id) as market_count,
+                    COUNT(DISTINCT c.contract_id) as contract_count
+                FROM price_points p
+                JOIN contracts c ON c.id = p.contract_ref
+                WHERE p.ts >= ? AND p.ts < ?
             """
-            # Extract just the date part (YYYY-MM-DD) from input params
-            params = [start_date[:10], end_date[:10]]
+            # Whole UTC days from the date part (YYYY-MM-DD) of the inputs
+            params = [to_epoch(start_date[:10]), to_epoch(end_date[:10]) + 86400]
 
             if source:
-                query += " AND source = ?"
+                query += " AND c.source = ?"
                 params.append(source)
 
-            query += " GROUP BY SUBSTR(snapshot_time, 1, 10), source ORDER BY date, source"
+            query += " GROUP BY date, c.source ORDER BY date, c.source"
 
             cursor.execute(query, params)
             return [dict(row) for row in cursor.fetchall()]
 
+    def delete_source(self, source: str) -> Dict[str, int]:
+        """Delete every price point, contract, market and checkpoint of a source."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            deleted = {}
+            refs = "SELECT id FROM contracts WHERE source = ?"
+            for table in ('price_raw', 'price_points'):
+                cursor.execute(f"DELETE FROM {table} WHERE contract_ref IN ({refs})", (source,))
+                deleted[table] = cursor.rowcount
+            for table in ('contracts', 'markets', 'sync_checkpoints'):
+                cursor.execute(f"DELETE FROM {table} WHERE source = ?", (source,))
+                deleted[table] = cursor.rowcount
+            return deleted
+
     def get_stats(self) -> dict:
         """Get overall database statistics."""
         with self._get_connection() as conn:
@@ -449,19 +1026,18 @@ class Storage:
             cursor.execute("SELECT COUNT(*) as count FROM contracts")
             stats['total_contracts'] = cursor.fetchone()['count']
 
-            cursor.execute("SELECT COUNT(*) as count FROM price_snapshots")
+            cursor.execute("SELECT COUNT(*) as count FROM price_points")
             stats['total_snapshots'] = cursor.fetchone()['count']
 
-            cursor.execute("""
-                SELECT MIN(snapshot_time) as earliest, MAX(snapshot_time) as latest
-                FROM price_snapshots
-            """)
+            cursor.execute("SELECT MIN(ts) as earliest, MAX(ts) as latest FROM price_points")
             row = cursor.fetchone()
-            stats['earliest_snapshot'] = row['earliest']
-            stats['latest_snapshot'] = row['latest']
+            stats['earliest_snapshot'] = from_epoch(row['earliest'])
+            stats['latest_snapshot'] = from_epoch(row['latest'])
 
             cursor.execute("""
-                SELECT source, COUNT(*) as count FROM price_snapshots GROUP BY source
+                SELECT c.source, COUNT(*) as count
+                FROM price_points p JOIN contracts c ON c.id = p.contract_ref
+                GROUP BY c.source
             """)
             stats['snapshots_by_source'] = {row['source']: row['count'] for row in cursor.fetchall()}
 
@@ -473,6 +1049,53 @@ class Storage:
             return stats
 
 
+class StorageBatch:
+    """Write buffer for Storage.batch(); use only on the thread that opened it."""
+
+    def __init__(self, storage: Storage, flush_rows: int, change_only: bool = False):
+        self.storage = storage
+        self.flush_rows = flush_rows
+        self.change_only = change_only
+        self._buffers: Dict[str, List] = {'markets': [], 'contracts': [], 'price_snapshots': []}
+        # Table -> {'inserted': n, 'updated': m} over everything flushed so far
+        # (snapshots also count 'unchanged')
+        self.counts = {table: {'inserted': 0, 'updated': 0} for table in self._buffers}
+        self.counts['price_snapshots']['unchanged'] = 0
+
+    def _add(self, table: str, row):
+        buffer = self._buffers[table]
+        buffer.append(row)
+        if len(buffer) >= self.flush_rows:
+            self.flush()
+
+    def add_market(self, row):
+        """Buffer a market (tuple in Storage.MARKET_COLUMNS order, or dict)."""
+        self._add('markets', row)
+
+    def add_contract(self, row):
+        """Buffer a contract (tuple in Storage.CONTRACT_COLUMNS order, or dict)."""
+        self._add('contracts', row)
+
+    def add_snapshot(self, row):
+        """Buffer a price snapshot (tuple in Storage.SNAPSHOT_COLUMNS order, or dict)."""
+        self._add('price_snapshots', row)
+
+    def flush(self):
+        """Write every buffered row into the open transaction (no commit)."""
+        writers = {
+            'markets': self.storage.bulk_upsert_markets,
+            'contracts': self.storage.bulk_upsert_contracts,
+            'price_snapshots': lambda rows: self.storage.bulk_upsert_price_snapshots(
+                rows, change_only=self.change_only),
+        }
+        # Parents first, so a snapshot never lands without its market/contract
+        for table, write in writers.items():
+            rows, self._buffers[table] = self._buffers[table], []
+            if rows:
+                for name, count in write(rows).items():
+                    self.counts[table][name] += count
+
+
 if __name__ == "__main__":
     # Test the storage
     storage = Storage()
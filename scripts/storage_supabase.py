@@ -8,11 +8,9 @@ PostgreSQL (Supabase) instead of SQLite.
 import os
 import logging
 from datetime import datetime
+from pathlib import Path
 from typing import Optional, Set, Tuple, List, Dict, Any
 
-import psycopg2
-from psycopg2.extras import execute_values
-
 logger = logging.getLogger(__name__)
 
 
@@ -31,6 +29,9 @@ class SupabaseStorage:
     def conn(self):
         """Lazy connection initialization."""
         if self._conn is None or self._conn.closed:
+            # Imported here so --help and argument errors don't pay for libpq
+            import psycopg2
+
             self._conn = psycopg2.connect(self.database_url)
             self._conn.autocommit = True
         return self._conn
@@ -130,6 +131,8 @@ class SupabaseStorage:
         if not snapshots:
             return 0
 
+        from psycopg2.extras import execute_values
+
         with self.conn.cursor() as cur:
             # Prepare data
             values = [
@@ -152,6 +155,74 @@ class SupabaseStorage:
 
             return len(values)
 
+    REGISTRY_COLUMNS = (
+        'source', 'market_id', 'contract_id', 'market_name', 'contract_name',
+        'canonical_market_id', 'canonical_candidate_id', 'manual',
+    )
+
+    REGISTRY_SCHEMA = Path(__file__).parent.parent / "supabase" / "entity_registry.sql"
+
+    def ensure_entity_registry(self):
+        """Create the entity_registry table if missing (runs the idempotent supabase/entity_registry.sql)."""
+        with self.conn.cursor() as cur:
+            cur.execute(self.REGISTRY_SCHEMA.read_text())
+
+    def get_registry_entries(self, source: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get entity registry rows, optionally for one source."""
+        query = f"SELECT {', '.join(self.REGISTRY_COLUMNS)} FROM entity_registry"
+        params: Tuple = ()
+        if source:
+            query += " WHERE source = %s"
+            params = (source,)
+        with self.conn.cursor() as cur:
+            cur.execute(query, params)
+            return [dict(zip(self.REGISTRY_COLUMNS, row)) for row in cur.fetchall()]
+
+    def upsert_registry_entries(self, entries: List[Tuple]) -> int:
+        """
+        Bulk insert or update registry rows, given as tuples in
+        REGISTRY_COLUMNS order. Rows marked manual are left untouched.
+        """
+        if not entries:
+            return 0
+
+        from psycopg2.extras import execute_values
+
+        with self.conn.cursor() as cur:
+            execute_values(cur, """
+                INSERT INTO entity_registry (source, market_id, contract_id, market_name, contract_name, canonical_market_id, canonical_candidate_id, manual)
+                VALUES %s
+                ON CONFLICT (source, market_id, contract_id) DO UPDATE SET
+                    market_name = EXCLUDED.market_name,
+                    contract_name = EXCLUDED.contract_name,
+                    canonical_market_id = EXCLUDED.canonical_market_id,
+                    canonical_candidate_id = EXCLUDED.canonical_candidate_id,
+                    updated_at = NOW()
+                WHERE NOT entity_registry.manual
+            """, [tuple(entry) for entry in entries])
+
+            return len(entries)
+
+    def get_registry_by_canonical(
+        self,
+        canonical_market_id: Optional[str] = None,
+        canonical_candidate_id: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Registry rows across all sources for a canonical market and/or candidate."""
+        query = f"SELECT {', '.join(self.REGISTRY_COLUMNS)} FROM entity_registry WHERE true"
+        params: List[Any] = []
+        if canonical_market_id:
+            query += " AND canonical_market_id = %s"
+            params.append(canonical_market_id)
+        if canonical_candidate_id:
+            query += " AND canonical_candidate_id = %s"
+            params.append(canonical_candidate_id)
+        query += " ORDER BY canonical_market_id, canonical_candidate_id, source"
+
+        with self.conn.cursor() as cur:
+            cur.execute(query, params)
+            return [dict(zip(self.REGISTRY_COLUMNS, row)) for row in cur.fetchall()]
+
     def get_site_market_ids(self, source: str) -> Set[str]:
         """Get active market_ids from site_markets for a given source."""
         with self.conn.cursor() as cur:
@@ -23,6 +23,7 @@ from typing import List, Dict, Optional
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from scripts.storage import Storage
+from scripts.entity_registry import EntityRegistry
 from api_clients import PredictItClient, KalshiClient, PolymarketClient, SmarketsClient
 
 # Configure logging
@@ -118,6 +119,7 @@ class IncrementalSync:
 
         try:
             self.storage.update_sync_checkpoint(checkpoint_id, status='running')
+            registry = EntityRegistry(self.storage, source)
 
             logger.info(f"[{source}] Syncing since {since.isoformat()}")
 
@@ -137,68 +139,56 @@ class IncrementalSync:
             if markets:
                 sample_data = {
                     'market_count': len(markets),
-                    'sample_markets': [m.__dict__ for m in markets[:3]]
+                    'sample_markets': [{**m.to_dict(), 'raw_data': m.raw_data} for m in markets[:3]]
                 }
                 self.save_sample_response(source, sample_data)
 
-            for market in markets:
-                stats['fetched'] += 1
-
-                # Upsert market (convert status enum to string)
-                status_str = market.status.value if hasattr(market.status, 'value') else str(market.status)
-                self.storage.upsert_market(
-                    source=source,
-                    market_id=market.market_id,
-                    market_name=market.market_name,
-                    category=market.category,
-                    status=status_str,
-                    url=market.url,
-                    total_volume=market.total_volume
+            # Data, registry rows and the 'completed' checkpoint commit together
+            with self.storage.batch() as tx:
+                for market in markets:
+                    stats['fetched'] += 1
+
+                    # Convert status enum to string
+                    status_str = market.status.value if hasattr(market.status, 'value') else str(market.status)
+                    tx.add_market((source, market.market_id, market.market_name, market.category,
+                                   status_str, market.url, market.total_volume, None))
+
+                    for contract in market.contracts:
+                        registry.resolve(market.market_id, market.market_name,
+                                         contract.contract_id, contract.contract_name)
+                        tx.add_contract((source, market.market_id, contract.contract_id,
+                                         contract.contract_name, None))
+                        tx.add_snapshot((
+                            source, market.market_id, contract.contract_id, snapshot_time,
+                            contract.yes_price, contract.no_price, contract.yes_bid,
+                            contract.yes_ask, contract.volume,
+                            {
+                                'market_name': market.market_name,
+                                'contract_name': contract.contract_name,
+                                'last_updated': contract.last_updated
+                            }
+                        ))
+
+                tx.flush()
+                stats['inserted'] += tx.counts['price_snapshots']['inserted']
+                # Same key, or same values as the contract's last point
+                stats['deduped'] += (tx.counts['price_snapshots']['updated']
+                                     + tx.counts['price_snapshots']['unchanged'])
+
+                registered = registry.flush()
+
+                self.storage.update_sync_checkpoint(
+                    checkpoint_id,
+                    status='completed',
+                    records_fetched=stats['fetched'],
+                    records_inserted=stats['inserted'],
+                    records_updated=stats['updated'],
+                    records_deduped=stats['deduped']
                 )
 
-                # Upsert contracts and price snapshots
-                for contract in market.contracts:
-                    self.storage.upsert_contract(
-                        source=source,
-                        market_id=market.market_id,
-                        contract_id=contract.contract_id,
-                        contract_name=contract.contract_name
-                    )
-
-                    # Upsert price snapshot
-                    _, snapshot_inserted = self.storage.upsert_price_snapshot(
-                        source=source,
-                        market_id=market.market_id,
-                        contract_id=contract.contract_id,
-                        snapshot_time=snapshot_time,
-                        yes_price=contract.yes_price,
-                        no_price=contract.no_price,
-                        yes_bid=contract.yes_bid,
-                        yes_ask=contract.yes_ask,
-                        volume=contract.volume,
-                        raw_data={
-                            'market_name': market.market_name,
-                            'contract_name': contract.contract_name,
-                            'last_updated': contract.last_updated
-                        }
-                    )
-
-                    if snapshot_inserted:
-                        stats['inserted'] += 1
-                    else:
-                        stats['deduped'] += 1
-
-            self.storage.update_sync_checkpoint(
-                checkpoint_id,
-                status='completed',
-                records_fetched=stats['fetched'],
-                records_inserted=stats['inserted'],
-                records_updated=stats['updated'],
-                records_deduped=stats['deduped']
-            )
-
             logger.info(f"[{source}] Sync complete: fetched={stats['fetched']}, "
-                       f"inserted={stats['inserted']}, deduped={stats['deduped']}")
+                       f"inserted={stats['inserted']}, deduped={stats['deduped']}, "
+                       f"registered={registered}")
 
         except Exception as e:
             error_msg = f"{type(e).__name__}: {str(e)}"
@@ -298,24 +288,28 @@ def main():
 
     # Initialize storage
     storage = Storage(args.db)
-    sync = IncrementalSync(storage, concurrency=args.concurrency)
 
-    if args.status:
+    try:
+        sync = IncrementalSync(storage, concurrency=args.concurrency)
+
+        if args.status:
+            sync.show_status()
+            return
+
+        # Determine since time
+        since = None
+        if args.since:
+            if 'T' in args.since:
+                since = datetime.fromisoformat(args.since)
+            else:
+                since = datetime.strptime(args.since, '%Y-%m-%d').replace(tzinfo=timezone.utc)
+        elif args.full:
+            since = datetime.now(timezone.utc) - timedelta(hours=24)
+
+        sync.run_sync(since=since, sources=args.sources)
         sync.show_status()
-        return
-
-    # Determine since time
-    since = None
-    if args.since:
-        if 'T' in args.since:
-            since = datetime.fromisoformat(args.since)
-        else:
-            since = datetime.strptime(args.since, '%Y-%m-%d').replace(tzinfo=timezone.utc)
-    elif args.full:
-        since = datetime.now(timezone.utc) - timedelta(hours=24)
-
-    sync.run_sync(since=since, sources=args.sources)
-    sync.show_status()
+    finally:
+        storage.close()
 
 
 if __name__ == '__main__':
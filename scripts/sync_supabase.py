@@ -17,13 +17,14 @@ import logging
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Optional
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from scripts.storage_supabase import SupabaseStorage
 from scripts.category_tagger import classify_category_tag
-from api_clients import PolymarketClient, KalshiClient, PredictItClient, SmarketsClient
+from scripts.entity_registry import EntityRegistry
 
 # Categories to skip during sync (non-election, saves DB space)
 EXCLUDED_CATEGORY_TAGS = {'Sports', 'Culture', 'Tech', 'Crypto', 'Finance'}
@@ -44,9 +45,32 @@ def get_featured_market_ids(storage: SupabaseStorage, source: str) -> set:
     return ids
 
 
+def open_registry(storage: SupabaseStorage, source: str) -> Optional[EntityRegistry]:
+    """Load a source's entity registry, or None (contracts stay unresolved) if it can't be read."""
+    try:
+        return EntityRegistry(storage, source)
+    except Exception as e:
+        logger.warning(f"Entity registry unavailable for {source}, skipping canonical ids: {e}")
+        return None
+
+
+def flush_registry(registry: Optional[EntityRegistry]) -> int:
+    """Write a registry's pending rows; a failure is logged, not raised."""
+    if registry is None:
+        return 0
+    try:
+        return registry.flush()
+    except Exception as e:
+        logger.warning(f"Could not write entity registry for {registry.source}: {e}")
+        return 0
+
+
 def sync_polymarket(storage: SupabaseStorage, featured_only: bool = False) -> dict:
     """Sync data from Polymarket."""
-    client = PolymarketClient()
+    # Imported per source so a single-source run loads only its client
+    from api_clients import PolymarketClient
+
+    client = PolymarketClient(slim_raw_data=True)
     stats = {'markets': 0, 'contracts': 0, 'snapshots': 0, 'skipped': 0}
 
     logger.info("Fetching Polymarket political markets...")
@@ -61,6 +85,7 @@ def sync_polymarket(storage: SupabaseStorage, featured_only: bool = False) -> di
         logger.info(f"Filtering to {len(markets)} featured markets (skipped {stats['skipped']})")
 
     snapshot_time = datetime.now(timezone.utc).isoformat()
+    registry = open_registry(storage, 'Polymarket')
 
     for market in markets:
         try:
@@ -85,6 +110,9 @@ def sync_polymarket(storage: SupabaseStorage, featured_only: bool = False) -> di
             stats['markets'] += 1
 
             for contract in market.contracts:
+                if registry is not None:
+                    registry.resolve(market.market_id, market.market_name,
+                                     contract.contract_id, contract.contract_name)
                 storage.upsert_contract(
                     source='Polymarket',
                     market_id=market.market_id,
@@ -107,12 +135,15 @@ def sync_polymarket(storage: SupabaseStorage, featured_only: bool = False) -> di
         except Exception as e:
             logger.error(f"Error processing market {market.market_id}: {e}")
 
+    stats['registered'] = flush_registry(registry)
     return stats
 
 
 def sync_kalshi(storage: SupabaseStorage, featured_only: bool = False) -> dict:
     """Sync data from Kalshi."""
-    client = KalshiClient()
+    from api_clients import KalshiClient
+
+    client = KalshiClient(slim_raw_data=True)
     stats = {'markets': 0, 'contracts': 0, 'snapshots': 0, 'skipped': 0}
 
     logger.info("Fetching Kalshi political markets...")
@@ -127,6 +158,7 @@ def sync_kalshi(storage: SupabaseStorage, featured_only: bool = False) -> dict:
         logger.info(f"Filtering to {len(markets)} featured markets (skipped {stats['skipped']})")
 
     snapshot_time = datetime.now(timezone.utc).isoformat()
+    registry = open_registry(storage, 'Kalshi')
 
     for market in markets:
         try:
@@ -151,6 +183,9 @@ def sync_kalshi(storage: SupabaseStorage, featured_only: bool = False) -> dict:
             stats['markets'] += 1
 
             for contract in market.contracts:
+                if registry is not None:
+                    registry.resolve(market.market_id, market.market_name,
+                                     contract.contract_id, contract.contract_name)
                 storage.upsert_contract(
                     source='Kalshi',
                     market_id=market.market_id,
@@ -175,12 +210,15 @@ def sync_kalshi(storage: SupabaseStorage, featured_only: bool = False) -> dict:
         except Exception as e:
             logger.error(f"Error processing market {market.market_id}: {e}")
 
+    stats['registered'] = flush_registry(registry)
     return stats
 
 
 def sync_predictit(storage: SupabaseStorage, featured_only: bool = False) -> dict:
     """Sync data from PredictIt."""
-    client = PredictItClient()
+    from api_clients import PredictItClient
+
+    client = PredictItClient(slim_raw_data=True)
     stats = {'markets': 0, 'contracts': 0, 'snapshots': 0, 'skipped': 0}
 
     logger.info("Fetching PredictIt political markets...")
@@ -195,6 +233,7 @@ def sync_predictit(storage: SupabaseStorage, featured_only: bool = False) -> dic
         logger.info(f"Filtering to {len(markets)} featured markets (skipped {stats['skipped']})")
 
     snapshot_time = datetime.now(timezone.utc).isoformat()
+    registry = open_registry(storage, 'PredictIt')
 
     for market in markets:
         try:
@@ -219,6 +258,9 @@ def sync_predictit(storage: SupabaseStorage, featured_only: bool = False) -> dic
             stats['markets'] += 1
 
             for contract in market.contracts:
+                if registry is not None:
+                    registry.resolve(market.market_id, market.market_name,
+                                     contract.contract_id, contract.contract_name)
                 storage.upsert_contract(
                     source='PredictIt',
                     market_id=market.market_id,
@@ -243,12 +285,15 @@ def sync_predictit(storage: SupabaseStorage, featured_only: bool = False) -> dic
         except Exception as e:
             logger.error(f"Error processing market {market.market_id}: {e}")
 
+    stats['registered'] = flush_registry(registry)
     return stats
 
 
 def sync_smarkets(storage: SupabaseStorage, featured_only: bool = False) -> dict:
     """Sync data from Smarkets."""
-    client = SmarketsClient()
+    from api_clients import SmarketsClient
+
+    client = SmarketsClient(slim_raw_data=True)
     stats = {'markets': 0, 'contracts': 0, 'snapshots': 0, 'skipped': 0}
 
     logger.info("Fetching Smarkets political markets...")
@@ -263,6 +308,7 @@ def sync_smarkets(storage: SupabaseStorage, featured_only: bool = False) -> dict
         logger.info(f"Filtering to {len(markets)} featured markets (skipped {stats['skipped']})")
 
     snapshot_time = datetime.now(timezone.utc).isoformat()
+    registry = open_registry(storage, 'Smarkets')
 
     for market in markets:
         try:
@@ -287,6 +333,9 @@ def sync_smarkets(storage: SupabaseStorage, featured_only: bool = False) -> dict
             stats['markets'] += 1
 
             for contract in market.contracts:
+                if registry is not None:
+                    registry.resolve(market.market_id, market.market_name,
+                                     contract.contract_id, contract.contract_name)
                 storage.upsert_contract(
                     source='Smarkets',
                     market_id=market.market_id,
@@ -311,6 +360,7 @@ def sync_smarkets(storage: SupabaseStorage, featured_only: bool = False) -> dict
         except Exception as e:
             logger.error(f"Error processing market {market.market_id}: {e}")
 
+    stats['registered'] = flush_registry(registry)
     return stats
 
 
@@ -326,7 +376,12 @@ def main():
     storage = SupabaseStorage()
 
     try:
-        total_stats = {'markets': 0, 'contracts': 0, 'snapshots': 0, 'skipped': 0}
+        try:
+            storage.ensure_entity_registry()
+        except Exception as e:
+            logger.warning(f"Could not create entity_registry table: {e}")
+
+        total_stats = {'markets': 0, 'contracts': 0, 'snapshots': 0, 'skipped': 0, 'registered': 0}
 
         if args.source in ['polymarket', 'all']:
             stats = sync_polymarket(storage, args.featured_only)
@@ -65,9 +65,7 @@ def check_candidate_consistency(storage: Storage) -> Dict:
         cursor.execute("""
             SELECT c.contract_id, c.contract_name, COUNT(*) as snapshot_count
             FROM contracts c
-            JOIN price_snapshots ps ON c.source = ps.source
-                AND c.market_id = ps.market_id
-                AND c.contract_id = ps.contract_id
+            JOIN price_points p ON p.contract_ref = c.id
             WHERE c.source = ?
             GROUP BY c.contract_id, c.contract_name
             ORDER BY snapshot_count DESC
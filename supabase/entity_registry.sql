@@ -0,0 +1,49 @@
+-- entity_registry table: Maps every (source, market_id, contract_id) to a
+-- canonical market id (site_markets.canonical_type values, e.g.
+-- 'presidential-winner-2028') and a canonical candidate id (e.g. 'jd-vance'),
+-- so the same outcome can be joined across venues with an indexed lookup.
+--
+-- Idempotent: scripts/sync_supabase.py runs it before every sync
+-- (SupabaseStorage.ensure_entity_registry), and it can also be run in the
+-- Supabase SQL Editor. The sync scripts populate it incrementally
+-- (scripts/entity_registry.py).
+-- Set manual = true on a row to pin a hand-corrected mapping.
+
+CREATE TABLE IF NOT EXISTS entity_registry (
+    id BIGSERIAL PRIMARY KEY,
+    source TEXT NOT NULL,
+    market_id TEXT NOT NULL,
+    contract_id TEXT NOT NULL,
+    market_name TEXT,
+    contract_name TEXT,
+    canonical_market_id TEXT,
+    canonical_candidate_id TEXT,
+    manual BOOLEAN NOT NULL DEFAULT false,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    UNIQUE(source, market_id, contract_id)
+);
+
+-- Lookups by canonical market (and candidate) across sources
+CREATE INDEX IF NOT EXISTS idx_entity_registry_canonical
+    ON entity_registry(canonical_market_id, canonical_candidate_id);
+CREATE INDEX IF NOT EXISTS idx_entity_registry_candidate
+    ON entity_registry(canonical_candidate_id);
+
+-- Enable RLS consistent with other tables
+ALTER TABLE entity_registry ENABLE ROW LEVEL SECURITY;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_policies WHERE tablename = 'entity_registry'
+                   AND policyname = 'Allow public read access on entity_registry') THEN
+        CREATE POLICY "Allow public read access on entity_registry"
+            ON entity_registry FOR SELECT USING (true);
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_policies WHERE tablename = 'entity_registry'
+                   AND policyname = 'Allow service role full access on entity_registry') THEN
+        CREATE POLICY "Allow service role full access on entity_registry"
+            ON entity_registry FOR ALL USING (auth.role() = 'service_role');
+    END IF;
+END
+$$;
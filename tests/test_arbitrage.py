@@ -0,0 +1,106 @@
+"""Tests for fee-adjusted arbitrage evaluation."""
+
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api_clients import ContractData, MarketBatch, MarketData
+from arbitrage import ArbitrageEngine
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def contract(contract_id, yes_ask=None, no_ask=None, yes_bid=None, last_updated=NOW):
+    return ContractData(contract_id=contract_id, contract_name=contract_id,
+                        yes_price=yes_ask or 0.0, no_price=no_ask or 0.0,
+                        yes_bid=yes_bid, yes_ask=yes_ask, no_ask=no_ask,
+                        last_updated=last_updated)
+
+
+def market(source, contracts, mutually_exclusive=True):
+    return MarketData(market_id=f"{source}-1", market_name='Who wins?', source=source,
+                      category='politics', contracts=contracts,
+                      mutually_exclusive=mutually_exclusive)
+
+
+def entry(source, contract_data):
+    return (source, market(source, [contract_data]), contract_data)
+
+
+def test_evaluate_nets_each_venue_fee_out_of_the_best_leg_pair():
+    groups = [('vance', [
+        entry('PredictIt', contract('pi', yes_ask=0.40, no_ask=0.62)),
+        entry('Kalshi', contract('k', yes_ask=0.55, no_ask=0.50)),
+    ])]
+    [opportunity] = ArbitrageEngine().evaluate(groups)
+
+    assert (opportunity.yes_source, opportunity.no_source) == ('PredictIt', 'Kalshi')
+    assert opportunity.gross_edge == pytest.approx(0.10)
+    # Kalshi trade fee 0.07 * 0.5 * 0.5 on the NO leg; PredictIt keeps
+    # 10% of the YES leg's winnings (0.60)
+    cost = 0.40 + 0.50 + 0.07 * 0.50 * 0.50
+    assert opportunity.net_edge == pytest.approx(min(1 - 0.10 * 0.60, 1.0) - cost)
+
+
+def test_evaluate_prices_no_from_the_yes_bid_and_skips_same_venue_pairs():
+    engine = ArbitrageEngine()
+    same_venue = [('x', [
+        entry('Polymarket', contract('a', yes_ask=0.30, no_ask=0.30)),
+        entry('Polymarket', contract('b', yes_ask=0.30, no_ask=0.30)),
+    ])]
+    assert engine.evaluate(same_venue) == []
+
+    groups = [('x', [
+        entry('Polymarket', contract('pm', yes_ask=0.45)),
+        entry('Smarkets', contract('s', yes_bid=0.52)),
+    ])]
+    [opportunity] = engine.evaluate(groups)
+    assert opportunity.no_ask == pytest.approx(0.48)
+    # Smarkets commission on the NO leg's winnings (0.52)
+    assert opportunity.net_edge == pytest.approx(1 - 0.02 * 0.52 - 0.45 - 0.48)
+    assert engine.evaluate(groups, min_edge=0.07) == []
+
+
+def test_scan_book_sums_nets_fees_on_both_sides():
+    outcomes = [contract(str(k), yes_ask=0.30, yes_bid=0.28, no_ask=0.72) for k in range(3)]
+    batch = MarketBatch.from_markets([market('Kalshi', outcomes)])
+    results = ArbitrageEngine().scan_book_sums(batch, now=NOW.timestamp())
+
+    by_side = {result.side: result for result in results}
+    assert by_side['yes'].book_sum == pytest.approx(0.90)
+    assert by_side['yes'].net_edge == pytest.approx(1 - 3 * (0.30 + 0.07 * 0.30 * 0.70))
+    # Buying NO on all three pays out on two of them
+    assert by_side['no'].book_sum == pytest.approx(3 - 3 * 0.72)
+    assert by_side['no'].net_edge == pytest.approx(2 - 3 * (0.72 + 0.07 * 0.72 * 0.28))
+    assert [result.side for result in results] == ['yes', 'no']
+    assert not any(result.stale for result in results)
+
+
+def test_scan_book_sums_applies_profit_fee_and_skips_incomplete_or_unflagged_books():
+    engine = ArbitrageEngine()
+    predictit = [contract(str(k), yes_ask=0.30) for k in range(3)]
+    [result] = engine.scan_book_sums(MarketBatch.from_markets([market('PredictIt', predictit)]),
+                                     now=NOW.timestamp())
+    # Whichever outcome wins, PredictIt keeps 10% of its 0.70 winnings
+    assert result.net_edge == pytest.approx(1 - 0.10 * 0.70 - 0.90)
+
+    incomplete = [contract('a', yes_ask=0.30), contract('b', yes_ask=0.30), contract('c')]
+    unflagged = [contract(str(k), yes_ask=0.30) for k in range(3)]
+    batch = MarketBatch.from_markets([
+        market('Kalshi', incomplete),
+        market('Polymarket', unflagged, mutually_exclusive=False),
+    ])
+    assert engine.scan_book_sums(batch, now=NOW.timestamp()) == []
+
+
+def test_scan_book_sums_counts_stale_quotes():
+    old = datetime(2025, 12, 31, 23, 0, tzinfo=timezone.utc)
+    outcomes = [contract('a', yes_ask=0.30), contract('b', yes_ask=0.30, last_updated=old)]
+    batch = MarketBatch.from_markets([market('Polymarket', outcomes)])
+    [result] = ArbitrageEngine().scan_book_sums(batch, now=NOW.timestamp())
+    assert result.stale_outcomes == 1
@@ -0,0 +1,64 @@
+"""Tests for cross-venue market matching."""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from matching import MarketMatcher
+
+# (source, market name, contract name, entry); entries sharing a label
+# before the dash describe the same outcome on different venues
+LISTINGS = [
+    ('PredictIt', 'Who will win the 2028 presidential election?', 'JD Vance', 'vance-pi'),
+    ('Kalshi', '2028 US Presidential Election winner?', 'J.D. Vance', 'vance-k'),
+    ('Polymarket', 'Presidential Election Winner 2028', 'Gavin Newsom', 'newsom-pm'),
+    ('Kalshi', '2028 US Presidential Election winner?', 'Gavin Newsom', 'newsom-k'),
+    ('Polymarket', 'Who will be the next Fed Chair?', 'Will Kevin Hassett be the next Fed Chair?',
+     'hassett-pm'),
+    ('Kalshi', 'Next Fed Chair', 'Kevin Hassett', 'hassett-k'),
+    ('Smarkets', 'Texas Senate 2026', 'Ken Paxton', 'paxton-s'),
+    ('Betfair', 'Texas Senate Election 2026', 'Ken Paxton', 'paxton-b'),
+    # Near misses: different thresholds, parties, markets or offices
+    ('Kalshi', 'Trump approval rating above 45%?', 'Yes', 'approval45-k'),
+    ('Polymarket', 'Trump approval rating above 40%?', 'Yes', 'approval40-pm'),
+    ('PredictIt', 'Which party will win the House in 2026?', 'House Democratic', 'dem-pi'),
+    ('Kalshi', 'Which party will win the House in 2026?', 'House Republican', 'rep-k'),
+    ('Polymarket', '2028 Democratic presidential nominee', 'Gavin Newsom', 'nominee-pm'),
+    ('Smarkets', 'Texas Senate 2026', 'John Cornyn', 'cornyn-s'),
+    ('Betfair', 'Texas Attorney General 2026', 'John Cornyn', 'ag-b'),
+]
+
+
+def matched_pairs(groups):
+    return {frozenset((a, b)) for _, entries in groups
+            for a in entries for b in entries if a < b}
+
+
+def test_matches_listings_with_full_recall_and_precision():
+    matcher = MarketMatcher()
+    for source, market, contract, entry in LISTINGS:
+        matcher.add(source, market, contract, entry)
+
+    expected = {frozenset(pair) for pair in (
+        ('vance-pi', 'vance-k'), ('newsom-pm', 'newsom-k'),
+        ('hassett-pm', 'hassett-k'), ('paxton-s', 'paxton-b'),
+    )}
+    found = matched_pairs(matcher.groups())
+    assert len(found & expected) / len(expected) == 1.0  # recall
+    assert len(found & expected) / len(found) == 1.0     # precision
+
+
+def test_common_surname_is_matched_within_market_sub_blocks():
+    # More names share the surname than max_block_size allows in one block
+    districts = range(1, 251)
+    matcher = MarketMatcher()
+    for d in districts:
+        matcher.add('kalshi', f"House district {d} race", "Jane Smith", ('kalshi', d))
+    for d in districts:
+        matcher.add('polymarket', f"Who will win House district {d}?", "Jane Smith Jr.",
+                    ('polymarket', d))
+
+    groups = [sorted(entries) for _, entries in matcher.groups()]
+    assert sorted(groups) == [[('kalshi', d), ('polymarket', d)] for d in districts]
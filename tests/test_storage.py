@@ -0,0 +1,71 @@
+"""Tests for the SQLite storage layer's change-only price points."""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.storage import Storage
+
+START = 1_700_000_000
+KEY = ('kalshi', 'PRES-2028', 'VANCE')
+VALUES = (0.41, 0.59, 0.40, 0.42, 1000.0)
+
+
+def snapshot(ts, values=VALUES):
+    return KEY + (ts,) + values + (None,)
+
+
+def points(storage):
+    return storage.conn.execute(
+        "SELECT ts, COALESCE(last_seen, ts) FROM price_points ORDER BY ts"
+    ).fetchall()
+
+
+def test_reupsert_at_run_start_keeps_last_seen(tmp_path):
+    with Storage(str(tmp_path / 'odds.db')) as storage:
+        storage.bulk_upsert_price_snapshots([snapshot(START)], change_only=True)
+        storage.bulk_upsert_price_snapshots([snapshot(START + 600)], change_only=True)
+        assert [tuple(row) for row in points(storage)] == [(START, START + 600)]
+
+        # A retried sync at the run's first ts is unchanged, not a rewrite
+        counts = storage.bulk_upsert_price_snapshots([snapshot(START)], change_only=True)
+        assert counts == {'inserted': 0, 'updated': 0, 'unchanged': 1}
+        assert [tuple(row) for row in points(storage)] == [(START, START + 600)]
+
+        # Without change_only the point is rewritten, but its run does not shrink
+        counts = storage.bulk_upsert_price_snapshots([snapshot(START)])
+        assert counts == {'inserted': 0, 'updated': 1, 'unchanged': 0}
+        assert [tuple(row) for row in points(storage)] == [(START, START + 600)]
+
+
+def test_snapshots_within_one_second_stay_distinct(tmp_path):
+    with Storage(str(tmp_path / 'odds.db')) as storage:
+        counts = storage.bulk_upsert_price_snapshots([
+            KEY + ('2026-01-01T00:00:00.250000+00:00',) + VALUES + ({'seq': 1},),
+            KEY + ('2026-01-01T00:00:00.750000+00:00',) + VALUES + ({'seq': 2},),
+        ])
+        assert counts['inserted'] == 2
+        history = storage.get_price_history(source='kalshi')
+        assert [row['snapshot_time'] for row in history] == [
+            '2026-01-01T00:00:00.750000+00:00', '2026-01-01T00:00:00.250000+00:00'
+        ]
+        assert [row['raw_data'] for row in history] == ['{"seq": 2}', '{"seq": 1}']
+
+
+def test_late_row_does_not_replace_latest_point(tmp_path):
+    other = (0.45,) + VALUES[1:]
+    with Storage(str(tmp_path / 'odds.db')) as storage:
+        counts = storage.bulk_upsert_price_snapshots([
+            snapshot(START),
+            snapshot(START + 600),
+            # Arrive after newer observations: inside and before the run
+            snapshot(START + 300, other),
+            snapshot(START - 300, other),
+            snapshot(START + 900),
+        ], change_only=True)
+        assert counts == {'inserted': 3, 'updated': 0, 'unchanged': 2}
+        assert [tuple(row) for row in points(storage)] == [
+            (START - 300, START - 300), (START, START + 900), (START + 300, START + 300)
+        ]
@@ -15,6 +15,12 @@ const DB_PATH =
 
 let db: Database.Database | null = null;
 
+// price_snapshots.snapshot_time is formatted from the indexed epoch column
+// ts; filter and sort on ts so range queries can use the index
+function toEpochSeconds(iso: string): number {
+  return Date.parse(iso) / 1000;
+}
+
 function getDb(): Database.Database {
   if (!db) {
     db = new Database(DB_PATH, { readonly: true });
@@ -70,19 +76,19 @@ export function getChartData(
       AND ps.market_id = ?
   `;
 
-  const params: (string | undefined)[] = [selectedSource, dbMarketId];
+  const params: (string | number)[] = [selectedSource, dbMarketId];
 
   if (startDate) {
-    query += ` AND ps.snapshot_time >= ?`;
-    params.push(startDate);
+    query += ` AND ps.ts >= ?`;
+    params.push(toEpochSeconds(startDate));
   }
 
   if (endDate) {
-    query += ` AND ps.snapshot_time <= ?`;
-    params.push(endDate);
+    query += ` AND ps.ts <= ?`;
+    params.push(toEpochSeconds(endDate));
   }
 
-  query += ` ORDER BY ps.snapshot_time ASC`;
+  query += ` ORDER BY ps.ts ASC`;
 
   const rows = db.prepare(query).all(...params) as PriceSnapshot[];
 
@@ -330,8 +336,8 @@ export function getDataRange(
 
   let query = `
     SELECT
-      MIN(snapshot_time) as earliest,
-      MAX(snapshot_time) as latest
+      strftime('%Y-%m-%dT%H:%M:%S+00:00', MIN(ts), 'unixepoch') as earliest,
+      strftime('%Y-%m-%dT%H:%M:%S+00:00', MAX(ts), 'unixepoch') as latest
     FROM price_snapshots
     WHERE source = ?
   `;
@@ -1268,8 +1274,8 @@ function createSlug(name: string, id: string): string {
   return `${slug}-${id}`;
 }
 
-// Helper to get timestamp for change period
-function getChangePeriodTimestamp(period: string): string {
+// Helper to get the epoch-seconds cutoff (compared with ts) for a change period
+function getChangePeriodTimestamp(period: string): number {
   const now = new Date();
   switch (period) {
     case "1d":
@@ -1284,7 +1290,7 @@ function getChangePeriodTimestamp(period: string): string {
     default:
       now.setDate(now.getDate() - 1);
   }
-  return now.toISOString();
+  return now.getTime() / 1000;
 }
 
 /**
@@ -1308,7 +1314,7 @@ function getChartBasedPriceChanges(
     FROM contracts c
     INNER JOIN (
       SELECT contract_id, market_id, source, yes_price, snapshot_time,
-             ROW_NUMBER() OVER (PARTITION BY contract_id ORDER BY snapshot_time DESC) as rn
+             ROW_NUMBER() OVER (PARTITION BY contract_id ORDER BY ts DESC) as rn
       FROM price_snapshots
       WHERE source = 'electionbettingodds'
     ) ps ON ps.contract_id = c.contract_id AND ps.market_id = c.market_id AND ps.source = c.source AND ps.rn = 1
@@ -1324,9 +1330,9 @@ function getChartBasedPriceChanges(
     FROM contracts c
     INNER JOIN (
       SELECT contract_id, market_id, source, yes_price, snapshot_time,
-             ROW_NUMBER() OVER (PARTITION BY contract_id ORDER BY snapshot_time DESC) as rn
+             ROW_NUMBER() OVER (PARTITION BY contract_id ORDER BY ts DESC) as rn
       FROM price_snapshots
-      WHERE source = 'electionbettingodds' AND snapshot_time <= ?
+      WHERE source = 'electionbettingodds' AND ts <= ?
     ) ps ON ps.contract_id = c.contract_id AND ps.market_id = c.market_id AND ps.source = c.source AND ps.rn = 1
     WHERE c.source = 'electionbettingodds' AND c.market_id = ?
     AND ps.yes_price IS NOT NULL
@@ -1424,7 +1430,7 @@ export function getMarkets(options?: {
     FROM contracts c
     INNER JOIN (
       SELECT contract_id, market_id, source, yes_price, no_price, volume, snapshot_time,
-             ROW_NUMBER() OVER (PARTITION BY source, market_id, contract_id ORDER BY snapshot_time DESC) as rn
+             ROW_NUMBER() OVER (PARTITION BY source, market_id, contract_id ORDER BY ts DESC) as rn
       FROM price_snapshots
     ) ps ON ps.contract_id = c.contract_id AND ps.market_id = c.market_id AND ps.source = c.source AND ps.rn = 1
     WHERE c.market_id = ? AND c.source = ?
@@ -1442,9 +1448,9 @@ export function getMarkets(options?: {
     FROM contracts c
     INNER JOIN (
       SELECT contract_id, market_id, source, yes_price, snapshot_time,
-             ROW_NUMBER() OVER (PARTITION BY source, market_id, contract_id ORDER BY snapshot_time DESC) as rn
+             ROW_NUMBER() OVER (PARTITION BY source, market_id, contract_id ORDER BY ts DESC) as rn
       FROM price_snapshots
-      WHERE snapshot_time <= ?
+      WHERE ts <= ?
     ) ps ON ps.contract_id = c.contract_id AND ps.market_id = c.market_id AND ps.source = c.source AND ps.rn = 1
     WHERE c.market_id = ? AND c.source = ?
   `;
@@ -1822,7 +1828,7 @@ export function getStateSenateRaces(options?: {
         FROM contracts c
         INNER JOIN (
           SELECT contract_id, market_id, source, yes_price, no_price, volume, snapshot_time,
-                 ROW_NUMBER() OVER (PARTITION BY source, market_id, contract_id ORDER BY snapshot_time DESC) as rn
+                 ROW_NUMBER() OVER (PARTITION BY source, market_id, contract_id ORDER BY ts DESC) as rn
           FROM price_snapshots
         ) ps ON ps.contract_id = c.contract_id AND ps.market_id = c.market_id AND ps.source = c.source AND ps.rn = 1
         WHERE c.market_id = ? AND c.source = ?
@@ -1845,9 +1851,9 @@ export function getStateSenateRaces(options?: {
         FROM contracts c
         INNER JOIN (
           SELECT contract_id, market_id, source, yes_price, snapshot_time,
-                 ROW_NUMBER() OVER (PARTITION BY source, market_id, contract_id ORDER BY snapshot_time DESC) as rn
+                 ROW_NUMBER() OVER (PARTITION BY source, market_id, contract_id ORDER BY ts DESC) as rn
           FROM price_snapshots
-          WHERE snapshot_time <= ?
+          WHERE ts <= ?
         ) ps ON ps.contract_id = c.contract_id AND ps.market_id = c.market_id AND ps.source = c.source AND ps.rn = 1
         WHERE c.market_id = ? AND c.source = ?
         AND ps.yes_price IS NOT NULL
@@ -2105,7 +2111,7 @@ export function getStateGovernorRaces(options?: {
         FROM contracts c
         INNER JOIN (
           SELECT contract_id, market_id, source, yes_price, no_price, volume, snapshot_time,
-                 ROW_NUMBER() OVER (PARTITION BY source, market_id, contract_id ORDER BY snapshot_time DESC) as rn
+                 ROW_NUMBER() OVER (PARTITION BY source, market_id, contract_id ORDER BY ts DESC) as rn
           FROM price_snapshots
         ) ps ON ps.contract_id = c.contract_id AND ps.market_id = c.market_id AND ps.source = c.source AND ps.rn = 1
         WHERE c.market_id = ? AND c.source = ?
@@ -2128,9 +2134,9 @@ export function getStateGovernorRaces(options?: {
         FROM contracts c
         INNER JOIN (
           SELECT contract_id, market_id, source, yes_price, snapshot_time,
-                 ROW_NUMBER() OVER (PARTITION BY source, market_id, contract_id ORDER BY snapshot_time DESC) as rn
+                 ROW_NUMBER() OVER (PARTITION BY source, market_id, contract_id ORDER BY ts DESC) as rn
           FROM price_snapshots
-          WHERE snapshot_time <= ?
+          WHERE ts <= ?
         ) ps ON ps.contract_id = c.contract_id AND ps.market_id = c.market_id AND ps.source = c.source AND ps.rn = 1
         WHERE c.market_id = ? AND c.source = ?
         AND ps.yes_price IS NOT NULL
@@ -2385,7 +2391,7 @@ export function getSenatePrimaries(options?: {
         FROM contracts c
         INNER JOIN (
           SELECT contract_id, market_id, source, yes_price, no_price, volume, snapshot_time,
-                 ROW_NUMBER() OVER (PARTITION BY source, market_id, contract_id ORDER BY snapshot_time DESC) as rn
+                 ROW_NUMBER() OVER (PARTITION BY source, market_id, contract_id ORDER BY ts DESC) as rn
           FROM price_snapshots
         ) ps ON ps.contract_id = c.contract_id AND ps.market_id = c.market_id AND ps.source = c.source AND ps.rn = 1
         WHERE c.market_id = ? AND c.source = ?
@@ -2407,9 +2413,9 @@ export function getSenatePrimaries(options?: {
         FROM contracts c
         INNER JOIN (
           SELECT contract_id, market_id, source, yes_price, snapshot_time,
-                 ROW_NUMBER() OVER (PARTITION BY source, market_id, contract_id ORDER BY snapshot_time DESC) as rn
+                 ROW_NUMBER() OVER (PARTITION BY source, market_id, contract_id ORDER BY ts DESC) as rn
           FROM price_snapshots
-          WHERE snapshot_time <= ?
+          WHERE ts <= ?
         ) ps ON ps.contract_id = c.contract_id AND ps.market_id = c.market_id AND ps.source = c.source AND ps.rn = 1
         WHERE c.market_id = ? AND c.source = ?
         AND ps.yes_price IS NOT NULL
@@ -2609,10 +2615,10 @@ export function getStats() {
       SELECT ps.volume
       FROM price_snapshots ps
       INNER JOIN (
-        SELECT contract_id, MAX(snapshot_time) as max_time
+        SELECT contract_id, MAX(ts) as max_ts
         FROM price_snapshots
         GROUP BY contract_id
-      ) latest ON ps.contract_id = latest.contract_id AND ps.snapshot_time = latest.max_time
+      ) latest ON ps.contract_id = latest.contract_id AND ps.ts = latest.max_ts
     )
   `;
   const volume = db.prepare(volumeQuery).get() as { total: number | null };